@@ -4,10 +4,19 @@ Agent Public Profile API Endpoints
 Public-facing endpoints for agent websites
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query, Path
+from fastapi import APIRouter, HTTPException, Depends, Query, Path, Request, Response
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.config import settings
 from app.core.database import get_database
+from app.core.http_cache import (
+    collection_etag,
+    etag_matches,
+    make_etag,
+    not_modified,
+    public_cache_control,
+    set_cache_headers
+)
 from app.schemas.agent_public import (
     AgentPublicProfile,
     PublicProperty,
@@ -16,12 +25,19 @@ from app.schemas.agent_public import (
     ContactInquiry
 )
 from app.services.agent_public_service import AgentPublicService
+from app.utils.serialization import TrustedJSONResponse
 from app.core.auth_backend import current_active_user
 from app.models.user import User
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _visitor_id(request: Request) -> str:
+    """Anonymous visitor identity for unique-visitor counting (client address and user agent)"""
+    client_ip = request.client.host if request.client else "unknown"
+    return f"{client_ip}|{request.headers.get('user-agent', '')}"
+
 router = APIRouter(prefix="/agent-public", tags=["agent-public"])
 
 # Current agent management endpoints (must come before generic {agent_slug} routes)
@@ -137,17 +153,19 @@ async def get_current_agent_public_stats(
 # Public agent profile endpoints (generic {agent_slug} routes)
 @router.get("/{agent_slug}", response_model=AgentPublicProfile)
 async def get_agent_public_profile(
+    request: Request,
     agent_slug: str = Path(..., description="Agent's URL slug"),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Get agent's public profile by slug
+    Get agent's public profile by slug.
+    
+    Publicly cacheable; revalidation with If-None-Match returns 304 while
+    neither the profile nor any listed property has changed.
     """
     try:
-        print(f"DEBUG: Agent public router called with slug: {agent_slug}")
         service = AgentPublicService(db)
         agent = await service.get_agent_by_slug(agent_slug)
-        print(f"DEBUG: Agent service returned: {agent is not None}")
         
         if not agent:
             raise HTTPException(status_code=404, detail="Agent not found")
@@ -155,10 +173,17 @@ async def get_agent_public_profile(
         if not agent.is_public:
             raise HTTPException(status_code=404, detail="Agent profile is not public")
         
-        # Increment view count
-        await service.increment_view_count(agent.id)
+        # Count the view (buffered; revalidations count as views too)
+        await service.increment_view_count(agent.id, _visitor_id(request))
+        
+        etag = collection_etag(agent.properties, make_etag(agent.id, agent.updated_at))
+        cache_control = public_cache_control(settings.public_page_max_age)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
         
-        return agent
+        result = TrustedJSONResponse(agent)
+        set_cache_headers(result, etag, cache_control)
+        return result
         
     except HTTPException:
         raise
@@ -168,6 +193,8 @@ async def get_agent_public_profile(
 
 @router.get("/{agent_slug}/properties", response_model=dict)
 async def get_agent_public_properties(
+    request: Request,
+    response: Response,
     agent_slug: str = Path(..., description="Agent's URL slug"),
     location: Optional[str] = Query(None, description="Filter by location"),
     min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
@@ -185,7 +212,10 @@ async def get_agent_public_properties(
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Get agent's public properties with filtering and pagination
+    Get agent's public properties with filtering and pagination.
+    
+    Publicly cacheable; the ETag covers the page's cards, the total and the
+    agent's profile version, so revalidation never serializes the page.
     """
     try:
         service = AgentPublicService(db)
@@ -215,6 +245,14 @@ async def get_agent_public_properties(
         # Get properties
         result = await service.get_agent_properties(agent.id, filters)
         
+        etag = collection_etag(
+            result["properties"], result["total"], page, limit, agent.id, agent.updated_at
+        )
+        cache_control = public_cache_control(settings.public_page_max_age)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
+        
+        set_cache_headers(response, etag, cache_control)
         return {
             "properties": result["properties"],
             "total": result["total"],
@@ -232,12 +270,15 @@ async def get_agent_public_properties(
 
 @router.get("/{agent_slug}/properties/{property_id}", response_model=PublicProperty)
 async def get_agent_public_property(
+    request: Request,
     agent_slug: str = Path(..., description="Agent's URL slug"),
     property_id: str = Path(..., description="Property ID"),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Get specific property details from agent's public profile
+    Get specific property details from agent's public profile.
+    
+    Publicly cacheable; the ETag is versioned by the property's updated_at.
     """
     try:
         service = AgentPublicService(db)
@@ -255,10 +296,17 @@ async def get_agent_public_property(
         if not property.is_public:
             raise HTTPException(status_code=404, detail="Property is not public")
         
-        # Increment view count
-        await service.increment_property_view_count(property.id)
+        # Count the view (buffered, never waits on the database)
+        await service.increment_property_view_count(property.id, agent.id, _visitor_id(request))
+        
+        etag = make_etag(agent.id, property.id, property.updated_at)
+        cache_control = public_cache_control(settings.public_page_max_age)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
         
-        return property
+        result = TrustedJSONResponse(property)
+        set_cache_headers(result, etag, cache_control)
+        return result
         
     except HTTPException:
         raise
@@ -293,7 +341,7 @@ async def submit_contact_inquiry(
         created_inquiry = await service.create_contact_inquiry(agent.id, inquiry)
         
         # Increment contact count
-        await service.increment_contact_count(agent.id)
+        await service.increment_contact_count(agent.id, inquiry.property_id)
         
         return created_inquiry
         
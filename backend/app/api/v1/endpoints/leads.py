@@ -12,6 +12,7 @@ from app.repositories.lead_repository import LeadRepository
 
 from app.core.exceptions import NotFoundError
 from app.core.auth_backend import get_current_user_id
+from app.utils.serialization import TrustedJSONResponse
 
 router = APIRouter()
 
@@ -29,8 +30,8 @@ async def get_leads(
     agent_id: str = Depends(get_current_user_id),
     lead_service: LeadService = Depends(get_lead_service)
 ):
-    """Get list of leads for the current agent."""
-    return await lead_service.get_leads(agent_id, skip, limit)
+    """Get list of leads for the current agent (serialized without re-validation)."""
+    return TrustedJSONResponse(await lead_service.get_leads(agent_id, skip, limit))
 
 
 @router.post("/", response_model=LeadResponse)
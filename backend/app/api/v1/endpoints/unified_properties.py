@@ -6,22 +6,40 @@ This endpoint consolidates all property creation functionality into a single,
 maintainable API that handles both standard and smart properties.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
 
-from app.core.auth_backend import current_active_user
+from app.core.auth_backend import current_active_user, current_superuser
 from app.models.user import User
 from app.schemas.unified_property import (
     PropertyCreate,
     PropertyUpdate,
     PropertyResponse,
+    PropertySummary,
+    NearbyPropertySummary,
+    SimilarPropertySummary,
+    FacetedSearchResult,
     PropertyDocument
 )
-from app.services.unified_property_service import UnifiedPropertyService
+from app.services.property_cache import property_cache
+from app.services.unified_property_service import (
+    UnifiedPropertyService,
+    DEFAULT_BATCH_CHUNK_SIZE
+)
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.database import get_database
+from app.core.http_cache import (
+    collection_etag,
+    document_etag,
+    etag_matches,
+    not_modified,
+    set_cache_headers
+)
+from app.utils.serialization import TrustedJSONResponse
+from app.utils.streaming import csv_stream, gzip_stream, ndjson_stream
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -68,24 +86,47 @@ async def create_unified_property(
             detail=f"Failed to create property: {str(e)}"
         )
 
-@router.get("/properties/", response_model=List[PropertyResponse])
+@router.get("/properties/", response_model=List[PropertySummary])
 async def get_unified_properties(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(current_active_user)
 ):
     """
-    Get all properties for the current user with unified functionality.
+    Get all properties for the current user as compact summaries.
+    Use /properties/{property_id} for the full property.
+    
+    Supports keyset pagination: pass the X-Next-Cursor header value of the
+    previous response as cursor to fetch the next page at constant cost.
+    Responds 304 when If-None-Match matches the page's ETag. Summaries are
+    serialized directly, without response_model re-validation.
     """
     try:
         user_id = getattr(current_user, "id", "anonymous")
         
         service = get_unified_property_service()
-        properties = await service.get_properties_by_user(user_id, skip=skip, limit=limit)
+        page = await service.get_properties_by_user(
+            user_id, skip=skip, limit=limit, cursor=cursor
+        )
+        etag = collection_etag(page.items, page.next_cursor)
+        if etag_matches(request, etag):
+            return not_modified(etag)
         
-        logger.info(f"Retrieved {len(properties)} properties for user {user_id}")
-        return properties
+        result = TrustedJSONResponse(page.items)
+        set_cache_headers(result, etag)
+        if page.next_cursor:
+            result.headers["X-Next-Cursor"] = page.next_cursor
         
+        logger.info(f"Retrieved {len(page.items)} properties for user {user_id}")
+        return result
+        
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error retrieving properties: {e}")
         raise HTTPException(
@@ -93,28 +134,315 @@ async def get_unified_properties(
             detail="Failed to retrieve properties"
         )
 
+@router.get("/properties/cache/stats")
+async def get_property_cache_stats(
+    current_user: User = Depends(current_superuser)
+):
+    """
+    Get hit, miss and eviction counters of the in-process property cache.
+    Admins only.
+    """
+    return {
+        "success": True,
+        "stats": property_cache.stats()
+    }
+
+# Declared before /properties/{property_id} so "export" is not captured as an id
+@router.get("/properties/export")
+async def export_properties(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to include"),
+    gzip: bool = False,
+    current_user: User = Depends(current_active_user)
+):
+    """
+    Stream the current user's full inventory as NDJSON or CSV.
+    
+    Documents are read from an async cursor and written as they arrive, so
+    memory use does not grow with inventory size. Set gzip=true to compress
+    the stream on the fly.
+    """
+    user_id = getattr(current_user, "id", "anonymous")
+    service = get_unified_property_service()
+    
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format must be 'ndjson' or 'csv'"
+        )
+    
+    try:
+        requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        export_fields = service.resolve_export_fields(requested)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    records = service.iter_properties_for_export(user_id, export_fields)
+    if format == "csv":
+        body = csv_stream(records, export_fields)
+        media_type = "text/csv"
+    else:
+        body = ndjson_stream(records)
+        media_type = "application/x-ndjson"
+    
+    filename = f"properties.{format}"
+    headers = {}
+    if gzip:
+        body = gzip_stream(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    
+    logger.info(f"Streaming {format} export for user {user_id} (gzip={gzip})")
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+@router.get("/properties/quality/lowest", response_model=List[PropertySummary])
+async def get_lowest_quality_properties(
+    limit: int = Query(20, ge=1, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    current_user: User = Depends(current_active_user)
+):
+    """
+    Get the current user's lowest-quality listings, worst first.
+    Optionally only listings scoring at most max_score.
+    """
+    try:
+        user_id = getattr(current_user, "id", "anonymous")
+        
+        service = get_unified_property_service()
+        return await service.get_lowest_quality_properties(
+            user_id, limit=limit, max_score=max_score
+        )
+        
+    except Exception as e:
+        logger.error(f"Error retrieving lowest-quality properties: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve lowest-quality properties"
+        )
+
+@router.get("/properties/search/faceted", response_model=FacetedSearchResult)
+async def faceted_search_properties(
+    query: Optional[str] = None,
+    property_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    location: Optional[str] = None,
+    bedrooms: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(current_active_user)
+):
+    """
+    Search properties and return hits with property_type, bedrooms, price
+    and locality facet counts, all from one aggregation.
+    """
+    try:
+        user_id = getattr(current_user, "id", "anonymous")
+        
+        service = get_unified_property_service()
+        return await service.faceted_search(
+            query=query,
+            property_type=property_type,
+            min_price=min_price,
+            max_price=max_price,
+            location=location,
+            bedrooms=bedrooms,
+            user_id=user_id,
+            skip=skip,
+            limit=limit
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in faceted property search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search properties"
+        )
+
+@router.get("/properties/geo/radius", response_model=List[PropertySummary])
+async def get_properties_within_radius(
+    longitude: float = Query(..., ge=-180, le=180),
+    latitude: float = Query(..., ge=-90, le=90),
+    radius_km: float = Query(..., gt=0, le=500),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(current_active_user)
+):
+    """
+    Get the current user's properties within radius_km of a point.
+    """
+    try:
+        user_id = getattr(current_user, "id", "anonymous")
+        
+        service = get_unified_property_service()
+        return await service.find_properties_within_radius(
+            longitude, latitude, radius_km, user_id=user_id, limit=limit
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in radius property search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search properties by radius"
+        )
+
+@router.get("/properties/geo/bbox", response_model=List[PropertySummary])
+async def get_properties_in_bounding_box(
+    min_longitude: float = Query(..., ge=-180, le=180),
+    min_latitude: float = Query(..., ge=-90, le=90),
+    max_longitude: float = Query(..., ge=-180, le=180),
+    max_latitude: float = Query(..., ge=-90, le=90),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(current_active_user)
+):
+    """
+    Get the current user's properties inside a bounding box.
+    """
+    if min_longitude >= max_longitude or min_latitude >= max_latitude:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bounding box minimums must be smaller than maximums"
+        )
+    
+    try:
+        user_id = getattr(current_user, "id", "anonymous")
+        
+        service = get_unified_property_service()
+        return await service.find_properties_in_bounding_box(
+            min_longitude, min_latitude, max_longitude, max_latitude,
+            user_id=user_id, limit=limit
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in bounding-box property search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search properties by bounding box"
+        )
+
+@router.get("/properties/geo/nearest", response_model=List[NearbyPropertySummary])
+async def get_nearest_properties(
+    longitude: float = Query(..., ge=-180, le=180),
+    latitude: float = Query(..., ge=-90, le=90),
+    limit: int = Query(10, ge=1, le=100),
+    max_distance_km: Optional[float] = Query(None, gt=0),
+    current_user: User = Depends(current_active_user)
+):
+    """
+    Get the current user's properties nearest to a point, closest first.
+    """
+    try:
+        user_id = getattr(current_user, "id", "anonymous")
+        
+        service = get_unified_property_service()
+        return await service.find_nearest_properties(
+            longitude, latitude, limit=limit,
+            max_distance_km=max_distance_km, user_id=user_id
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in nearest property search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to find nearest properties"
+        )
+
+# Declared before /properties/{property_id} so "search" is not captured as an id
+@router.get("/properties/search")
+async def search_properties(
+    query: str,
+    property_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    location: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    current_user: User = Depends(current_active_user)
+):
+    """
+    Search properties with advanced filtering.
+    """
+    try:
+        user_id = getattr(current_user, "id", "anonymous")
+        
+        service = get_unified_property_service()
+        results = await service.search_properties(
+            query=query,
+            property_type=property_type,
+            min_price=min_price,
+            max_price=max_price,
+            location=location,
+            user_id=user_id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
+        
+        return {
+            "success": True,
+            "results": results.items,
+            "total": len(results.items),
+            "next_cursor": results.next_cursor,
+            "query": query,
+            "filters": {
+                "property_type": property_type,
+                "min_price": min_price,
+                "max_price": max_price,
+                "location": location
+            }
+        }
+        
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error searching properties: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search properties"
+        )
+
 @router.get("/properties/{property_id}", response_model=PropertyResponse)
 async def get_unified_property(
     property_id: str,
+    request: Request,
     current_user: User = Depends(current_active_user)
 ):
     """
     Get a specific property by ID with unified functionality.
+    
+    The ETag is versioned by updated_at and quality_scored_at; a matching
+    If-None-Match is answered with 304 before the document is built or
+    serialized.
     """
     try:
         user_id = getattr(current_user, "id", "anonymous")
         
         service = get_unified_property_service()
-        property_data = await service.get_property(property_id, user_id)
+        doc = await service.get_property_document(property_id, user_id)
         
-        if not property_data:
+        if not doc:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Property not found"
             )
         
-        return property_data
+        etag = document_etag(doc)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        result = TrustedJSONResponse(service._convert_doc_to_response(doc))
+        set_cache_headers(result, etag)
+        return result
         
+    except HTTPException:
+        raise
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -127,6 +455,39 @@ async def get_unified_property(
             detail="Failed to retrieve property"
         )
 
+@router.get("/properties/{property_id}/similar", response_model=List[SimilarPropertySummary])
+async def get_similar_properties(
+    property_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(current_active_user)
+):
+    """
+    Get the current user's active listings most similar to a property,
+    ranked by price, area, bedrooms, bathrooms, type and location.
+    """
+    try:
+        user_id = getattr(current_user, "id", "anonymous")
+        
+        service = get_unified_property_service()
+        similar = await service.find_similar_properties(property_id, user_id, limit=limit)
+        
+        if similar is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found"
+            )
+        
+        return similar
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finding similar properties for {property_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to find similar properties"
+        )
+
 @router.put("/properties/{property_id}", response_model=PropertyResponse)
 async def update_unified_property(
     property_id: str,
@@ -301,22 +662,29 @@ async def get_property_analytics(
 
 @router.post("/properties/batch-create")
 async def batch_create_properties(
-    properties_data: List[PropertyCreate],
+    properties_data: List[Dict[str, Any]],
+    chunk_size: int = Query(DEFAULT_BATCH_CHUNK_SIZE, ge=1, le=5000),
     current_user: User = Depends(current_active_user)
 ):
     """
-    Create multiple properties in a batch operation.
+    Create multiple properties in a bulk operation.
+    
+    Items are validated individually, so invalid rows are reported in the
+    per-item results instead of rejecting the whole batch.
     """
     try:
         user_id = getattr(current_user, "id", "anonymous")
         
         service = get_unified_property_service()
-        results = await service.batch_create_properties(properties_data, user_id)
+        report = await service.batch_create_properties(
+            properties_data, user_id, chunk_size=chunk_size
+        )
         
         return {
             "success": True,
-            "created_count": len(results),
-            "properties": results
+            "created_count": report.created_count,
+            "failed_count": report.failed_count,
+            "results": report.results
         }
         
     except Exception as e:
@@ -325,52 +693,3 @@ async def batch_create_properties(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create properties in batch"
         )
-
-@router.get("/properties/search")
-async def search_properties(
-    query: str,
-    property_type: Optional[str] = None,
-    min_price: Optional[float] = None,
-    max_price: Optional[float] = None,
-    location: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20,
-    current_user: User = Depends(current_active_user)
-):
-    """
-    Search properties with advanced filtering.
-    """
-    try:
-        user_id = getattr(current_user, "id", "anonymous")
-        
-        service = get_unified_property_service()
-        results = await service.search_properties(
-            query=query,
-            property_type=property_type,
-            min_price=min_price,
-            max_price=max_price,
-            location=location,
-            user_id=user_id,
-            skip=skip,
-            limit=limit
-        )
-        
-        return {
-            "success": True,
-            "results": results,
-            "total": len(results),
-            "query": query,
-            "filters": {
-                "property_type": property_type,
-                "min_price": min_price,
-                "max_price": max_price,
-                "location": location
-            }
-        }
-        
-    except Exception as e:
-        logger.error(f"Error searching properties: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to search properties"
-        )
\ No newline at end of file
@@ -19,6 +19,10 @@ from slowapi.util import get_remote_address
 
 from app.core.config import settings
 from app.core.auth_backend import get_current_user_id
+from app.core.database import get_database
+from app.core.exceptions import ValidationError
+from app.services.unified_property_service import UnifiedPropertyService
+from app.services import property_import_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -42,6 +46,7 @@ ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 ALLOWED_DOCUMENT_TYPES = {"application/pdf", "application/msword", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_IMAGES_PER_PROPERTY = 20
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
 
 class FileUploadService:
     """Service for handling file uploads and processing"""
@@ -95,6 +100,29 @@ class FileUploadService:
             logger.error(f"Error saving file {destination_path}: {e}")
             raise HTTPException(status_code=500, detail="Failed to save file")
 
+    @staticmethod
+    async def save_file_streaming(file: UploadFile, destination_path: Path, max_size: int) -> int:
+        """Copy an upload to disk in fixed-size chunks; returns the number of bytes written"""
+        written = 0
+        try:
+            async with aiofiles.open(destination_path, 'wb') as buffer:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > max_size:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"File too large. Maximum size: {max_size / (1024*1024)}MB"
+                        )
+                    await buffer.write(chunk)
+            return written
+        except HTTPException:
+            destination_path.unlink(missing_ok=True)
+            raise
+        except Exception as e:
+            destination_path.unlink(missing_ok=True)
+            logger.error(f"Error saving file {destination_path}: {e}")
+            raise HTTPException(status_code=500, detail="Failed to save file")
+
     @staticmethod
     async def process_image(image_path: Path) -> dict:
         """Process uploaded image (resize, optimize, etc.)"""
@@ -231,6 +259,57 @@ async def upload_documents(
         "files": uploaded_files
     })
 
+@router.post("/properties/import", status_code=202)
+@limiter.limit("5/minute")
+async def import_properties(
+    request: Request,
+    file: UploadFile = File(...),
+    agent_id: str = Depends(get_current_user_id)
+):
+    """
+    Import property listings from a CSV or Excel (.xlsx) spreadsheet.
+
+    The header row names PropertyCreate fields; multi-value cells such as
+    features use ';' as separator. The file is processed in the background;
+    poll the returned job via GET /uploads/properties/import/{job_id}.
+    """
+    try:
+        kind = property_import_service.detect_import_format(file.filename)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    temp_path = TEMP_DIR / FileUploadService.generate_unique_filename(file.filename)
+    size = await FileUploadService.save_file_streaming(
+        file, temp_path, settings.property_import_max_file_size
+    )
+
+    db = get_database()
+    job = await property_import_service.create_import_job(db, agent_id, file.filename)
+    service = UnifiedPropertyService(db)
+    property_import_service.start_import(db, job, temp_path, kind, service)
+
+    logger.info(f"Started property import {job.job_id} for agent {agent_id} ({size} bytes)")
+    return JSONResponse(status_code=202, content={
+        "success": True,
+        "message": "Import started",
+        "job": job.model_dump(mode="json")
+    })
+
+@router.get("/properties/import/{job_id}")
+async def get_property_import_status(
+    job_id: str,
+    agent_id: str = Depends(get_current_user_id)
+):
+    """Get progress and rejected rows of a property import"""
+    job = await property_import_service.get_import_job(get_database(), job_id)
+    if job is None or job.agent_id != str(agent_id):
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    return JSONResponse(content={
+        "success": True,
+        "job": job.model_dump(mode="json")
+    })
+
 @router.delete("/files/{file_id}")
 async def delete_file(
     file_id: str,
@@ -11,6 +11,7 @@ from app.core.rate_limiting import setup_rate_limiting
 from app.core.middleware import setup_cors_middleware, setup_logging_middleware
 from app.core.routes import setup_routes, setup_additional_endpoints
 from app.logging_config import setup_comprehensive_logging, get_logger
+from app.utils.serialization import TrustedJSONResponse
 import logging
 
 
@@ -27,11 +28,13 @@ def create_application() -> FastAPI:
     for module in ['app.services.auth_service', 'app.repositories.user_repository', 'app.api.v1.endpoints.auth']:
         logging.getLogger(module).setLevel(logging.DEBUG)
 
-    # Create FastAPI app
+    # Create FastAPI app; every JSON response is rendered by pydantic-core
+    # (see app.utils.serialization)
     app = FastAPI(
         title="PropertyAI API",
         description="AI-powered real estate platform API",
-        version="2.0.0"
+        version="2.0.0",
+        default_response_class=TrustedJSONResponse
     )
 
     # Setup components
@@ -61,6 +64,20 @@ def create_application() -> FastAPI:
             if db is not None:
                 initialize_analytics_service(db)
                 logger.info("📈 Analytics service initialized")
+                
+                # Give imports orphaned by a dead worker a terminal status
+                from app.services.property_import_service import fail_stale_import_jobs
+                await fail_stale_import_jobs(db)
+                
+                # Move aged sold/inactive listings to the archive tier on a
+                # schedule; only the worker holding the archive lease sweeps
+                from app.services.property_archive import start_archive_scheduler
+                start_archive_scheduler(db)
+                
+                # Flush buffered view/inquiry/share events in the background;
+                # runs in every worker, each flushing its own buffer
+                from app.services.engagement_events import start_engagement_flusher
+                start_engagement_flusher(db)
             
         except Exception as e:
             logger.error(f"❌ Failed to connect to MongoDB: {e}")
@@ -71,6 +88,15 @@ def create_application() -> FastAPI:
     async def shutdown_event():
         """Close MongoDB connection on shutdown"""
         try:
+            from app.services.property_import_service import shutdown_import_workers
+            shutdown_import_workers()
+            
+            from app.services.property_archive import stop_archive_scheduler
+            stop_archive_scheduler()
+            
+            from app.services.engagement_events import stop_engagement_flusher
+            await stop_engagement_flusher()
+            
             await close_database()
             logger.info("📊 MongoDB connection closed")
         except Exception as e:
@@ -106,12 +106,45 @@ class Settings(BaseSettings):
     enable_analytics: bool = True
     enable_ai_features: bool = True
     
+    # =============================================================================
+    # PERFORMANCE & CACHING
+    # =============================================================================
+    property_cache_max_entries: int = 2048
+    property_cache_ttl_seconds: int = 60
+    property_import_batch_size: int = 500
+    property_import_workers: int = 2
+    property_import_max_file_size: int = 50 * 1024 * 1024  # 50MB
+    property_import_stale_minutes: int = 30  # idle unfinished jobs are failed on startup
+    similarity_index_refresh_seconds: int = 900
+    public_page_max_age: int = 60  # Cache-Control max-age for public agent pages
+    agent_snapshot_max_cards: int = 24  # newest published cards embedded in a public agent snapshot
+    # Sold/inactive listings untouched this long move to properties_archive
+    property_archive_after_days: int = 180
+    property_archive_interval_hours: int = 24  # 0 disables the in-process archive schedule
+    property_archive_batch_size: int = 500
+    # Serve dashboards from analytics_daily_rollups once seeded
+    analytics_rollups_enabled: bool = True
+    analytics_max_concurrent_queries: int = 8  # per dashboard request
+    analytics_section_timeout_seconds: float = 5.0
+    dashboard_cache_max_entries: int = 1024
+    # Older entries are served while refreshed in the background
+    dashboard_cache_fresh_seconds: int = 30
+    dashboard_cache_max_stale_seconds: int = 600  # older entries are recomputed before serving
+    engagement_flush_interval_seconds: float = 5.0
+    engagement_flush_batch_size: int = 500  # pending events that trigger an early flush
+    engagement_buffer_max_events: int = 50000  # events beyond this are dropped until the next flush
+    engagement_event_retention_days: int = 30  # raw engagement_events; 0 keeps them indefinitely
+    engagement_minute_retention_hours: int = 48  # per-minute engagement_series buckets
+    engagement_hour_retention_days: int = 90  # per-hour engagement_series buckets
+    
     # =============================================================================
     # EXTERNAL SERVICES
     # =============================================================================
     openai_api_key: Optional[str] = None
     groq_api_key: Optional[str] = None
     google_maps_api_key: Optional[str] = None
+    # CSV of name,latitude,longitude; defaults to app/data/gazetteer_in.csv
+    gazetteer_path: Optional[str] = None
     
     # =============================================================================
     # BACKUP CONFIGURATION
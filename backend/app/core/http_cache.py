@@ -0,0 +1,90 @@
+"""
+HTTP Caching Helpers
+====================
+Strong ETags and conditional GET handling for read endpoints.
+
+ETags are derived from document ids and updated_at timestamps, never from
+the response body. The quality rescore job changes scores without touching
+updated_at, so documents are also versioned by quality_scored_at and list
+items by their quality_score. A matching If-None-Match is answered with an
+empty 304 before the response model is serialized.
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+# Authenticated resources: browsers may store them but must revalidate each use
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def public_cache_control(max_age: int) -> str:
+    """Cache-Control for public pages that shared caches may serve while fresh"""
+    return f"public, max-age={max_age}, stale-while-revalidate={max_age * 5}"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the string forms of parts"""
+    digest = hashlib.sha1()
+    for part in parts:
+        value = part.isoformat() if hasattr(part, "isoformat") else str(part)
+        digest.update(value.encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def document_etag(doc: Dict[str, Any]) -> str:
+    """ETag of a stored document, versioned by updated_at and quality_scored_at"""
+    return make_etag(
+        doc.get("_id", doc.get("id")), doc.get("updated_at"), doc.get("quality_scored_at")
+    )
+
+
+def collection_etag(items: Iterable[Any], *extra: Any) -> str:
+    """ETag of a list of models or documents that carry id and updated_at"""
+    parts = []
+    for item in items:
+        if isinstance(item, dict):
+            parts.extend((
+                item.get("_id", item.get("id")),
+                item.get("updated_at"),
+                item.get("quality_score"),
+            ))
+        else:
+            parts.extend((
+                getattr(item, "id", None),
+                getattr(item, "updated_at", None),
+                getattr(item, "quality_score", None),
+            ))
+    return make_etag(len(parts), *parts, *extra)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers etag (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: Optional[str] = PRIVATE_CACHE_CONTROL) -> Response:
+    """Empty 304 response carrying the validator"""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
+
+
+def set_cache_headers(
+    response: Response,
+    etag: str,
+    cache_control: Optional[str] = PRIVATE_CACHE_CONTROL
+) -> None:
+    """Attach ETag and Cache-Control to a 200 response"""
+    response.headers["ETag"] = etag
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
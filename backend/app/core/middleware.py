@@ -71,6 +71,7 @@ def setup_cors_middleware(app):
             allow_credentials=True,
             allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
             allow_headers=["*"],
+            expose_headers=["ETag", "X-Next-Cursor"],
         )
     else:
         # Development: Allow localhost any port and ngrok any subdomain
@@ -80,6 +81,7 @@ def setup_cors_middleware(app):
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["ETag", "X-Next-Cursor"],
         )
 
 
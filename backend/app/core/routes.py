@@ -58,23 +58,27 @@ def setup_additional_endpoints(app: FastAPI):
         """Get dashboard statistics from database (MongoDB or Mock)"""
         try:
             from app.core.database import get_database
+            from app.services.dashboard_cache import get_cached_dashboard_stats
             db = get_database()
 
-            # Get real stats from database
-            total_properties = await db.properties.count_documents({})
-            active_listings = await db.properties.count_documents({"status": "available"})
-            total_leads = await db.leads.count_documents({})
-            total_users = await db.users.count_documents({})
+            async def compute_stats():
+                # Get real stats from database
+                total_properties = await db.properties.count_documents({})
+                active_listings = await db.properties.count_documents({"status": "available"})
+                total_leads = await db.leads.count_documents({})
+                total_users = await db.users.count_documents({})
 
-            stats = {
-                "total_properties": total_properties,
-                "active_listings": active_listings,
-                "total_leads": total_leads,
-                "total_users": total_users,
-                "total_views": 1247,  # Mock for now
-                "monthly_leads": 23,  # Mock for now
-                "revenue": "₹45,00,000"  # Mock for now
-            }
+                return {
+                    "total_properties": total_properties,
+                    "active_listings": active_listings,
+                    "total_leads": total_leads,
+                    "total_users": total_users,
+                    "total_views": 1247,  # Mock for now
+                    "monthly_leads": 23,  # Mock for now
+                    "revenue": "₹45,00,000"  # Mock for now
+                }
+
+            stats = await get_cached_dashboard_stats(compute_stats)
 
             return {
                 "success": True,
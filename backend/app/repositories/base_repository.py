@@ -3,6 +3,9 @@ from bson import ObjectId
 from datetime import datetime
 import logging
 import motor.motor_asyncio
+from pymongo import ReturnDocument
+
+from app.core.exceptions import NotFoundError
 
 logger = logging.getLogger(__name__)
 
@@ -50,8 +53,9 @@ class BaseRepository:
             document = self._prepare_document(data.copy())
             result = await self.collection.insert_one(document)
             
-            created_doc = await self.collection.find_one({"_id": result.inserted_id})
-            return self._format_document(created_doc)
+            # The inserted document is exactly what we sent; no need to re-read it
+            document["_id"] = result.inserted_id
+            return self._format_document(document)
             
         except Exception as e:
             logger.error(f"Create error in {self.collection_name}: {e}")
@@ -91,15 +95,15 @@ class BaseRepository:
             
             data["updated_at"] = datetime.utcnow()
             
-            result = await self.collection.update_one(
+            updated_doc = await self.collection.find_one_and_update(
                 {"_id": ObjectId(document_id)},
-                {"$set": data}
+                {"$set": data},
+                return_document=ReturnDocument.AFTER
             )
             
-            if result.matched_count == 0:
+            if updated_doc is None:
                 raise NotFoundError("Document")
             
-            updated_doc = await self.collection.find_one({"_id": ObjectId(document_id)})
             return self._format_document(updated_doc)
             
         except Exception as e:
@@ -20,6 +20,7 @@ from app.schemas.analytics import AnalyticsFilter, DashboardMetrics, AnalyticsPe
 from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse, TeamInvitation
 from app.services.lead_management_service import LeadManagementService
 from app.services.analytics_service import AnalyticsService
+from app.services.dashboard_cache import get_cached_dashboard_metrics
 from app.services.team_management_service import TeamManagementService
 from app.core.database import get_database
 from app.utils import verify_jwt_token
@@ -180,6 +181,7 @@ async def get_dashboard_metrics(
     period: AnalyticsPeriod = Query(AnalyticsPeriod.THIS_MONTH),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
+    include_archived: bool = Query(False, description="Include listings moved to the archive tier"),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """Get comprehensive dashboard metrics"""
@@ -204,11 +206,15 @@ async def get_dashboard_metrics(
         filters = AnalyticsFilter(
             period=period,
             start_date=parsed_start_date,
-            end_date=parsed_end_date
+            end_date=parsed_end_date,
+            include_archived=include_archived
         )
         
-        # Get metrics
-        metrics = await analytics_service.get_dashboard_metrics(agent_id, team_id, filters)
+        # Get metrics (served from the dashboard cache, refreshed in the background)
+        metrics = await get_cached_dashboard_metrics(
+            agent_id, team_id, filters,
+            lambda: analytics_service.get_dashboard_metrics(agent_id, team_id, filters)
+        )
         
         return metrics
         
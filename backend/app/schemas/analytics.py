@@ -118,14 +118,17 @@ class RevenueAnalytics(BaseModel):
 
 class DashboardMetrics(BaseModel):
     overview_metrics: List[AnalyticsMetric]
-    property_analytics: PropertyAnalytics
-    lead_analytics: LeadAnalytics
+    # Sections are None when they failed or timed out
+    property_analytics: Optional[PropertyAnalytics] = None
+    lead_analytics: Optional[LeadAnalytics] = None
     team_analytics: Optional[TeamAnalytics] = None
     market_analytics: Optional[MarketAnalytics] = None
     revenue_analytics: Optional[RevenueAnalytics] = None
     generated_at: datetime
     period: AnalyticsPeriod
     date_range: Dict[str, date]
+    # Sections left empty after a timeout or error
+    failed_sections: List[str] = Field(default_factory=list)
 
 class AnalyticsFilter(BaseModel):
     period: AnalyticsPeriod = AnalyticsPeriod.THIS_MONTH
@@ -137,6 +140,7 @@ class AnalyticsFilter(BaseModel):
     locations: Optional[List[str]] = None
     lead_sources: Optional[List[str]] = None
     include_inactive: bool = False
+    include_archived: bool = False  # union properties_archive into property metrics
 
 class ChartData(BaseModel):
     labels: List[str]
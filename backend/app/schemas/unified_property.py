@@ -4,7 +4,7 @@ Unified Property Schema
 Consolidated property model that replaces all conflicting property schemas
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from bson import ObjectId
@@ -28,6 +28,23 @@ class PyObjectId(ObjectId):
         return field_schema
 
 
+class GeoPoint(BaseModel):
+    """GeoJSON point; coordinates are [longitude, latitude]"""
+    type: str = "Point"
+    coordinates: List[float]
+
+    @field_validator('coordinates')
+    @classmethod
+    def validate_coordinates(cls, v):
+        """Validate longitude/latitude ranges"""
+        if len(v) != 2:
+            raise ValueError('coordinates must be [longitude, latitude]')
+        longitude, latitude = v
+        if not -180 <= longitude <= 180 or not -90 <= latitude <= 90:
+            raise ValueError('coordinates out of range')
+        return v
+
+
 class PropertyBase(BaseModel):
     """Base property model with all common fields"""
     title: str
@@ -35,6 +52,7 @@ class PropertyBase(BaseModel):
     property_type: str  # apartment, house, commercial, etc.
     price: float  # Unified as float for consistency
     location: str
+    geo_location: Optional[GeoPoint] = None  # 2dsphere-indexed; geocoded from location if omitted
     bedrooms: int
     bathrooms: float  # Can be half bathrooms (1.5, 2.5, etc.)
     area_sqft: Optional[int] = None
@@ -78,6 +96,7 @@ class PropertyUpdate(BaseModel):
     property_type: Optional[str] = None
     price: Optional[float] = None
     location: Optional[str] = None
+    geo_location: Optional[GeoPoint] = None
     bedrooms: Optional[int] = None
     bathrooms: Optional[float] = None
     area_sqft: Optional[int] = None
@@ -106,6 +125,8 @@ class PropertyResponse(PropertyBase):
     id: str
     created_at: datetime
     updated_at: datetime
+    quality_score: Optional[int] = None  # persisted; see services/quality_scoring.py
+    quality_breakdown: Optional[Dict[str, int]] = None
 
     class Config:
         populate_by_name = True
@@ -113,11 +134,105 @@ class PropertyResponse(PropertyBase):
         json_encoders = {ObjectId: str}
 
 
+class PropertySummary(BaseModel):
+    """
+    Compact property representation for list and search views.
+    
+    Carries only the card fields; heavy AI/market payloads stay on the full
+    PropertyResponse served by the single-property endpoint.
+    """
+    id: str
+    title: str
+    property_type: str
+    price: float
+    location: str
+    geo_location: Optional[GeoPoint] = None
+    bedrooms: int
+    bathrooms: float
+    area_sqft: Optional[int] = None
+    status: str = "active"
+    publishing_status: str = "draft"
+    agent_id: Optional[str] = None
+    images: Optional[List[str]] = Field(default_factory=list)  # cover image only
+    published_at: Optional[datetime] = None
+    quality_score: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class NearbyPropertySummary(PropertySummary):
+    """Property summary with its distance from the query point"""
+    distance_km: float
+
+
+class SimilarPropertySummary(PropertySummary):
+    """Property summary ranked as a comparable of another property"""
+    similarity: float  # 1.0 for identical features, approaching 0 as they diverge
+
+
+class PropertyPage(BaseModel):
+    """Schema for a page of properties with an opaque keyset cursor"""
+    items: List[PropertySummary] = Field(default_factory=list)
+    next_cursor: Optional[str] = None  # None when there are no more pages
+
+
+class FacetBucket(BaseModel):
+    """One facet value and its hit count; range facets also carry the upper bound"""
+    value: Any
+    count: int
+    max_value: Optional[float] = None  # exclusive upper bound for range buckets
+
+
+class FacetedSearchResult(BaseModel):
+    """Search hits plus facet counts computed under the same filter"""
+    items: List[PropertySummary] = Field(default_factory=list)
+    total: int = 0
+    facets: Dict[str, List[FacetBucket]] = Field(default_factory=dict)
+
+
+class BatchCreateItemResult(BaseModel):
+    """Outcome of one item in a bulk create (id on success, error otherwise)"""
+    index: int
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchCreateReport(BaseModel):
+    """Per-item report returned by bulk property creation"""
+    created_count: int
+    failed_count: int
+    results: List[BatchCreateItemResult] = Field(default_factory=list)
+
+
+class ImportRowError(BaseModel):
+    """A rejected spreadsheet row (row 1 is the header)"""
+    row: int
+    error: str
+
+
+class PropertyImportJob(BaseModel):
+    """Progress of a background spreadsheet import"""
+    job_id: str
+    agent_id: str
+    filename: str
+    status: str = "queued"  # queued, running, completed, failed
+    rows_read: int = 0
+    created_count: int = 0
+    failed_count: int = 0
+    errors: List[ImportRowError] = Field(default_factory=list)  # first errors only
+    message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
 class PropertyDocument(PropertyBase):
     """MongoDB document model for properties"""
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    sold_at: Optional[datetime] = None  # see services/property_transitions.py
+    quality_score: Optional[int] = None
+    quality_breakdown: Optional[Dict[str, int]] = None
 
     class Config:
         populate_by_name = True
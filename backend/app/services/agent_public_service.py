@@ -4,17 +4,23 @@ Agent Public Service
 Service layer for agent public website functionality
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.schemas.agent_public import AgentPublicProfile, PublicProperty, ContactInquiry
 from app.schemas.agent_public import (
     AgentPublicProfileCreate,
     AgentPublicProfileUpdate,
-    PublicPropertyCreate,
-    PublicPropertyUpdate,
     PropertySearchFilters,
     ContactInquiryCreate
 )
+from app.services.engagement_events import get_engagement_totals, get_unique_visitors, record_event
+from app.services.agent_public_snapshots import (
+    get_published_cards,
+    get_snapshot,
+    refresh_agent_snapshots,
+    snapshot_to_profile
+)
+import asyncio
 import logging
 from datetime import datetime
 
@@ -24,6 +30,9 @@ logger = logging.getLogger(__name__)
 _global_agent_profiles = {}
 _global_agent_properties = {}
 
+# Tracked contact actions that also count as engagement on a listing
+PROPERTY_ACTION_METRICS = {"share": "shares", "favorite": "favorites"}
+
 class AgentPublicService:
     """Service for agent public website operations"""
     
@@ -33,111 +42,13 @@ class AgentPublicService:
         global _global_agent_profiles
         _global_agent_profiles.clear()
     
-    async def _get_agent_properties_from_db(self, agent_id: str) -> List[PublicProperty]:
-        """Get published properties for an agent from the database"""
-        try:
-            # Query only published properties from the database where agent_id matches
-            properties_collection = self.db.get_collection("properties")
-            
-            # Debug logging
-            print(f"DEBUG: Querying properties for agent_id: {agent_id}")
-            query = {
-                "agent_id": agent_id,
-                "publishing_status": "published"  # Only get published properties
-            }
-            print(f"DEBUG: Query: {query}")
-            
-            # First, let's check what's actually in the database
-            all_properties = await properties_collection.find({"agent_id": agent_id}).to_list(length=None)
-            print(f"DEBUG: All properties for agent: {len(all_properties)}")
-            for prop in all_properties:
-                print(f"DEBUG: Property {prop.get('_id')}: status={prop.get('publishing_status')}")
-            
-            properties_docs = await properties_collection.find(query).to_list(length=None)
-            print(f"DEBUG: Found {len(properties_docs)} published properties")
-            
-            properties = []
-            for doc in properties_docs:
-                property_obj = PublicProperty(
-                    id=str(doc.get("_id", "")),
-                    agent_id=doc.get("agent_id", ""),
-                    title=doc.get("title", ""),
-                    description=doc.get("description", ""),
-                    price=doc.get("price", 0),
-                    property_type=doc.get("property_type", ""),
-                    status=doc.get("status", ""),
-                    bedrooms=doc.get("bedrooms", 0),
-                    bathrooms=doc.get("bathrooms", 0),
-                    area_sqft=doc.get("area", 0),
-                    location=doc.get("location", ""),
-                    address=doc.get("address", ""),
-                    city=doc.get("city", ""),
-                    state=doc.get("state", ""),
-                    zip_code=doc.get("zip_code", ""),
-                    features=doc.get("features", []),
-                    amenities=doc.get("amenities", []),
-                    images=doc.get("images", []),
-                    created_at=doc.get("created_at", datetime.now()),
-                    updated_at=doc.get("updated_at", datetime.now())
-                )
-                properties.append(property_obj)
-            
-            return properties
-        except Exception as e:
-            logger.error(f"Error fetching properties for agent {agent_id}: {e}")
-            return []
-    
     async def get_agent_by_slug(self, slug: str) -> Optional[AgentPublicProfile]:
-        """Get agent public profile by slug"""
+        """Get agent public profile by slug, with published properties"""
         try:
-            # Always check database first for fresh data
-            print(f"DEBUG: Looking up agent profile for slug: {slug}")
-            agents_collection = self.db.get_collection("agent_public_profiles")
-            agent_doc = await agents_collection.find_one({"slug": slug})
-            print(f"DEBUG: Database lookup result: {agent_doc is not None}")
-            if agent_doc:
-                print(f"DEBUG: Found agent in database: {agent_doc.get('agent_name')}")
-                # Create profile from database
-                profile = AgentPublicProfile(
-                    id=str(agent_doc.get("_id", "")),
-                    agent_id=agent_doc.get("agent_id", ""),
-                    agent_name=agent_doc.get("agent_name", ""),
-                    slug=agent_doc.get("slug", ""),
-                    bio=agent_doc.get("bio", ""),
-                    photo=agent_doc.get("photo", ""),
-                    phone=agent_doc.get("phone", ""),
-                    email=agent_doc.get("email", ""),
-                    office_address=agent_doc.get("office_address", ""),
-                    specialties=agent_doc.get("specialties", []),
-                    experience=agent_doc.get("experience", ""),
-                    languages=agent_doc.get("languages", []),
-                    is_active=agent_doc.get("is_active", True),
-                    is_public=agent_doc.get("is_public", True),
-                    created_at=agent_doc.get("created_at", datetime.now()),
-                    updated_at=agent_doc.get("updated_at", datetime.now()),
-                    view_count=agent_doc.get("view_count", 0),
-                    contact_count=agent_doc.get("contact_count", 0)
-                )
-                
-                # Fetch properties for this agent
-                print(f"DEBUG: Fetching properties for agent_id: {profile.agent_id}")
-                properties = await self._get_agent_properties_from_db(profile.agent_id)
-                print(f"DEBUG: Found {len(properties)} properties")
-                # Add properties to the profile
-                profile_dict = profile.model_dump()
-                profile_dict['properties'] = [prop.model_dump() for prop in properties]
-                print(f"DEBUG: Returning profile with {len(profile_dict['properties'])} properties")
-                return AgentPublicProfile(**profile_dict)
-            
-            # Fallback to global cache if not in database (disabled for debugging)
-            # if slug in _global_agent_profiles:
-            #     profile = _global_agent_profiles[slug]
-            #     # Fetch properties for this agent
-            #     properties = await self._get_agent_properties_from_db(profile.agent_id)
-            #     # Add properties to the profile
-            #     profile_dict = profile.model_dump()
-            #     profile_dict['properties'] = [prop.model_dump() for prop in properties]
-            #     return AgentPublicProfile(**profile_dict)
+            # One indexed read of the precomputed public snapshot
+            snapshot = await get_snapshot(self.db, slug=slug)
+            if snapshot:
+                return snapshot_to_profile(snapshot)
             
             # Fall back to mock data for john-doe (for testing purposes only)
             if slug == "john-doe":
@@ -169,46 +80,11 @@ class AgentPublicService:
             return None
     
     async def get_agent_by_id(self, agent_id: str) -> Optional[AgentPublicProfile]:
-        """Get agent public profile by ID"""
+        """Get agent public profile by ID, with published properties"""
         try:
-            print(f"DEBUG: Looking up agent profile for ID: {agent_id}")
-            agents_collection = self.db.get_collection("agent_public_profiles")
-            agent_doc = await agents_collection.find_one({"_id": agent_id})
-            print(f"DEBUG: Database lookup result for ID: {agent_doc is not None}")
-            
-            if agent_doc:
-                print(f"DEBUG: Found agent in database by ID: {agent_doc.get('agent_name')}")
-                # Create profile from database
-                profile = AgentPublicProfile(
-                    id=str(agent_doc.get("_id", "")),
-                    agent_id=agent_doc.get("agent_id", ""),
-                    agent_name=agent_doc.get("agent_name", ""),
-                    slug=agent_doc.get("slug", ""),
-                    bio=agent_doc.get("bio", ""),
-                    photo=agent_doc.get("photo", ""),
-                    phone=agent_doc.get("phone", ""),
-                    email=agent_doc.get("email", ""),
-                    office_address=agent_doc.get("office_address", ""),
-                    specialties=agent_doc.get("specialties", []),
-                    experience=agent_doc.get("experience", ""),
-                    languages=agent_doc.get("languages", []),
-                    is_active=agent_doc.get("is_active", True),
-                    is_public=agent_doc.get("is_public", True),
-                    created_at=agent_doc.get("created_at", datetime.now()),
-                    updated_at=agent_doc.get("updated_at", datetime.now()),
-                    view_count=agent_doc.get("view_count", 0),
-                    contact_count=agent_doc.get("contact_count", 0)
-                )
-                
-                # Fetch properties for this agent
-                print(f"DEBUG: Fetching properties for agent_id: {profile.agent_id}")
-                properties = await self._get_agent_properties_from_db(profile.agent_id)
-                print(f"DEBUG: Found {len(properties)} properties")
-                # Add properties to the profile
-                profile_dict = profile.model_dump()
-                profile_dict['properties'] = [prop.model_dump() for prop in properties]
-                print(f"DEBUG: Returning profile with {len(profile_dict['properties'])} properties")
-                return AgentPublicProfile(**profile_dict)
+            snapshot = await get_snapshot(self.db, agent_id=agent_id)
+            if snapshot:
+                return snapshot_to_profile(snapshot)
             
             # Fall back to mock data for testing
             if agent_id == "mock-agent-id":
@@ -256,15 +132,13 @@ class AgentPublicService:
             profile_dict = profile.model_dump()
             profile_dict['_id'] = agent_id  # Use agent_id as _id for consistency
             
-            print(f"DEBUG: Storing agent profile in database: {profile_dict}")
             try:
-                result = await agents_collection.insert_one(profile_dict)
-                print(f"DEBUG: Database insert result: {result.inserted_id}")
-            except Exception as e:
-                print(f"DEBUG: Database insert error: {e}")
+                await agents_collection.insert_one(profile_dict)
+            except Exception:
                 # Try to update if already exists
                 await agents_collection.replace_one({"_id": agent_id}, profile_dict, upsert=True)
-                print(f"DEBUG: Database upsert completed")
+            
+            await refresh_agent_snapshots(self.db, [agent_id])
             
             logger.info(f"Created agent profile: {profile.agent_name} with slug: {slug}")
             return profile
@@ -275,49 +149,33 @@ class AgentPublicService:
     async def update_agent_profile(self, agent_id: str, profile_data: AgentPublicProfileUpdate) -> Optional[AgentPublicProfile]:
         """Update agent public profile"""
         try:
-            # Mock implementation
+            update_data = profile_data.model_dump(exclude_unset=True, exclude_none=True)
+            if update_data:
+                update_data["updated_at"] = datetime.now()
+                await self.db.get_collection("agent_public_profiles").update_one(
+                    {"_id": agent_id},
+                    {"$set": update_data}
+                )
+                await refresh_agent_snapshots(self.db, [agent_id])
             return await self.get_agent_by_id(agent_id)
         except Exception as e:
             logger.error(f"Error updating agent profile: {e}")
             return None
     
     async def get_agent_properties(self, agent_id: str, query_filters: PropertySearchFilters, page: int = 1, limit: int = 10) -> Dict[str, Any]:
-        """Get agent properties with filters and pagination"""
+        """Get agent properties with filters and pagination (page and limit come from filters)"""
         try:
-            # Mock data
-            properties = [
-                PublicProperty(
-                    id="1",
-                    agent_id=agent_id,
-                    title="Beautiful 3BR Apartment",
-                    description="Spacious apartment in prime location",
-                    price=2500000,
-                    property_type="Apartment",
-                    bedrooms=3,
-                    bathrooms=2,
-                    area=1200,
-                    location="Mumbai, Maharashtra",
-                    images=["https://example.com/image1.jpg"],
-                    features=["Parking", "Gym", "Pool"],
-                    is_active=True,
-                    is_public=True,
-                    created_at=datetime.now(),
-                    updated_at=datetime.now(),
-                    view_count=0,
-                    inquiry_count=0
-                )
-            ]
-            
-            return {
-                "properties": properties,
-                "total": len(properties),
-                "page": page,
-                "limit": limit,
-                "total_pages": 1
-            }
+            # Indexed query; the snapshot only embeds the newest cards
+            return await get_published_cards(self.db, agent_id, query_filters)
         except Exception as e:
             logger.error(f"Error getting agent properties: {e}")
-            return {"properties": [], "total": 0, "page": page, "limit": limit, "total_pages": 0}
+            return {
+                "properties": [],
+                "total": 0,
+                "page": query_filters.page,
+                "limit": query_filters.limit,
+                "total_pages": 0,
+            }
     
     async def get_agent_property(self, agent_id: str, property_id: str) -> Optional[PublicProperty]:
         """Get specific agent property"""
@@ -372,53 +230,59 @@ class AgentPublicService:
             logger.error(f"Error creating contact inquiry: {e}")
             return None
     
-    async def increment_view_count(self, agent_id: str) -> bool:
-        """Increment agent view count"""
-        try:
-            # Mock implementation - in real app, update database
-            logger.info(f"Incremented view count for agent {agent_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error incrementing view count: {e}")
-            return False
+    async def increment_view_count(self, agent_id: str, visitor_id: Optional[str] = None) -> bool:
+        """Count a public profile view (buffered, flushed in the background)"""
+        return record_event("agent", agent_id, "views", agent_id=agent_id, visitor_id=visitor_id)
     
-    async def increment_contact_count(self, agent_id: str) -> bool:
-        """Increment agent contact count"""
-        try:
-            # Mock implementation - in real app, update database
-            logger.info(f"Incremented contact count for agent {agent_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error incrementing contact count: {e}")
-            return False
+    async def increment_contact_count(
+        self,
+        agent_id: str,
+        property_id: Optional[str] = None
+    ) -> bool:
+        """Count a contact inquiry for the agent and, if given, the property it is about"""
+        recorded = record_event("agent", agent_id, "inquiries", agent_id=agent_id)
+        if property_id:
+            record_event("property", property_id, "inquiries", agent_id=agent_id)
+        return recorded
     
-    async def increment_property_view_count(self, property_id: str) -> bool:
-        """Increment property view count"""
-        try:
-            # Mock implementation - in real app, update database
-            logger.info(f"Incremented view count for property {property_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error incrementing property view count: {e}")
-            return False
+    async def increment_property_view_count(
+        self,
+        property_id: str,
+        agent_id: Optional[str] = None,
+        visitor_id: Optional[str] = None
+    ) -> bool:
+        """Count a public property view (buffered, flushed in the background)"""
+        return record_event(
+            "property", property_id, "views", agent_id=agent_id, visitor_id=visitor_id
+        )
     
     async def track_contact_action(self, agent_id: str, action_data: dict) -> bool:
-        """Track contact-related actions"""
-        try:
-            # Mock implementation - in real app, log to database
-            logger.info(f"Tracked contact action for agent {agent_id}: {action_data}")
-            return True
-        except Exception as e:
-            logger.error(f"Error tracking contact action: {e}")
-            return False
+        """
+        Track contact-related actions. Share and favorite actions on a listing
+        ({"action": "share", "property_id": ...}) count towards the property.
+        """
+        action = str(action_data.get("action") or "")
+        property_id = action_data.get("property_id")
+        metric = PROPERTY_ACTION_METRICS.get(action)
+        if metric and property_id:
+            record_event("property", str(property_id), metric, agent_id=agent_id)
+        return record_event(
+            "agent", agent_id, "contact_actions", agent_id=agent_id, metadata={"action": action}
+        )
     
     async def get_agent_stats(self, agent_id: str) -> dict:
         """Get agent statistics"""
         try:
-            # Mock implementation
+            engagement, unique_7d, unique_30d = await asyncio.gather(
+                get_engagement_totals(self.db, "agent", agent_id),
+                get_unique_visitors(self.db, "agent", agent_id, days=7),
+                get_unique_visitors(self.db, "agent", agent_id, days=30)
+            )
             return {
-                "total_views": 0,
-                "total_contacts": 0,
+                "total_views": engagement["views"],
+                "total_contacts": engagement["inquiries"],
+                "unique_visitors_7d": unique_7d,
+                "unique_visitors_30d": unique_30d,
                 "properties_count": 1,
                 "recent_inquiries": 0
             }
@@ -427,6 +291,8 @@ class AgentPublicService:
             return {
                 "total_views": 0,
                 "total_contacts": 0,
+                "unique_visitors_7d": 0,
+                "unique_visitors_30d": 0,
                 "properties_count": 0,
                 "recent_inquiries": 0
             }
\ No newline at end of file
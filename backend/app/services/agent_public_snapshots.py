@@ -0,0 +1,240 @@
+"""
+Agent Public Snapshots
+======================
+Denormalized read model for the public agent website: one document per
+agent holding the public profile and the newest agent_snapshot_max_cards
+published listing cards.
+
+A public page view is a single indexed read by slug. Snapshots are rebuilt
+by the write paths (profile create/update, property writes touching a
+published listing, publish/unpublish) and seeded lazily on first view. The
+cap keeps a rebuild to one bounded index scan and the document far below the
+16MB limit however many listings an agent publishes; the paginated listings
+page reads further cards with get_published_cards on the same
+(agent_id, publishing_status, created_at) index.
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.schemas.agent_public import (
+    AgentPublicProfile,
+    PropertySearchFilters,
+    PropertyType,
+    PublicProperty,
+)
+from app.utils.serialization import construct_trusted
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "agent_public_snapshots"
+PROFILES_COLLECTION = "agent_public_profiles"
+
+# Profile fields copied into the snapshot
+PROFILE_FIELDS = (
+    "agent_id", "agent_name", "slug", "bio", "photo", "phone", "email",
+    "office_address", "specialties", "experience", "languages", "is_active",
+    "is_public", "created_at", "updated_at", "view_count", "contact_count",
+)
+
+CARD_PROJECTION = {
+    "agent_id": 1, "title": 1, "description": 1, "price": 1, "property_type": 1,
+    "bedrooms": 1, "bathrooms": 1, "area_sqft": 1, "location": 1, "images": 1,
+    "features": 1, "status": 1, "created_at": 1, "updated_at": 1,
+}
+
+# Public sort fields and the document fields behind them
+CARD_SORT_FIELDS = {
+    "created_at": "created_at", "price": "price", "area": "area_sqft",
+    "bedrooms": "bedrooms", "bathrooms": "bathrooms",
+}
+
+
+def _public_type(value: Any) -> Any:
+    """Match stored property types ("apartment") to the public enum ("Apartment")"""
+    for property_type in PropertyType:
+        if property_type.value.lower() == str(value or "").lower():
+            return property_type.value
+    return value
+
+
+def _whole(value: Any) -> Optional[int]:
+    try:
+        return int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _property_card(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a property document to a PublicProperty card, or None if it does not validate"""
+    now = datetime.utcnow()
+    try:
+        card = PublicProperty(
+            id=str(doc.get("_id", "")),
+            agent_id=doc.get("agent_id", ""),
+            title=doc.get("title", ""),
+            description=doc.get("description", ""),
+            price=doc.get("price", 0),
+            property_type=_public_type(doc.get("property_type")),
+            bedrooms=_whole(doc.get("bedrooms")),
+            bathrooms=_whole(doc.get("bathrooms")),
+            area=doc.get("area_sqft") or None,
+            location=doc.get("location", ""),
+            images=doc.get("images") or [],
+            features=doc.get("features") or [],
+            is_active=doc.get("status", "active") == "active",
+            created_at=doc.get("created_at") or now,
+            updated_at=doc.get("updated_at") or now
+        )
+    except Exception as e:
+        logger.warning(f"Skipping property {doc.get('_id')} in public snapshot: {e}")
+        return None
+    return card.model_dump()
+
+
+def _profile_fields(profile_doc: Dict[str, Any]) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    profile = {field: profile_doc.get(field) for field in PROFILE_FIELDS if field in profile_doc}
+    profile.setdefault("created_at", now)
+    profile.setdefault("updated_at", now)
+    return profile
+
+
+async def refresh_agent_snapshot(
+    db: AsyncIOMotorDatabase, agent_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild one agent's snapshot from the profile and published properties.
+    Removes the snapshot when the agent has no public profile.
+    """
+    agent_id = str(agent_id)
+    snapshots = db.get_collection(COLLECTION_NAME)
+
+    profile_doc = await db.get_collection(PROFILES_COLLECTION).find_one({"_id": agent_id})
+    if not profile_doc:
+        await snapshots.delete_one({"_id": agent_id})
+        return None
+
+    cursor = db.get_collection("properties").find(
+        {"agent_id": agent_id, "publishing_status": "published"},
+        CARD_PROJECTION
+    ).sort([("created_at", -1), ("_id", -1)]).limit(settings.agent_snapshot_max_cards)
+    cards = []
+    async for doc in cursor:
+        card = _property_card(doc)
+        if card:
+            cards.append(card)
+
+    snapshot = {
+        "_id": agent_id,
+        "slug": profile_doc.get("slug"),
+        "profile": {"id": str(profile_doc["_id"]), **_profile_fields(profile_doc)},
+        "properties": cards,
+        "refreshed_at": datetime.utcnow(),
+    }
+    await snapshots.replace_one({"_id": agent_id}, snapshot, upsert=True)
+    return snapshot
+
+
+async def refresh_agent_snapshots(db: AsyncIOMotorDatabase, agent_ids: Iterable[str]) -> None:
+    """Rebuild several snapshots; failures are logged, not raised (snapshots are derived data)"""
+    for agent_id in {str(a) for a in agent_ids if a}:
+        try:
+            await refresh_agent_snapshot(db, agent_id)
+        except Exception as e:
+            logger.error(f"Failed to refresh public snapshot for agent {agent_id}: {e}")
+
+
+def affected_agents(changes: Iterable[tuple]) -> List[str]:
+    """Agents whose public page changes with a set of (old_doc, new_doc) property writes"""
+    agents = set()
+    for old_doc, new_doc in changes:
+        for doc in (old_doc, new_doc):
+            if doc and doc.get("publishing_status") == "published" and doc.get("agent_id"):
+                agents.add(str(doc["agent_id"]))
+    return list(agents)
+
+
+def _card_query(agent_id: str, filters: PropertySearchFilters) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"agent_id": str(agent_id), "publishing_status": "published"}
+    if filters.location:
+        query["location"] = {"$regex": re.escape(filters.location), "$options": "i"}
+    if filters.property_type:
+        value = getattr(filters.property_type, "value", filters.property_type)
+        query["property_type"] = {"$regex": f"^{re.escape(value)}$", "$options": "i"}
+    ranges = (
+        ("price", filters.min_price, filters.max_price),
+        ("area_sqft", filters.min_area, filters.max_area),
+        ("bedrooms", filters.min_bedrooms, None),
+        ("bathrooms", filters.min_bathrooms, None),
+    )
+    for field, low, high in ranges:
+        bounds = {}
+        if low is not None:
+            bounds["$gte"] = low
+        if high is not None:
+            bounds["$lte"] = high
+        if bounds:
+            query[field] = bounds
+    if filters.features:
+        query["features"] = {"$all": filters.features}
+    return query
+
+
+async def get_published_cards(
+    db: AsyncIOMotorDatabase,
+    agent_id: str,
+    filters: PropertySearchFilters
+) -> Dict[str, Any]:
+    """One page of an agent's published listing cards, filtered and sorted, with the total"""
+    query = _card_query(agent_id, filters)
+    direction = 1 if filters.sort_order == "asc" else -1
+    sort_field = CARD_SORT_FIELDS.get(filters.sort_by, "created_at")
+
+    properties = db.get_collection("properties")
+    total = await properties.count_documents(query)
+    cursor = properties.find(query, CARD_PROJECTION).sort(
+        [(sort_field, direction), ("_id", direction)]
+    ).skip((filters.page - 1) * filters.limit).limit(filters.limit)
+
+    cards = []
+    async for doc in cursor:
+        card = _property_card(doc)
+        if card:
+            cards.append(card)
+    return {
+        "properties": cards,
+        "total": total,
+        "page": filters.page,
+        "limit": filters.limit,
+        "total_pages": (total + filters.limit - 1) // filters.limit,
+    }
+
+
+def snapshot_to_profile(snapshot: Dict[str, Any]) -> AgentPublicProfile:
+    """Materialize a snapshot document as the public profile response"""
+    return construct_trusted(
+        AgentPublicProfile,
+        {**snapshot["profile"], "properties": snapshot.get("properties", [])}
+    )
+
+
+async def get_snapshot(
+    db: AsyncIOMotorDatabase,
+    slug: Optional[str] = None,
+    agent_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Read a snapshot by slug or agent id, seeding it from the profile on a miss"""
+    query = {"slug": slug} if slug is not None else {"_id": str(agent_id)}
+    snapshot = await db.get_collection(COLLECTION_NAME).find_one(query)
+    if snapshot:
+        return snapshot
+
+    profile_doc = await db.get_collection(PROFILES_COLLECTION).find_one(query, {"_id": 1})
+    if not profile_doc:
+        return None
+    return await refresh_agent_snapshot(db, profile_doc["_id"])
@@ -0,0 +1,278 @@
+"""
+Analytics Daily Rollups
+=======================
+Pre-aggregated per-agent, per-team daily buckets behind the analytics
+dashboard.
+
+Each bucket document is keyed by "<agent_id>|<team_id>|<YYYY-MM-DD>", where
+the day is the created_at day of the properties and leads it counts, and
+holds two sections:
+
+- properties: count, counts by publishing status, property type, location and
+  price range, price count/sum, sold count, and days-on-market count/sum of
+  sold listings with a sold_at stamp
+- leads: count, counts by status, source, urgency and budget range, score
+  count/sum, and converted deal count/value in total and by source
+
+Property and lead writes apply the difference between the old and the new
+document with $inc, like the market aggregates. The rebuild job recomputes
+buckets from the raw collections to seed them and to catch up on writes made
+outside the service layer. Dashboard reads merge the buckets of an agent or
+team, one small document per active day, instead of scanning raw data.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote
+
+from app.services.property_transitions import SOLD_STATUS, days_on_market
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "analytics_daily_rollups"
+STATE_COLLECTION = "analytics_rollup_state"
+STATE_ID = "daily_rollups"
+
+# Bucket day of documents without a usable created_at; sorts before real days
+UNDATED_DAY = "0000-00-00"
+
+# Lower bounds of the dashboard's price and budget ranges
+RANGE_BOUNDARIES = (0, 100000, 250000, 500000, 750000, 1000000, 2000000)
+
+Change = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+Contribution = Tuple[str, Dict[str, Any], Dict[str, float]]
+
+# Set once the rebuild job has seeded the buckets; cached per process
+_rollups_ready = False
+
+
+def _day(value: Any) -> str:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return UNDATED_DAY
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return UNDATED_DAY
+
+
+def _label(value: Any) -> str:
+    """Escaped field name for a dimension value (no '.', no leading '$')"""
+    if isinstance(value, Enum):
+        value = value.value
+    if value is None or value == "":
+        value = "unknown"
+    return str(value).replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def _range_label(value: Any) -> Optional[str]:
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    if amount < 0:
+        return None
+    return str(max(bound for bound in RANGE_BOUNDARIES if bound <= amount))
+
+
+def bucket_key(doc: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Bucket id and identifying fields of the bucket a document counts in"""
+    agent_id = str(doc.get("agent_id") or "")
+    team_id = str(doc["team_id"]) if doc.get("team_id") else None
+    day = _day(doc.get("created_at"))
+    fields = {"agent_id": agent_id, "team_id": team_id, "day": day}
+    return f"{agent_id}|{team_id or ''}|{day}", fields
+
+
+def property_contribution(doc: Optional[Dict[str, Any]]) -> Optional[Contribution]:
+    """The (bucket id, bucket fields, increments) a property adds, or None"""
+    if not doc or not doc.get("agent_id"):
+        return None
+    key, fields = bucket_key(doc)
+    increments = {
+        "properties.count": 1,
+        f"properties.by_publishing_status.{_label(doc.get('publishing_status'))}": 1,
+        f"properties.by_type.{_label(doc.get('property_type'))}": 1,
+        f"properties.by_location.{_label(doc.get('location'))}": 1,
+    }
+    price_range = _range_label(doc.get("price"))
+    if price_range is not None:
+        increments[f"properties.by_price_range.{price_range}"] = 1
+        increments["properties.price_count"] = 1
+        increments["properties.sum_price"] = float(doc["price"])
+    if getattr(doc.get("status"), "value", doc.get("status")) == SOLD_STATUS:
+        increments["properties.sold_count"] = 1
+        days = days_on_market(doc)
+        if days is not None:
+            increments["properties.days_on_market_count"] = 1
+            increments["properties.days_on_market_sum"] = days
+    return key, fields, increments
+
+
+def lead_contribution(doc: Optional[Dict[str, Any]]) -> Optional[Contribution]:
+    """The (bucket id, bucket fields, increments) a lead adds, or None"""
+    if not doc or not doc.get("agent_id"):
+        return None
+    key, fields = bucket_key(doc)
+    status = _label(doc.get("status"))
+    source = _label(doc.get("source"))
+    increments = {
+        "leads.count": 1,
+        f"leads.by_status.{status}": 1,
+        f"leads.by_source.{source}": 1,
+        f"leads.by_urgency.{_label(doc.get('urgency'))}": 1,
+    }
+    budget_range = _range_label(doc.get("budget")) if doc.get("budget") is not None else None
+    if budget_range is not None:
+        increments[f"leads.by_budget_range.{budget_range}"] = 1
+    if isinstance(doc.get("score"), (int, float)):
+        increments["leads.score_count"] = 1
+        increments["leads.score_sum"] = doc["score"]
+    if status == "converted":
+        value = doc.get("conversion_value")
+        value = float(value) if isinstance(value, (int, float)) else 0.0
+        increments["leads.converted_value_count"] = 1
+        increments["leads.converted_value_sum"] = value
+        increments[f"leads.converted_by_source.{source}.count"] = 1
+        increments[f"leads.converted_by_source.{source}.value"] = value
+    return key, fields, increments
+
+
+def new_totals() -> Dict[str, Dict[str, float]]:
+    """Empty accumulator of net increments per bucket id"""
+    return defaultdict(lambda: defaultdict(int))
+
+
+def add_change(
+    totals: Dict[str, Dict[str, float]],
+    bucket_fields: Dict[str, Dict[str, Any]],
+    contribution_fn,
+    old_doc: Optional[Dict[str, Any]],
+    new_doc: Optional[Dict[str, Any]]
+) -> None:
+    """Accumulate the net effect of replacing old_doc with new_doc"""
+    for doc, sign in ((old_doc, -1), (new_doc, 1)):
+        contribution = contribution_fn(doc)
+        if contribution:
+            key, fields, increments = contribution
+            bucket_fields[key] = fields
+            for field, value in increments.items():
+                totals[key][field] += sign * value
+
+
+def _nonzero(totals: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        key: {field: value for field, value in increments.items() if value != 0}
+        for key, increments in totals.items()
+        if any(value != 0 for value in increments.values())
+    }
+
+
+async def _apply_changes(
+    db: AsyncIOMotorDatabase, contribution_fn, changes: Iterable[Change]
+) -> None:
+    totals = new_totals()
+    bucket_fields: Dict[str, Dict[str, Any]] = {}
+    for old_doc, new_doc in changes:
+        add_change(totals, bucket_fields, contribution_fn, old_doc, new_doc)
+    net = _nonzero(totals)
+    if not net:
+        return
+
+    operations = [
+        UpdateOne(
+            {"_id": key},
+            {
+                "$inc": increments,
+                "$set": {"updated_at": datetime.utcnow()},
+                "$setOnInsert": bucket_fields[key],
+            },
+            upsert=True
+        )
+        for key, increments in net.items()
+    ]
+    try:
+        await db[COLLECTION_NAME].bulk_write(operations, ordered=False)
+    except Exception as e:
+        # Rollups are derived data; the rebuild job repairs any drift
+        logger.error(f"Failed to update analytics rollups: {e}")
+
+
+async def apply_property_changes(db: AsyncIOMotorDatabase, changes: Iterable[Change]) -> None:
+    """Fold property writes into the daily rollups; each change is (old_doc, new_doc)"""
+    await _apply_changes(db, property_contribution, changes)
+
+
+async def apply_lead_changes(db: AsyncIOMotorDatabase, changes: Iterable[Change]) -> None:
+    """Fold lead writes into the daily rollups; each change is (old_doc, new_doc)"""
+    await _apply_changes(db, lead_contribution, changes)
+
+
+def _merge(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    for name, value in source.items():
+        if isinstance(value, dict):
+            _merge(target.setdefault(name, {}), value)
+        elif isinstance(value, (int, float)):
+            target[name] = target.get(name, 0) + value
+
+
+def decode_counts(counts: Dict[str, Any]) -> Dict[str, Any]:
+    """Dimension map with the escaped field names turned back into values"""
+    return {unquote(name): value for name, value in (counts or {}).items()}
+
+
+async def mark_rollups_ready(db: AsyncIOMotorDatabase) -> None:
+    """Record that the buckets have been seeded (called by the rebuild job)"""
+    global _rollups_ready
+    await db[STATE_COLLECTION].update_one(
+        {"_id": STATE_ID},
+        {"$set": {"built_at": datetime.utcnow()}},
+        upsert=True
+    )
+    _rollups_ready = True
+
+
+async def rollups_ready(db: AsyncIOMotorDatabase) -> bool:
+    """Whether the buckets have been seeded; until then readers use raw queries"""
+    global _rollups_ready
+    if not _rollups_ready:
+        state = await db[STATE_COLLECTION].find_one({"_id": STATE_ID}, {"_id": 1})
+        _rollups_ready = state is not None
+    return _rollups_ready
+
+
+async def get_rollup_totals(
+    db: AsyncIOMotorDatabase,
+    section: str,
+    agent_id: Optional[str] = None,
+    team_id: Optional[str] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Merge one section ("properties" or "leads") of the buckets matching an
+    agent and/or team, optionally limited to created_at days in a range.
+    """
+    query: Dict[str, Any] = {}
+    if agent_id is not None:
+        query["agent_id"] = str(agent_id)
+    if team_id is not None:
+        query["team_id"] = str(team_id)
+    if start_day or end_day:
+        query["day"] = {}
+        if start_day:
+            query["day"]["$gte"] = _day(start_day)
+        if end_day:
+            query["day"]["$lte"] = _day(end_day)
+
+    totals: Dict[str, Any] = {}
+    cursor = db[COLLECTION_NAME].find(query, {section: 1, "_id": 0})
+    async for bucket in cursor:
+        _merge(totals, bucket.get(section) or {})
+    return totals
@@ -5,13 +5,19 @@ Analytics Service
 Comprehensive analytics and reporting service
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Awaitable, Dict, List, Optional, Any, Tuple, TypeVar
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 import json
 
+from app.core.config import settings
+from app.services.analytics_rollups import decode_counts, get_rollup_totals, rollups_ready
+from app.services.engagement_events import get_engagement_totals, get_unique_visitors
+from app.services.engagement_series import DAY, get_engagement_series
+from app.services.property_archive import union_archive_stage
 from app.schemas.analytics import (
     AnalyticsFilter, DashboardMetrics, PropertyAnalytics, LeadAnalytics,
     AgentPerformance, TeamAnalytics, MarketAnalytics, RevenueAnalytics,
@@ -20,6 +26,123 @@ from app.schemas.analytics import (
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+# A shared $facet scan whose result several dashboard sections read
+FacetScan = Awaitable[Dict[str, Any]]
+
+
+def _counts(values: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Non-zero counts of a rollup dimension map"""
+    return {name: int(count) for name, count in decode_counts(values).items() if count}
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator else 0
+
+
+# $bucket spec shared by the price and budget range distributions
+RANGE_BUCKET = {
+    "boundaries": [0, 100000, 250000, 500000, 750000, 1000000, 2000000, float('inf')],
+    "default": "Other",
+    "output": {"count": {"$sum": 1}}
+}
+
+# Property dashboard distributions, run as branches of one $facet scan
+PROPERTY_FACETS = {
+    "by_status": [{"$group": {"_id": "$publishing_status", "count": {"$sum": 1}}}],
+    "price": [{"$group": {
+        "_id": None,
+        "avg_price": {"$avg": "$price"},
+        "total_value": {"$sum": "$price"}
+    }}],
+    "by_price_range": [{"$bucket": {"groupBy": "$price", **RANGE_BUCKET}}],
+    "by_type": [
+        {"$group": {"_id": "$property_type", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}}
+    ],
+    "by_location": [
+        {"$group": {"_id": "$location", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}}
+    ],
+    # Sold share and days on market (published_at, else created_at, to sold_at)
+    "market": [{"$group": {
+        "_id": None,
+        "count": {"$sum": 1},
+        "sold": {"$sum": {"$cond": [{"$eq": ["$status", "sold"]}, 1, 0]}},
+        "avg_days_on_market": {"$avg": {"$cond": [
+            {"$and": [
+                {"$eq": ["$status", "sold"]},
+                {"$gt": ["$sold_at", None]},
+                {"$gt": [{"$ifNull": ["$published_at", "$created_at"]}, None]}
+            ]},
+            {"$max": [0, {"$divide": [
+                {"$subtract": ["$sold_at", {"$ifNull": ["$published_at", "$created_at"]}]},
+                86400000
+            ]}]},
+            None
+        ]}}
+    }}],
+    "top": [
+        {"$sort": {"price": -1}},
+        {"$limit": 5},
+        {"$project": {
+            "title": 1,
+            "price": 1,
+            "location": 1,
+            "property_type": 1,
+            "publishing_status": 1
+        }}
+    ],
+}
+
+# Lead dashboard distributions, run as branches of one $facet scan
+LEAD_FACETS = {
+    "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+    "score": [{"$group": {"_id": None, "avg_score": {"$avg": "$score"}}}],
+    "by_source": [
+        {"$group": {"_id": "$source", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}}
+    ],
+    "by_urgency": [{"$group": {"_id": "$urgency", "count": {"$sum": 1}}}],
+    "by_budget": [
+        {"$match": {"budget": {"$exists": True, "$ne": None}}},
+        {"$bucket": {"groupBy": "$budget", **RANGE_BUCKET}}
+    ],
+    "deals": [
+        {"$match": {"status": "converted"}},
+        {"$group": {
+            "_id": None,
+            "avg_deal_value": {"$avg": "$conversion_value"},
+            "total_pipeline": {"$sum": "$conversion_value"}
+        }}
+    ],
+    "top_sources": [
+        {"$match": {"status": "converted"}},
+        {"$group": {
+            "_id": "$source",
+            "count": {"$sum": 1},
+            "total_value": {"$sum": "$conversion_value"}
+        }},
+        {"$sort": {"count": -1}},
+        {"$limit": 5}
+    ],
+}
+
+
+# Engagement metrics plotted on property trend charts
+ENGAGEMENT_CHART_METRICS = ("views", "inquiries", "shares", "favorites")
+
+
+def _facet_counts(items: Optional[List[Dict[str, Any]]]) -> Dict[str, int]:
+    """{_id: count} of a grouped facet branch"""
+    return {item["_id"]: item["count"] for item in items or []}
+
+
+def _first(items: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """The single document of a totals facet branch, or {} when it matched nothing"""
+    return items[0] if items else {}
+
+
 class AnalyticsService:
     """Comprehensive analytics service"""
     
@@ -30,10 +153,43 @@ class AnalyticsService:
         self.users_collection = db.users
         self.teams_collection = db.teams
         self.audit_logs_collection = db.audit_logs
+        # Bounds the queries one service instance (one request) runs at once
+        self._query_slots = asyncio.Semaphore(settings.analytics_max_concurrent_queries)
+    
+    async def _bounded(self, awaitable: Awaitable[T]) -> T:
+        """Await a query once a concurrency slot is free"""
+        async with self._query_slots:
+            return await awaitable
+    
+    async def _run_section(self, name: str, awaitable: Awaitable[T],
+                           failed_sections: List[str]) -> Optional[T]:
+        """
+        Await one dashboard section under the section timeout. A section that
+        times out or fails is logged and reported in failed_sections instead of
+        failing the whole dashboard.
+        """
+        try:
+            return await asyncio.wait_for(
+                awaitable, timeout=settings.analytics_section_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Dashboard section {name} timed out")
+        except Exception as e:
+            logger.error(f"Dashboard section {name} failed: {e}")
+        failed_sections.append(name)
+        return None
     
     async def get_dashboard_metrics(self, agent_id: str, team_id: Optional[str], 
                                   filters: AnalyticsFilter) -> DashboardMetrics:
-        """Get comprehensive dashboard metrics"""
+        """
+        Get comprehensive dashboard metrics.
+        
+        Sections, and the queries inside them, run concurrently; sections that
+        time out or fail are left empty and named in failed_sections. Without
+        rollups, properties and leads are each scanned once by a $facet
+        pipeline whose result the sections share.
+        """
+        scans: List[asyncio.Future] = []
         try:
             # Get date range
             start_date, end_date = self._get_date_range(filters.period, filters.start_date, filters.end_date)
@@ -43,107 +199,203 @@ class AnalyticsService:
             if team_id:
                 base_query["team_id"] = team_id
             
-            # Get property analytics
-            property_analytics = await self._get_property_analytics(base_query, start_date, end_date, filters)
-            
-            # Get lead analytics
-            lead_analytics = await self._get_lead_analytics(base_query, start_date, end_date, filters)
-            
-            # Get team analytics if team_id provided
-            team_analytics = None
+            property_scan = lead_scan = None
+            if not await self._use_rollups(filters):
+                property_scan = asyncio.ensure_future(
+                    self._bounded(self._scan_properties(base_query, filters))
+                )
+                lead_scan = asyncio.ensure_future(
+                    self._bounded(self._scan_leads(base_query, filters))
+                )
+                scans = [property_scan, lead_scan]
+            
+            failed_sections: List[str] = []
+            sections = {
+                "property_analytics": self._get_property_analytics(
+                    base_query, start_date, end_date, filters, property_scan
+                ),
+                "lead_analytics": self._get_lead_analytics(
+                    base_query, start_date, end_date, filters, lead_scan
+                ),
+                "overview_metrics": self._get_overview_metrics(
+                    base_query, start_date, end_date, filters, property_scan, lead_scan
+                ),
+            }
+            # Team analytics only when a team_id is provided
             if team_id:
-                team_analytics = await self._get_team_analytics(team_id, start_date, end_date, filters)
+                sections["team_analytics"] = self._get_team_analytics(
+                    team_id, start_date, end_date, filters
+                )
             
-            # Get overview metrics
-            overview_metrics = await self._get_overview_metrics(base_query, start_date, end_date, filters)
+            results = await asyncio.gather(*(
+                self._run_section(name, section, failed_sections)
+                for name, section in sections.items()
+            ))
+            results = dict(zip(sections, results))
             
             return DashboardMetrics(
-                overview_metrics=overview_metrics,
-                property_analytics=property_analytics,
-                lead_analytics=lead_analytics,
-                team_analytics=team_analytics,
+                overview_metrics=results["overview_metrics"] or [],
+                property_analytics=results["property_analytics"],
+                lead_analytics=results["lead_analytics"],
+                team_analytics=results.get("team_analytics"),
                 generated_at=datetime.utcnow(),
                 period=filters.period,
-                date_range={"start": start_date, "end": end_date}
+                date_range={"start": start_date, "end": end_date},
+                failed_sections=failed_sections
             )
             
         except Exception as e:
             logger.error(f"Error getting dashboard metrics: {e}")
             raise
+        finally:
+            # Scans are shielded from section timeouts; stop any still running
+            for scan in scans:
+                scan.cancel()
+    
+    async def get_property_analytics(self, property_id: str, days: int = 30) -> Dict[str, Any]:
+        """
+        Engagement of one listing over the last days, from the engagement
+        counters: views, inquiries, shares, favorites and estimated unique
+        visitors, plus the trend chart of the same window. Events still in the
+        ingestion buffer are not included until the next flush.
+        """
+        end = datetime.utcnow()
+        metrics, unique_visitors, trend = await asyncio.gather(
+            self._bounded(get_engagement_totals(self.db, "property", property_id, days=days)),
+            self._bounded(get_unique_visitors(self.db, "property", property_id, days=days)),
+            self.get_property_engagement_chart(property_id, end - timedelta(days=days), end)
+        )
+        metrics["unique_visitors"] = unique_visitors
+        return {
+            "property_id": property_id,
+            "days": days,
+            "metrics": metrics,
+            "engagement_rate": round(_ratio(
+                metrics["inquiries"] + metrics["shares"] + metrics["favorites"],
+                metrics["views"]
+            ) * 100, 2),
+            "trend": trend
+        }
+    
+    async def get_property_engagement_chart(
+        self,
+        property_id: str,
+        start: datetime,
+        end: datetime,
+        resolution: Optional[str] = None
+    ) -> ChartData:
+        """
+        Line chart of a listing's views, inquiries, shares and favorites
+        between start and end, at the finest retained resolution for the span
+        unless one is given ("minute", "hour" or "day").
+        """
+        series = await self._bounded(get_engagement_series(
+            self.db, "property", property_id, start, end, ENGAGEMENT_CHART_METRICS, resolution
+        ))
+        label_format = "%Y-%m-%d" if series["resolution"] == DAY else "%Y-%m-%d %H:%M"
+        return ChartData(
+            labels=[point["start"].strftime(label_format) for point in series["points"]],
+            datasets=[
+                {
+                    "label": metric.capitalize(),
+                    "data": [point[metric] for point in series["points"]],
+                }
+                for metric in ENGAGEMENT_CHART_METRICS
+            ],
+            type="line",
+            title="Property engagement",
+            description=f"Per {series['resolution']}"
+        )
+    
+    async def _await_scan(self, scan: Optional[FacetScan], fallback) -> Dict[str, Any]:
+        """Result of a shared scan (shielded, other sections may await it too), or of fallback()"""
+        if scan is not None:
+            return await asyncio.shield(scan)
+        return await self._bounded(fallback())
+    
+    async def _scan_properties(self, base_query: Dict,
+                               filters: AnalyticsFilter) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Every property figure of a dashboard in one $facet pass: the overview
+        count over base_query, the rest over the type/location-filtered set.
+        """
+        narrowed = {}
+        if filters.property_types:
+            narrowed["property_type"] = {"$in": filters.property_types}
+        if filters.locations:
+            narrowed["location"] = {"$in": filters.locations}
+        narrow = [{"$match": narrowed}] if narrowed else []
+        
+        pipeline = [
+            *self._property_source(base_query, filters.include_archived),
+            {"$facet": {
+                "overview": [{"$count": "count"}],
+                **{name: narrow + stages for name, stages in PROPERTY_FACETS.items()},
+            }}
+        ]
+        results = await self.properties_collection.aggregate(pipeline).to_list(1)
+        return results[0] if results else {}
+    
+    async def _scan_leads(self, base_query: Dict,
+                          filters: AnalyticsFilter) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Every lead figure of a dashboard in one $facet pass: the overview
+        totals over base_query, the rest over the source-filtered set.
+        """
+        narrow = []
+        if filters.lead_sources:
+            narrow = [{"$match": {"source": {"$in": filters.lead_sources}}}]
+        
+        pipeline = [
+            {"$match": base_query},
+            {"$facet": {
+                "overview": [{"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "converted": {"$sum": {"$cond": [{"$eq": ["$status", "converted"]}, 1, 0]}},
+                    "avg_deal_value": {"$avg": {
+                        "$cond": [{"$eq": ["$status", "converted"]}, "$conversion_value", None]
+                    }},
+                }}],
+                **{name: narrow + stages for name, stages in LEAD_FACETS.items()},
+            }}
+        ]
+        results = await self.leads_collection.aggregate(pipeline).to_list(1)
+        return results[0] if results else {}
     
     async def _get_property_analytics(self, base_query: Dict, start_date: date, 
-                                    end_date: date, filters: AnalyticsFilter) -> PropertyAnalytics:
-        """Get property analytics"""
+                                    end_date: date, filters: AnalyticsFilter,
+                                    scan: Optional[FacetScan] = None) -> PropertyAnalytics:
+        """Get property analytics (from the rollups, or from a shared or own $facet scan)"""
         try:
-            # Build property query
-            property_query = {**base_query}
-            if filters.property_types:
-                property_query["property_type"] = {"$in": filters.property_types}
-            if filters.locations:
-                property_query["location"] = {"$in": filters.locations}
+            if scan is None and await self._use_rollups(filters):
+                return await self._property_analytics_from_rollups(base_query)
             
-            # Get total counts
-            total_properties = await self.properties_collection.count_documents(property_query)
-            published_properties = await self.properties_collection.count_documents({
-                **property_query,
-                "publishing_status": "published"
-            })
-            draft_properties = await self.properties_collection.count_documents({
-                **property_query,
-                "publishing_status": "draft"
-            })
-            archived_properties = await self.properties_collection.count_documents({
-                **property_query,
-                "publishing_status": "archived"
-            })
-            
-            # Get price analytics
-            price_pipeline = [
-                {"$match": property_query},
-                {"$group": {
-                    "_id": None,
-                    "avg_price": {"$avg": "$price"},
-                    "total_value": {"$sum": "$price"},
-                    "min_price": {"$min": "$price"},
-                    "max_price": {"$max": "$price"}
-                }}
-            ]
-            
-            price_stats = await self.properties_collection.aggregate(price_pipeline).to_list(1)
-            avg_price = price_stats[0]["avg_price"] if price_stats else 0
-            total_value = price_stats[0]["total_value"] if price_stats else 0
-            
-            # Get distributions
-            type_distribution = await self._get_property_type_distribution(property_query)
-            location_distribution = await self._get_location_distribution(property_query)
-            status_distribution = await self._get_property_status_distribution(property_query)
-            price_range_distribution = await self._get_price_range_distribution(property_query)
-            
-            # Get performance metrics
-            avg_days_on_market = await self._get_average_days_on_market(property_query)
-            conversion_rate = await self._get_property_conversion_rate(property_query)
-            
-            # Get top performing properties
-            top_properties = await self._get_top_performing_properties(property_query)
+            facets = await self._await_scan(
+                scan, lambda: self._scan_properties(base_query, filters)
+            )
             
-            # Get recent activity
-            recent_activity = await self._get_property_recent_activity(property_query)
+            status_distribution = _facet_counts(facets.get("by_status"))
+            price_stats = _first(facets.get("price"))
+            market_stats = _first(facets.get("market"))
             
             return PropertyAnalytics(
-                total_properties=total_properties,
-                published_properties=published_properties,
-                draft_properties=draft_properties,
-                archived_properties=archived_properties,
-                average_price=round(avg_price, 2),
-                total_value=round(total_value, 2),
-                price_range_distribution=price_range_distribution,
-                property_type_distribution=type_distribution,
-                location_distribution=location_distribution,
+                total_properties=sum(status_distribution.values()),
+                published_properties=status_distribution.get("published", 0),
+                draft_properties=status_distribution.get("draft", 0),
+                archived_properties=status_distribution.get("archived", 0),
+                average_price=round(price_stats.get("avg_price") or 0, 2),
+                total_value=round(price_stats.get("total_value") or 0, 2),
+                price_range_distribution=_facet_counts(facets.get("by_price_range")),
+                property_type_distribution=_facet_counts(facets.get("by_type")),
+                location_distribution=_facet_counts(facets.get("by_location")),
                 status_distribution=status_distribution,
-                average_days_on_market=avg_days_on_market,
-                conversion_rate=conversion_rate,
-                top_performing_properties=top_properties,
-                recent_activity=recent_activity
+                average_days_on_market=round(market_stats.get("avg_days_on_market") or 0, 2),
+                conversion_rate=round(
+                    _ratio(market_stats.get("sold", 0), market_stats.get("count", 0)) * 100, 2
+                ),
+                top_performing_properties=facets.get("top", []),
+                recent_activity=await self._get_property_recent_activity(base_query)
             )
             
         except Exception as e:
@@ -151,70 +403,20 @@ class AnalyticsService:
             raise
     
     async def _get_lead_analytics(self, base_query: Dict, start_date: date, 
-                                end_date: date, filters: AnalyticsFilter) -> LeadAnalytics:
-        """Get lead analytics"""
+                                end_date: date, filters: AnalyticsFilter,
+                                scan: Optional[FacetScan] = None) -> LeadAnalytics:
+        """Get lead analytics (from the rollups, or from a shared or own $facet scan)"""
         try:
-            # Build lead query
-            lead_query = {**base_query}
-            if filters.lead_sources:
-                lead_query["source"] = {"$in": filters.lead_sources}
-            
-            # Get counts by status
-            status_pipeline = [
-                {"$match": lead_query},
-                {"$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1}
-                }}
-            ]
+            if scan is None and await self._use_rollups(filters):
+                return await self._lead_analytics_from_rollups(base_query)
             
-            status_counts = await self.leads_collection.aggregate(status_pipeline).to_list(None)
-            status_dict = {item["_id"]: item["count"] for item in status_counts}
+            facets = await self._await_scan(scan, lambda: self._scan_leads(base_query, filters))
             
+            status_dict = _facet_counts(facets.get("by_status"))
             total_leads = sum(status_dict.values())
             converted_leads = status_dict.get("converted", 0)
             conversion_rate = (converted_leads / total_leads * 100) if total_leads > 0 else 0
-            
-            # Get average lead score
-            score_pipeline = [
-                {"$match": lead_query},
-                {"$group": {
-                    "_id": None,
-                    "avg_score": {"$avg": "$score"}
-                }}
-            ]
-            
-            score_stats = await self.leads_collection.aggregate(score_pipeline).to_list(1)
-            avg_score = score_stats[0]["avg_score"] if score_stats else 0
-            
-            # Get distributions
-            source_distribution = await self._get_lead_source_distribution(lead_query)
-            urgency_distribution = await self._get_lead_urgency_distribution(lead_query)
-            budget_distribution = await self._get_lead_budget_distribution(lead_query)
-            
-            # Get deal analytics
-            deal_pipeline = [
-                {"$match": {**lead_query, "status": "converted"}},
-                {"$group": {
-                    "_id": None,
-                    "avg_deal_value": {"$avg": "$conversion_value"},
-                    "total_pipeline": {"$sum": "$conversion_value"}
-                }}
-            ]
-            
-            deal_stats = await self.leads_collection.aggregate(deal_pipeline).to_list(1)
-            avg_deal_value = deal_stats[0]["avg_deal_value"] if deal_stats else 0
-            total_pipeline = deal_stats[0]["total_pipeline"] if deal_stats else 0
-            
-            # Get performance metrics
-            response_time = await self._get_lead_response_time(lead_query)
-            follow_up_rate = await self._get_follow_up_completion_rate(lead_query)
-            
-            # Get top performing sources
-            top_sources = await self._get_top_performing_sources(lead_query)
-            
-            # Get recent activities
-            recent_activities = await self._get_lead_recent_activities(lead_query)
+            deal_stats = _first(facets.get("deals"))
             
             return LeadAnalytics(
                 total_leads=total_leads,
@@ -224,16 +426,16 @@ class AnalyticsService:
                 converted_leads=converted_leads,
                 lost_leads=status_dict.get("lost", 0),
                 conversion_rate=round(conversion_rate, 2),
-                average_lead_score=round(avg_score, 2),
-                lead_source_distribution=source_distribution,
-                urgency_distribution=urgency_distribution,
-                budget_distribution=budget_distribution,
-                average_deal_value=round(avg_deal_value, 2),
-                total_pipeline_value=round(total_pipeline, 2),
-                lead_response_time=response_time,
-                follow_up_completion_rate=follow_up_rate,
-                top_performing_sources=top_sources,
-                recent_activities=recent_activities
+                average_lead_score=round(_first(facets.get("score")).get("avg_score") or 0, 2),
+                lead_source_distribution=_facet_counts(facets.get("by_source")),
+                urgency_distribution=_facet_counts(facets.get("by_urgency")),
+                budget_distribution=_facet_counts(facets.get("by_budget")),
+                average_deal_value=round(deal_stats.get("avg_deal_value") or 0, 2),
+                total_pipeline_value=round(deal_stats.get("total_pipeline") or 0, 2),
+                lead_response_time=await self._get_lead_response_time(base_query),
+                follow_up_completion_rate=await self._get_follow_up_completion_rate(base_query),
+                top_performing_sources=facets.get("top_sources", []),
+                recent_activities=await self._get_lead_recent_activities(base_query)
             )
             
         except Exception as e:
@@ -244,47 +446,58 @@ class AnalyticsService:
                                 end_date: date, filters: AnalyticsFilter) -> TeamAnalytics:
         """Get team analytics"""
         try:
-            # Get team info
-            team = await self.teams_collection.find_one({"_id": ObjectId(team_id)})
+            # Get team info and member counts
+            team, total_members, active_members = await asyncio.gather(
+                self._bounded(self.teams_collection.find_one({"_id": ObjectId(team_id)})),
+                self._bounded(self.db.team_members.count_documents({"team_id": team_id})),
+                self._bounded(self.db.team_members.count_documents({
+                    "team_id": team_id,
+                    "is_active": True
+                }))
+            )
             if not team:
                 raise ValueError("Team not found")
             
-            # Get member counts
-            total_members = await self.db.team_members.count_documents({"team_id": team_id})
-            active_members = await self.db.team_members.count_documents({
-                "team_id": team_id,
-                "is_active": True
-            })
-            
             # Get team performance
             team_query = {"team_id": team_id}
-            total_leads = await self.leads_collection.count_documents(team_query)
-            total_properties = await self.properties_collection.count_documents(team_query)
+            if await self._use_rollups(filters):
+                lead_totals, property_totals = await asyncio.gather(
+                    self._bounded(get_rollup_totals(self.db, "leads", team_id=team_id)),
+                    self._bounded(get_rollup_totals(self.db, "properties", team_id=team_id))
+                )
+                total_leads = int(lead_totals.get("count", 0))
+                total_properties = int(property_totals.get("count", 0))
+                converted_leads = _counts(lead_totals.get("by_status")).get("converted", 0)
+                total_sales = lead_totals.get("converted_value_sum", 0)
+            else:
+                lead_pipeline = [
+                    {"$match": team_query},
+                    {"$group": {
+                        "_id": None,
+                        "count": {"$sum": 1},
+                        "converted": {"$sum": {"$cond": [{"$eq": ["$status", "converted"]}, 1, 0]}},
+                        "total_sales": {"$sum": {"$cond": [
+                            {"$eq": ["$status", "converted"]}, "$conversion_value", 0
+                        ]}}
+                    }}
+                ]
+                
+                total_properties, lead_stats = await asyncio.gather(
+                    self._bounded(self._count_properties(team_query, filters.include_archived)),
+                    self._bounded(self.leads_collection.aggregate(lead_pipeline).to_list(1))
+                )
+                lead_overview = _first(lead_stats)
+                total_leads = lead_overview.get("count", 0)
+                converted_leads = lead_overview.get("converted", 0)
+                total_sales = lead_overview.get("total_sales", 0)
             
-            # Get conversion rate
-            converted_leads = await self.leads_collection.count_documents({
-                **team_query,
-                "status": "converted"
-            })
             conversion_rate = (converted_leads / total_leads * 100) if total_leads > 0 else 0
             
-            # Get total sales
-            sales_pipeline = [
-                {"$match": {**team_query, "status": "converted"}},
-                {"$group": {
-                    "_id": None,
-                    "total_sales": {"$sum": "$conversion_value"}
-                }}
-            ]
-            
-            sales_stats = await self.leads_collection.aggregate(sales_pipeline).to_list(1)
-            total_sales = sales_stats[0]["total_sales"] if sales_stats else 0
-            
-            # Get agent performance
-            agent_performance = await self._get_agent_performance(team_id, start_date, end_date)
-            
-            # Get recent activity
-            recent_activity = await self._get_team_recent_activity(team_id)
+            # Get agent performance and recent activity
+            agent_performance, recent_activity = await asyncio.gather(
+                self._bounded(self._get_agent_performance(team_id, start_date, end_date)),
+                self._bounded(self._get_team_recent_activity(team_id))
+            )
             
             return TeamAnalytics(
                 team_id=team_id,
@@ -305,13 +518,40 @@ class AnalyticsService:
             raise
     
     async def _get_overview_metrics(self, base_query: Dict, start_date: date, 
-                                  end_date: date, filters: AnalyticsFilter) -> List[AnalyticsMetric]:
-        """Get overview metrics"""
+                                  end_date: date, filters: AnalyticsFilter,
+                                  property_scan: Optional[FacetScan] = None,
+                                  lead_scan: Optional[FacetScan] = None) -> List[AnalyticsMetric]:
+        """Get overview metrics (from the rollups, or from the overview facets of the scans)"""
         try:
             metrics = []
             
+            if property_scan is None and lead_scan is None and await self._use_rollups(filters):
+                scope = self._rollup_scope(base_query)
+                property_totals, lead_totals = await asyncio.gather(
+                    self._bounded(get_rollup_totals(self.db, "properties", **scope)),
+                    self._bounded(get_rollup_totals(self.db, "leads", **scope))
+                )
+                total_properties = int(property_totals.get("count", 0))
+                total_leads = int(lead_totals.get("count", 0))
+                converted_leads = _counts(lead_totals.get("by_status")).get("converted", 0)
+                avg_deal_value = _ratio(
+                    lead_totals.get("converted_value_sum", 0),
+                    lead_totals.get("converted_value_count", 0)
+                )
+            else:
+                property_facets, lead_facets = await asyncio.gather(
+                    self._await_scan(
+                        property_scan, lambda: self._scan_properties(base_query, filters)
+                    ),
+                    self._await_scan(lead_scan, lambda: self._scan_leads(base_query, filters))
+                )
+                lead_overview = _first(lead_facets.get("overview"))
+                total_properties = _first(property_facets.get("overview")).get("count", 0)
+                total_leads = lead_overview.get("count", 0)
+                converted_leads = lead_overview.get("converted", 0)
+                avg_deal_value = lead_overview.get("avg_deal_value") or 0
+            
             # Total properties
-            total_properties = await self.properties_collection.count_documents(base_query)
             metrics.append(AnalyticsMetric(
                 name="Total Properties",
                 value=total_properties,
@@ -320,7 +560,6 @@ class AnalyticsService:
             ))
             
             # Total leads
-            total_leads = await self.leads_collection.count_documents(base_query)
             metrics.append(AnalyticsMetric(
                 name="Total Leads",
                 value=total_leads,
@@ -329,10 +568,6 @@ class AnalyticsService:
             ))
             
             # Conversion rate
-            converted_leads = await self.leads_collection.count_documents({
-                **base_query,
-                "status": "converted"
-            })
             conversion_rate = (converted_leads / total_leads * 100) if total_leads > 0 else 0
             metrics.append(AnalyticsMetric(
                 name="Conversion Rate",
@@ -343,17 +578,6 @@ class AnalyticsService:
             ))
             
             # Average deal value
-            deal_pipeline = [
-                {"$match": {**base_query, "status": "converted"}},
-                {"$group": {
-                    "_id": None,
-                    "avg_value": {"$avg": "$conversion_value"}
-                }}
-            ]
-            
-            deal_stats = await self.leads_collection.aggregate(deal_pipeline).to_list(1)
-            avg_deal_value = deal_stats[0]["avg_value"] if deal_stats else 0
-            
             metrics.append(AnalyticsMetric(
                 name="Average Deal Value",
                 value=round(avg_deal_value, 2),
@@ -368,6 +592,125 @@ class AnalyticsService:
             logger.error(f"Error getting overview metrics: {e}")
             return []
     
+    async def _use_rollups(self, filters: AnalyticsFilter) -> bool:
+        """
+        Whether a section can be served from the daily rollups. Rollups hold
+        per-agent/per-team totals of the live collections, so dimension filters
+        and archive-inclusive requests fall back to the raw pipelines, as do all
+        requests until the rollups have been seeded by the rebuild job.
+        """
+        if not settings.analytics_rollups_enabled or filters.include_archived:
+            return False
+        if filters.property_types or filters.locations or filters.lead_sources:
+            return False
+        return await rollups_ready(self.db)
+    
+    def _rollup_scope(self, base_query: Dict) -> Dict[str, Optional[str]]:
+        return {"agent_id": base_query.get("agent_id"), "team_id": base_query.get("team_id")}
+    
+    async def _property_analytics_from_rollups(self, base_query: Dict) -> PropertyAnalytics:
+        """Property analytics from the merged daily rollups of an agent"""
+        # A five-document indexed read for top properties; not worth a rollup
+        scope = self._rollup_scope(base_query)
+        totals, top_properties, recent_activity = await asyncio.gather(
+            self._bounded(get_rollup_totals(self.db, "properties", **scope)),
+            self._bounded(self._get_top_performing_properties(base_query)),
+            self._bounded(self._get_property_recent_activity(base_query))
+        )
+        by_status = _counts(totals.get("by_publishing_status"))
+        sum_price = totals.get("sum_price", 0)
+        
+        return PropertyAnalytics(
+            total_properties=int(totals.get("count", 0)),
+            published_properties=by_status.get("published", 0),
+            draft_properties=by_status.get("draft", 0),
+            archived_properties=by_status.get("archived", 0),
+            average_price=round(_ratio(sum_price, totals.get("price_count", 0)), 2),
+            total_value=round(sum_price, 2),
+            price_range_distribution=_counts(totals.get("by_price_range")),
+            property_type_distribution=_counts(totals.get("by_type")),
+            location_distribution=_counts(totals.get("by_location")),
+            status_distribution=by_status,
+            average_days_on_market=round(_ratio(
+                totals.get("days_on_market_sum", 0),
+                totals.get("days_on_market_count", 0)
+            ), 2),
+            conversion_rate=round(
+                _ratio(totals.get("sold_count", 0), totals.get("count", 0)) * 100, 2
+            ),
+            top_performing_properties=top_properties,
+            recent_activity=recent_activity
+        )
+    
+    async def _lead_analytics_from_rollups(self, base_query: Dict) -> LeadAnalytics:
+        """Lead analytics from the merged daily rollups of an agent"""
+        totals, response_time, follow_up_rate, recent_activities = await asyncio.gather(
+            self._bounded(get_rollup_totals(self.db, "leads", **self._rollup_scope(base_query))),
+            self._bounded(self._get_lead_response_time(base_query)),
+            self._bounded(self._get_follow_up_completion_rate(base_query)),
+            self._bounded(self._get_lead_recent_activities(base_query))
+        )
+        by_status = _counts(totals.get("by_status"))
+        total_leads = int(totals.get("count", 0))
+        converted_leads = by_status.get("converted", 0)
+        
+        converted_by_source = {
+            source: values
+            for source, values in decode_counts(totals.get("converted_by_source")).items()
+            if values.get("count")
+        }
+        top_sources = sorted(
+            (
+                {
+                    "_id": source,
+                    "count": int(values["count"]),
+                    "total_value": values.get("value", 0),
+                }
+                for source, values in converted_by_source.items()
+            ),
+            key=lambda item: item["count"],
+            reverse=True
+        )[:5]
+        
+        return LeadAnalytics(
+            total_leads=total_leads,
+            new_leads=by_status.get("new", 0),
+            contacted_leads=by_status.get("contacted", 0),
+            qualified_leads=by_status.get("qualified", 0),
+            converted_leads=converted_leads,
+            lost_leads=by_status.get("lost", 0),
+            conversion_rate=round(_ratio(converted_leads, total_leads) * 100, 2),
+            average_lead_score=round(
+                _ratio(totals.get("score_sum", 0), totals.get("score_count", 0)), 2
+            ),
+            lead_source_distribution=_counts(totals.get("by_source")),
+            urgency_distribution=_counts(totals.get("by_urgency")),
+            budget_distribution=_counts(totals.get("by_budget_range")),
+            average_deal_value=round(_ratio(
+                totals.get("converted_value_sum", 0), totals.get("converted_value_count", 0)
+            ), 2),
+            total_pipeline_value=round(totals.get("converted_value_sum", 0), 2),
+            lead_response_time=response_time,
+            follow_up_completion_rate=follow_up_rate,
+            top_performing_sources=top_sources,
+            recent_activities=recent_activities
+        )
+    
+    def _property_source(self, query: Dict, include_archived: bool = False) -> List[Dict[str, Any]]:
+        """Leading pipeline stages: matching properties, plus archived ones when requested"""
+        stages = [{"$match": query}]
+        if include_archived:
+            stages.append(union_archive_stage(query))
+        return stages
+    
+    async def _count_properties(self, query: Dict, include_archived: bool = False) -> int:
+        """Count matching properties, optionally including the archive tier"""
+        if not include_archived:
+            return await self.properties_collection.count_documents(query)
+        pipeline = [*self._property_source(query, include_archived), {"$count": "count"}]
+        result = await self.properties_collection.aggregate(pipeline).to_list(1)
+        return result[0]["count"] if result else 0
+    
     def _get_date_range(self, period: AnalyticsPeriod, start_date: Optional[date], 
                        end_date: Optional[date]) -> Tuple[date, date]:
         """Get date range based on period"""
@@ -402,91 +745,11 @@ class AnalyticsService:
             start = today.replace(day=1)
             return start, today
     
-    async def _get_property_type_distribution(self, query: Dict) -> Dict[str, int]:
-        """Get property type distribution"""
-        pipeline = [
-            {"$match": query},
-            {"$group": {
-                "_id": "$property_type",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
-        
-        results = await self.properties_collection.aggregate(pipeline).to_list(None)
-        return {item["_id"]: item["count"] for item in results}
-    
-    async def _get_location_distribution(self, query: Dict) -> Dict[str, int]:
-        """Get location distribution"""
-        pipeline = [
-            {"$match": query},
-            {"$group": {
-                "_id": "$location",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
-        
-        results = await self.properties_collection.aggregate(pipeline).to_list(None)
-        return {item["_id"]: item["count"] for item in results}
-    
-    async def _get_property_status_distribution(self, query: Dict) -> Dict[str, int]:
-        """Get property status distribution"""
-        pipeline = [
-            {"$match": query},
-            {"$group": {
-                "_id": "$publishing_status",
-                "count": {"$sum": 1}
-            }}
-        ]
-        
-        results = await self.properties_collection.aggregate(pipeline).to_list(None)
-        return {item["_id"]: item["count"] for item in results}
-    
-    async def _get_price_range_distribution(self, query: Dict) -> Dict[str, int]:
-        """Get price range distribution"""
-        pipeline = [
-            {"$match": query},
-            {"$bucket": {
-                "groupBy": "$price",
-                "boundaries": [0, 100000, 250000, 500000, 750000, 1000000, 2000000, float('inf')],
-                "default": "Other",
-                "output": {
-                    "count": {"$sum": 1}
-                }
-            }}
-        ]
-        
-        results = await self.properties_collection.aggregate(pipeline).to_list(None)
-        return {item["_id"]: item["count"] for item in results}
-    
-    async def _get_average_days_on_market(self, query: Dict) -> float:
-        """Get average days on market"""
-        # This would need to be calculated based on when properties were published vs sold
-        # For now, return a placeholder
-        return 30.0
-    
-    async def _get_property_conversion_rate(self, query: Dict) -> float:
-        """Get property conversion rate"""
-        # This would need to be calculated based on properties that led to sales
-        # For now, return a placeholder
-        return 15.0
-    
-    async def _get_top_performing_properties(self, query: Dict) -> List[Dict[str, Any]]:
+    async def _get_top_performing_properties(
+        self, query: Dict, include_archived: bool = False
+    ) -> List[Dict[str, Any]]:
         """Get top performing properties"""
-        pipeline = [
-            {"$match": query},
-            {"$sort": {"price": -1}},
-            {"$limit": 5},
-            {"$project": {
-                "title": 1,
-                "price": 1,
-                "location": 1,
-                "property_type": 1,
-                "publishing_status": 1
-            }}
-        ]
-        
+        pipeline = [*self._property_source(query, include_archived), *PROPERTY_FACETS["top"]]
         return await self.properties_collection.aggregate(pipeline).to_list(5)
     
     async def _get_property_recent_activity(self, query: Dict) -> List[Dict[str, Any]]:
@@ -494,50 +757,6 @@ class AnalyticsService:
         # This would need to be implemented based on your activity tracking
         return []
     
-    async def _get_lead_source_distribution(self, query: Dict) -> Dict[str, int]:
-        """Get lead source distribution"""
-        pipeline = [
-            {"$match": query},
-            {"$group": {
-                "_id": "$source",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
-        
-        results = await self.leads_collection.aggregate(pipeline).to_list(None)
-        return {item["_id"]: item["count"] for item in results}
-    
-    async def _get_lead_urgency_distribution(self, query: Dict) -> Dict[str, int]:
-        """Get lead urgency distribution"""
-        pipeline = [
-            {"$match": query},
-            {"$group": {
-                "_id": "$urgency",
-                "count": {"$sum": 1}
-            }}
-        ]
-        
-        results = await self.leads_collection.aggregate(pipeline).to_list(None)
-        return {item["_id"]: item["count"] for item in results}
-    
-    async def _get_lead_budget_distribution(self, query: Dict) -> Dict[str, int]:
-        """Get lead budget distribution"""
-        pipeline = [
-            {"$match": {**query, "budget": {"$exists": True, "$ne": None}}},
-            {"$bucket": {
-                "groupBy": "$budget",
-                "boundaries": [0, 100000, 250000, 500000, 750000, 1000000, 2000000, float('inf')],
-                "default": "Other",
-                "output": {
-                    "count": {"$sum": 1}
-                }
-            }}
-        ]
-        
-        results = await self.leads_collection.aggregate(pipeline).to_list(None)
-        return {item["_id"]: item["count"] for item in results}
-    
     async def _get_lead_response_time(self, query: Dict) -> float:
         """Get average lead response time"""
         # This would need to be calculated based on when leads were created vs first contact
@@ -548,21 +767,6 @@ class AnalyticsService:
         # This would need to be calculated based on scheduled vs completed follow-ups
         return 85.0  # percentage
     
-    async def _get_top_performing_sources(self, query: Dict) -> List[Dict[str, Any]]:
-        """Get top performing lead sources"""
-        pipeline = [
-            {"$match": {**query, "status": "converted"}},
-            {"$group": {
-                "_id": "$source",
-                "count": {"$sum": 1},
-                "total_value": {"$sum": "$conversion_value"}
-            }},
-            {"$sort": {"count": -1}},
-            {"$limit": 5}
-        ]
-        
-        return await self.leads_collection.aggregate(pipeline).to_list(5)
-    
     async def _get_lead_recent_activities(self, query: Dict) -> List[Dict[str, Any]]:
         """Get recent lead activities"""
         # This would need to be implemented based on your activity tracking
@@ -0,0 +1,61 @@
+"""
+Dashboard Cache
+===============
+Process-wide stale-while-revalidate cache of dashboard results.
+
+Dashboard figures barely move minute to minute while agents reload the page
+many times an hour. Entries are served from memory, refreshed in the
+background once older than dashboard_cache_fresh_seconds, and recomputed
+inline only past dashboard_cache_max_stale_seconds. Concurrent requests for
+the same key share one computation.
+"""
+
+import json
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.analytics import AnalyticsFilter, DashboardMetrics
+from app.utils.cache import StaleWhileRevalidateCache
+
+dashboard_cache = StaleWhileRevalidateCache(
+    max_entries=settings.dashboard_cache_max_entries,
+    fresh_seconds=settings.dashboard_cache_fresh_seconds,
+    max_stale_seconds=settings.dashboard_cache_max_stale_seconds
+)
+
+
+def normalize_filter(filters: AnalyticsFilter) -> str:
+    """
+    Canonical form of a filter: defaults dropped and list values sorted, so
+    equivalent filters share one cache entry.
+    """
+    values = filters.model_dump(mode="json", exclude_defaults=True)
+    normalized = {
+        name: sorted(set(value)) if isinstance(value, list) else value
+        for name, value in values.items()
+    }
+    return json.dumps(normalized, sort_keys=True)
+
+
+def metrics_key(agent_id: str, team_id: Optional[str], filters: AnalyticsFilter) -> Tuple[str, ...]:
+    """Cache key of one agent's dashboard metrics"""
+    return ("metrics", str(agent_id), str(team_id or ""), normalize_filter(filters))
+
+
+async def get_cached_dashboard_metrics(
+    agent_id: str,
+    team_id: Optional[str],
+    filters: AnalyticsFilter,
+    compute: Callable[[], Awaitable[DashboardMetrics]]
+) -> DashboardMetrics:
+    """Dashboard metrics from the cache; partial results (failed sections) are not stored"""
+    return await dashboard_cache.get_or_compute(
+        metrics_key(agent_id, team_id, filters),
+        compute,
+        cacheable=lambda metrics: not metrics.failed_sections
+    )
+
+
+async def get_cached_dashboard_stats(compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Platform-wide dashboard stats from the cache"""
+    return await dashboard_cache.get_or_compute(("stats",), compute)
@@ -0,0 +1,239 @@
+"""
+Engagement Events
+=================
+Buffered ingestion of public engagement events: profile and listing views,
+inquiries, shares, favorites and contact-button actions.
+
+Request handlers call record_event, which only appends to an in-process
+buffer, so a public page hit never waits on the database. A background task
+flushes the buffer every engagement_flush_interval_seconds (sooner once
+engagement_flush_batch_size events are pending) with one bulk_write of $inc
+upserts into engagement_counters, one counter document per entity and day,
+plus one insert_many into the append-only engagement_events collection
+(raw events are stamped with an expires_at engagement_event_retention_days
+ahead, so a new setting applies to events recorded after the change), and one
+bulk_write into the minute and hour buckets of engagement_series (see
+engagement_series).
+
+Views may carry a visitor id. It is not stored: it only raises a register of
+the entity's per-day HyperLogLog sketch, kept in the counter document as
+hll.<index> fields updated with $max, so unique visitors over any range of
+days are the merge of that range's sketches.
+
+Events are held in memory until flushed: a crash loses at most one interval,
+and past engagement_buffer_max_events new events are dropped (and counted)
+rather than growing the buffer while the database is unreachable.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.engagement_series import COLLECTION_NAME as SERIES_COLLECTION
+from app.services.engagement_series import series_operations
+from app.utils.hyperloglog import HyperLogLog, position
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_COLLECTION = "engagement_counters"
+EVENTS_COLLECTION = "engagement_events"
+
+# Counter fields, one per event type
+METRICS = ("views", "inquiries", "shares", "favorites", "contact_actions")
+
+CounterKey = Tuple[str, str, str]
+
+_events: List[Dict[str, Any]] = []
+_counters: Dict[CounterKey, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+_agents: Dict[CounterKey, str] = {}
+_sketches: Dict[CounterKey, Dict[int, int]] = defaultdict(dict)
+_dropped = 0
+
+_db: Optional[AsyncIOMotorDatabase] = None
+_flush_task: Optional[asyncio.Task] = None
+_flush_requested: Optional[asyncio.Event] = None
+
+
+def counter_id(entity_type: str, entity_id: str, day: str) -> str:
+    """Counter document id of one entity and day"""
+    return f"{entity_type}|{entity_id}|{day}"
+
+
+def record_event(
+    entity_type: str,
+    entity_id: str,
+    metric: str,
+    agent_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    visitor_id: Optional[str] = None
+) -> bool:
+    """
+    Buffer one event for the next flush; never awaits. A visitor_id counts
+    towards the entity's unique visitors. Returns False when the event is
+    dropped (unknown metric or buffer full).
+    """
+    global _dropped
+    if metric not in METRICS or not entity_id:
+        return False
+    if len(_events) >= settings.engagement_buffer_max_events:
+        _dropped += 1
+        return False
+
+    now = datetime.utcnow()
+    entity_id = str(entity_id)
+    event = {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "metric": metric,
+        "occurred_at": now,
+    }
+    if agent_id:
+        event["agent_id"] = str(agent_id)
+    if metadata:
+        event["metadata"] = metadata
+    if settings.engagement_event_retention_days > 0:
+        event["expires_at"] = now + timedelta(days=settings.engagement_event_retention_days)
+    _events.append(event)
+
+    key = (entity_type, entity_id, now.strftime("%Y-%m-%d"))
+    _counters[key][metric] += 1
+    if agent_id:
+        _agents[key] = str(agent_id)
+    if visitor_id:
+        index, rank = position(visitor_id)
+        if rank > _sketches[key].get(index, 0):
+            _sketches[key][index] = rank
+
+    if _flush_requested is not None and len(_events) >= settings.engagement_flush_batch_size:
+        _flush_requested.set()
+    return True
+
+
+def pending_events() -> int:
+    """Events buffered and not yet flushed"""
+    return len(_events)
+
+
+def dropped_events() -> int:
+    """Events dropped because the buffer was full"""
+    return _dropped
+
+
+async def flush_events(db: AsyncIOMotorDatabase) -> int:
+    """Write the buffered events and counter increments; returns the number of events flushed"""
+    global _events, _counters, _agents, _sketches
+    if not _events:
+        return 0
+    # Swap the buffers first so events recorded during the writes go to the next flush
+    events, counters, agents, sketches = _events, _counters, _agents, _sketches
+    _events, _counters = [], defaultdict(lambda: defaultdict(int))
+    _agents, _sketches = {}, defaultdict(dict)
+
+    now = datetime.utcnow()
+    operations = []
+    for key, increments in counters.items():
+        entity_type, entity_id, day = key
+        fields = {"entity_type": entity_type, "entity_id": entity_id, "day": day}
+        if key in agents:
+            fields["agent_id"] = agents[key]
+        update = {
+            "$inc": dict(increments),
+            "$set": {"updated_at": now},
+            "$setOnInsert": fields,
+        }
+        if sketches.get(key):
+            update["$max"] = {f"hll.{index}": rank for index, rank in sketches[key].items()}
+        operations.append(UpdateOne({"_id": counter_id(*key)}, update, upsert=True))
+
+    try:
+        await db[COUNTERS_COLLECTION].bulk_write(operations, ordered=False)
+        await db[SERIES_COLLECTION].bulk_write(series_operations(events), ordered=False)
+        await db[EVENTS_COLLECTION].insert_many(events, ordered=False)
+    except Exception as e:
+        # Engagement metrics are best effort; a failed batch is logged, not retried
+        logger.error(f"Failed to flush {len(events)} engagement events: {e}")
+        return 0
+    return len(events)
+
+
+async def get_engagement_totals(
+    db: AsyncIOMotorDatabase,
+    entity_type: str,
+    entity_id: str,
+    days: Optional[int] = None
+) -> Dict[str, int]:
+    """Summed counters of an entity, over all time or the last days (flushed events only)"""
+    query: Dict[str, Any] = {"entity_type": entity_type, "entity_id": str(entity_id)}
+    if days is not None:
+        query["day"] = {"$gte": (datetime.utcnow() - timedelta(days=days - 1)).strftime("%Y-%m-%d")}
+
+    totals = {metric: 0 for metric in METRICS}
+    cursor = db[COUNTERS_COLLECTION].find(query, {metric: 1 for metric in METRICS})
+    async for counter in cursor:
+        for metric in METRICS:
+            totals[metric] += int(counter.get(metric, 0))
+    return totals
+
+
+async def get_unique_visitors(
+    db: AsyncIOMotorDatabase,
+    entity_type: str,
+    entity_id: str,
+    days: Optional[int] = None
+) -> int:
+    """Estimated distinct visitors of an entity over all time or the last days (flushed only)"""
+    query: Dict[str, Any] = {"entity_type": entity_type, "entity_id": str(entity_id)}
+    if days is not None:
+        query["day"] = {"$gte": (datetime.utcnow() - timedelta(days=days - 1)).strftime("%Y-%m-%d")}
+
+    sketch = HyperLogLog()
+    cursor = db[COUNTERS_COLLECTION].find(query, {"hll": 1, "_id": 0})
+    async for counter in cursor:
+        sketch.merge(HyperLogLog.from_sparse(counter.get("hll") or {}))
+    return sketch.count()
+
+
+async def _flush_loop(db: AsyncIOMotorDatabase, interval_seconds: float) -> None:
+    while True:
+        try:
+            await asyncio.wait_for(_flush_requested.wait(), timeout=interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        _flush_requested.clear()
+        try:
+            await flush_events(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Engagement flush failed: {e}")
+
+
+def start_engagement_flusher(db: AsyncIOMotorDatabase) -> None:
+    """Flush buffered events in the background every engagement_flush_interval_seconds"""
+    global _db, _flush_task, _flush_requested
+    if _flush_task and not _flush_task.done():
+        return
+    _db = db
+    _flush_requested = asyncio.Event()
+    _flush_task = asyncio.create_task(_flush_loop(db, settings.engagement_flush_interval_seconds))
+
+
+async def stop_engagement_flusher() -> None:
+    """Stop the background flush and write out whatever is still buffered"""
+    global _flush_task, _flush_requested
+    if _flush_task and not _flush_task.done():
+        _flush_task.cancel()
+        # Let a flush cut short by the cancel unwind before the final flush runs
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+    _flush_task = None
+    _flush_requested = None
+    if _db is not None:
+        await flush_events(_db)
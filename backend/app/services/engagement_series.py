@@ -0,0 +1,169 @@
+"""
+Engagement Series
+=================
+Time-series storage of engagement events for trend charts, at three
+resolutions with their own retention:
+
+- minute: one bucket document per entity and hour, counts per minute, kept
+  engagement_minute_retention_hours
+- hour: one bucket document per entity and day, counts per hour, kept
+  engagement_hour_retention_days
+- day: the per-day engagement_counters documents, kept indefinitely (they
+  also hold lifetime totals and the unique-visitor sketches)
+
+Minute and hour buckets live in engagement_series and carry an expires_at
+field behind a TTL index, so retention needs no job. Downsampling happens at
+ingest: each flush of the event buffer folds its events into the minute,
+hour and day buckets in the same batch, so the coarser tiers are exact and
+outlive the finer ones. Queries pick the finest resolution that both suits
+the requested span and is still retained.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from app.core.config import settings
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+COLLECTION_NAME = "engagement_series"
+COUNTERS_COLLECTION = "engagement_counters"  # day tier, written by engagement_events
+
+MINUTE = "minute"
+HOUR = "hour"
+DAY = "day"
+
+# Longest spans charted at minute and hour resolution
+MAX_MINUTE_SPAN = timedelta(hours=6)
+MAX_HOUR_SPAN = timedelta(days=7)
+
+
+class Tier(NamedTuple):
+    step: timedelta
+    bucket: timedelta
+    slot_format: str
+
+
+TIERS = {
+    MINUTE: Tier(step=timedelta(minutes=1), bucket=timedelta(hours=1), slot_format="%M"),
+    HOUR: Tier(step=timedelta(hours=1), bucket=timedelta(days=1), slot_format="%H"),
+    DAY: Tier(step=timedelta(days=1), bucket=timedelta(days=1), slot_format=""),
+}
+
+
+def retention(resolution: str) -> Optional[timedelta]:
+    """How long buckets of a resolution are kept (None: indefinitely)"""
+    if resolution == MINUTE:
+        return timedelta(hours=settings.engagement_minute_retention_hours)
+    if resolution == HOUR:
+        return timedelta(days=settings.engagement_hour_retention_days)
+    return None
+
+
+def floor_time(value: datetime, delta: timedelta) -> datetime:
+    """Start of the minute, hour or day containing value"""
+    if delta >= timedelta(days=1):
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if delta >= timedelta(hours=1):
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(second=0, microsecond=0)
+
+
+def bucket_id(entity_type: str, entity_id: str, resolution: str, start: datetime) -> str:
+    """Bucket document id of one entity, resolution and bucket start"""
+    return f"{entity_type}|{entity_id}|{resolution}|{start.isoformat()}"
+
+
+def series_operations(events: Iterable[Dict[str, Any]]) -> List[UpdateOne]:
+    """$inc upserts folding buffered events into their minute and hour buckets"""
+    buckets: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        for resolution in (MINUTE, HOUR):
+            tier = TIERS[resolution]
+            start = floor_time(event["occurred_at"], tier.bucket)
+            key = bucket_id(event["entity_type"], event["entity_id"], resolution, start)
+            bucket = buckets.setdefault(key, {
+                "fields": {
+                    "entity_type": event["entity_type"],
+                    "entity_id": event["entity_id"],
+                    "resolution": resolution,
+                    "start": start,
+                    "expires_at": start + tier.bucket + retention(resolution),
+                },
+                "increments": {},
+            })
+            field = f"counts.{event['occurred_at'].strftime(tier.slot_format)}.{event['metric']}"
+            bucket["increments"][field] = bucket["increments"].get(field, 0) + 1
+
+    return [
+        UpdateOne(
+            {"_id": key},
+            {"$inc": bucket["increments"], "$setOnInsert": bucket["fields"]},
+            upsert=True,
+        )
+        for key, bucket in buckets.items()
+    ]
+
+
+def choose_resolution(start: datetime, end: datetime, now: Optional[datetime] = None) -> str:
+    """Finest resolution suited to the span whose retention still covers start"""
+    now = now or datetime.utcnow()
+    span = end - start
+    if span <= MAX_MINUTE_SPAN and start >= now - retention(MINUTE):
+        return MINUTE
+    if span <= MAX_HOUR_SPAN and start >= now - retention(HOUR):
+        return HOUR
+    return DAY
+
+
+async def get_engagement_series(
+    db: AsyncIOMotorDatabase,
+    entity_type: str,
+    entity_id: str,
+    start: datetime,
+    end: datetime,
+    metrics: Iterable[str],
+    resolution: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Engagement of an entity between start and end as consecutive points of
+    one resolution (chosen automatically unless given), zero-filled:
+    {"resolution": ..., "points": [{"start": datetime, <metric>: count, ...}]}
+    """
+    resolution = resolution or choose_resolution(start, end)
+    tier = TIERS[resolution]
+    metrics = list(metrics)
+    first = floor_time(start, tier.step)
+    counts: Dict[datetime, Dict[str, int]] = {}
+
+    if resolution == DAY:
+        query = {
+            "entity_type": entity_type,
+            "entity_id": str(entity_id),
+            "day": {"$gte": first.strftime("%Y-%m-%d"), "$lte": end.strftime("%Y-%m-%d")},
+        }
+        projection = {"day": 1, **{metric: 1 for metric in metrics}}
+        cursor = db[COUNTERS_COLLECTION].find(query, projection)
+        async for counter in cursor:
+            counts[datetime.strptime(counter["day"], "%Y-%m-%d")] = counter
+    else:
+        query = {
+            "entity_type": entity_type,
+            "entity_id": str(entity_id),
+            "resolution": resolution,
+            "start": {"$gte": floor_time(start, tier.bucket), "$lte": end},
+        }
+        cursor = db[COLLECTION_NAME].find(query, {"start": 1, "counts": 1})
+        async for bucket in cursor:
+            for slot, slot_counts in (bucket.get("counts") or {}).items():
+                counts[bucket["start"] + int(slot) * tier.step] = slot_counts
+
+    points = []
+    point = first
+    while point <= end:
+        values = counts.get(point) or {}
+        points.append(
+            {"start": point, **{metric: int(values.get(metric, 0)) for metric in metrics}}
+        )
+        point += tier.step
+    return {"resolution": resolution, "points": points}
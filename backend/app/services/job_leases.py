@@ -0,0 +1,41 @@
+"""
+Job Leases
+==========
+Named leases in MongoDB, so a background job scheduled in every API worker
+runs in one of them at a time.
+
+A lease is one document {_id: name, holder, expires_at}. acquire_lease takes
+it when it is free, expired or already held by the caller (which extends
+it), in a single upsert: when another holder's lease is still live the
+filter misses and the insert fails on the duplicate _id.
+"""
+
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "job_leases"
+
+# Identity of this process as a lease holder
+HOLDER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+async def acquire_lease(db: AsyncIOMotorDatabase, name: str, ttl_seconds: float) -> bool:
+    """Take or extend the named lease for ttl_seconds; False while another process holds it"""
+    now = datetime.utcnow()
+    try:
+        await db[COLLECTION_NAME].update_one(
+            {"_id": name, "$or": [{"holder": HOLDER_ID}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"holder": HOLDER_ID, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        return False
+    return True
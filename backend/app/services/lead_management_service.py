@@ -13,6 +13,8 @@ from bson import ObjectId
 import asyncio
 import json
 
+from app.services import analytics_rollups
+from app.utils.serialization import construct_trusted
 from app.schemas.lead import (
     LeadCreate, LeadUpdate, LeadResponse, LeadStats, LeadScoring,
     LeadActivity, LeadSearchFilters, LeadSearchResult,
@@ -301,6 +303,7 @@ class LeadManagementService:
             # Insert lead
             result = await self.leads_collection.insert_one(lead_dict)
             lead_dict['id'] = str(result.inserted_id)
+            await analytics_rollups.apply_lead_changes(self.db, [(None, lead_dict)])
             
             # Create initial activity
             await self._create_activity(
@@ -341,6 +344,7 @@ class LeadManagementService:
                 {"_id": ObjectId(lead_id)},
                 {"$set": update_dict}
             )
+            await analytics_rollups.apply_lead_changes(self.db, [(lead, {**lead, **update_dict})])
             
             # Create activity
             await self._create_activity(
@@ -375,7 +379,7 @@ class LeadManagementService:
             activities = await self._get_lead_activities(lead_id)
             lead['activities'] = activities
             
-            return LeadResponse(**lead)
+            return construct_trusted(LeadResponse, lead)
             
         except Exception as e:
             logger.error(f"Error getting lead: {e}")
@@ -449,7 +453,7 @@ class LeadManagementService:
                 lead['id'] = str(lead['_id'])
                 activities = await self._get_lead_activities(lead['id'])
                 lead['activities'] = activities
-                lead_responses.append(LeadResponse(**lead))
+                lead_responses.append(construct_trusted(LeadResponse, lead))
             
             total_pages = (total + per_page - 1) // per_page
             
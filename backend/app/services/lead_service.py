@@ -9,6 +9,8 @@ from datetime import datetime
 from app.repositories.lead_repository import LeadRepository
 from app.schemas.lead import LeadCreate, LeadUpdate, LeadResponse
 from app.core.exceptions import NotFoundError
+from app.services import analytics_rollups
+from app.utils.serialization import construct_trusted
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,11 @@ class LeadService:
     def __init__(self, lead_repository: LeadRepository):
         self.lead_repository = lead_repository
 
+    @property
+    def db(self):
+        """Database of the lead repository; the rollup hooks write next to the leads"""
+        return self.lead_repository.collection.database
+
     async def create_lead(self, lead_data: LeadCreate, agent_id: str) -> LeadResponse:
         lead_dict = lead_data.model_dump()
         lead_dict.update({
@@ -30,19 +37,20 @@ class LeadService:
             "updated_at": datetime.utcnow()
         })
         lead = await self.lead_repository.create(lead_dict)
+        await analytics_rollups.apply_lead_changes(self.db, [(None, lead)])
         logger.info(f"Lead created for agent {agent_id}: {lead['id']}")
         return LeadResponse(**lead)
 
     async def get_leads(self, agent_id: str, skip: int = 0, limit: int = 100) -> List[LeadResponse]:
         query = {"agent_id": agent_id}
         leads = await self.lead_repository.find(query, skip=skip, limit=limit)
-        return [LeadResponse(**lead) for lead in leads]
+        return [construct_trusted(LeadResponse, lead) for lead in leads]
 
     async def get_lead(self, lead_id: str, agent_id: str) -> LeadResponse:
         lead = await self.lead_repository.get_by_id(lead_id)
         if not lead or lead.get("agent_id") != agent_id:
             raise NotFoundError("Lead not found")
-        return LeadResponse(**lead)
+        return construct_trusted(LeadResponse, lead)
 
     async def update_lead(self, lead_id: str, lead_data: LeadUpdate, agent_id: str) -> LeadResponse:
         existing_lead = await self.lead_repository.get_by_id(lead_id)
@@ -52,13 +60,17 @@ class LeadService:
         update_data = lead_data.model_dump(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
         updated_lead = await self.lead_repository.update(lead_id, update_data)
+        await analytics_rollups.apply_lead_changes(self.db, [(existing_lead, updated_lead)])
         return LeadResponse(**updated_lead)
 
     async def delete_lead(self, lead_id: str, agent_id: str) -> bool:
         existing_lead = await self.lead_repository.get_by_id(lead_id)
         if not existing_lead or existing_lead.get("agent_id") != agent_id:
             raise NotFoundError("Lead not found")
-        return await self.lead_repository.delete(lead_id)
+        deleted = await self.lead_repository.delete(lead_id)
+        if deleted:
+            await analytics_rollups.apply_lead_changes(self.db, [(existing_lead, None)])
+        return deleted
 
     async def get_lead_stats(self, agent_id: str) -> dict:
         leads = await self.lead_repository.find({"agent_id": agent_id})
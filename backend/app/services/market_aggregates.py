@@ -0,0 +1,267 @@
+"""
+Market Aggregates
+=================
+Per-locality, per-property-type running totals of active listings, used to
+produce market insights with a single document read.
+
+Each aggregate document is keyed by "<locality>|<property_type>" and holds
+counts, price sums and squared sums, price-per-sqft sums and monthly buckets
+by listing month. Property writes apply the difference between the old and
+the new document with $inc, so the totals never need a collection scan.
+"""
+
+import copy
+import logging
+import math
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "market_aggregates"
+
+# Months compared against the preceding window of the same length for the trend
+TREND_WINDOW_MONTHS = 3
+# Relative change in average price below which the market counts as stable
+TREND_THRESHOLD = 0.02
+
+# Price range reported as average +/- this many standard deviations
+PRICE_RANGE_STDDEVS = 1.0
+
+# Listings without a status predate the field and count as active, as in
+# the schema default; ACTIVE_FILTER selects the same set in a query.
+ACTIVE_STATUS = "active"
+ACTIVE_FILTER = {"status": {"$in": [ACTIVE_STATUS, None]}}
+
+Contribution = Tuple[str, Dict[str, float]]
+
+
+def normalize_locality(location: Optional[str]) -> str:
+    """Locality key of a free-text location: its first comma-separated part"""
+    first = (location or "").split(",")[0]
+    return re.sub(r"\s+", " ", first).strip().lower()
+
+
+def aggregate_key(location: Optional[str], property_type: Optional[str]) -> str:
+    return f"{normalize_locality(location)}|{(property_type or '').strip().lower()}"
+
+
+def _month(value: Any) -> Optional[str]:
+    return value.strftime("%Y-%m") if isinstance(value, datetime) else None
+
+
+def property_contribution(doc: Optional[Dict[str, Any]]) -> Optional[Contribution]:
+    """The (key, increments) a property adds to the aggregates, or None if it does not count"""
+    if not doc or doc.get("status") not in (ACTIVE_STATUS, None):
+        return None
+    try:
+        price = float(doc.get("price") or 0)
+    except (TypeError, ValueError):
+        return None
+    if price <= 0 or not normalize_locality(doc.get("location")):
+        return None
+
+    increments = {"count": 1, "sum_price": price, "sum_price_sq": price * price}
+    try:
+        area = float(doc.get("area_sqft") or 0)
+    except (TypeError, ValueError):
+        area = 0
+    if area > 0:
+        increments["area_count"] = 1
+        increments["sum_price_per_sqft"] = price / area
+
+    month = _month(doc.get("created_at"))
+    if month:
+        increments[f"monthly.{month}.count"] = 1
+        increments[f"monthly.{month}.sum_price"] = price
+
+    return aggregate_key(doc.get("location"), doc.get("property_type")), increments
+
+
+def new_totals() -> Dict[str, Dict[str, float]]:
+    """Empty accumulator of net increments per aggregate key"""
+    return defaultdict(lambda: defaultdict(float))
+
+
+def add_change(
+    totals: Dict[str, Dict[str, float]],
+    old_doc: Optional[Dict[str, Any]],
+    new_doc: Optional[Dict[str, Any]]
+) -> None:
+    """Accumulate the net effect of replacing old_doc with new_doc"""
+    for doc, sign in ((old_doc, -1), (new_doc, 1)):
+        contribution = property_contribution(doc)
+        if contribution:
+            key, increments = contribution
+            for field, value in increments.items():
+                totals[key][field] += sign * value
+
+
+def _nonzero(totals: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        key: {field: value for field, value in increments.items() if value != 0}
+        for key, increments in totals.items()
+        if any(value != 0 for value in increments.values())
+    }
+
+
+async def apply_property_changes(
+    db: AsyncIOMotorDatabase,
+    changes: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]
+) -> None:
+    """
+    Fold property writes into the aggregates. Each change is (old_doc, new_doc);
+    use None for the missing side of an insert or delete.
+    """
+    totals = new_totals()
+    for old_doc, new_doc in changes:
+        add_change(totals, old_doc, new_doc)
+    net = _nonzero(totals)
+    if not net:
+        return
+
+    operations = []
+    for key, increments in net.items():
+        locality, property_type = key.split("|", 1)
+        operations.append(UpdateOne(
+            {"_id": key},
+            {
+                "$inc": increments,
+                "$set": {"updated_at": datetime.utcnow()},
+                "$setOnInsert": {"locality": locality, "property_type": property_type},
+            },
+            upsert=True
+        ))
+    try:
+        await db[COLLECTION_NAME].bulk_write(operations, ordered=False)
+    except Exception as e:
+        # Aggregates are derived data; the rebuild job repairs any drift
+        logger.error(f"Failed to update market aggregates: {e}")
+
+
+def _shift_month(month: str, delta: int) -> str:
+    year, number = map(int, month.split("-"))
+    index = year * 12 + (number - 1) + delta
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _window_average(monthly: Dict[str, Dict[str, float]], months: List[str]) -> Optional[float]:
+    count = sum(monthly.get(m, {}).get("count", 0) for m in months)
+    total = sum(monthly.get(m, {}).get("sum_price", 0) for m in months)
+    return total / count if count > 0 else None
+
+
+def _market_trend(monthly: Dict[str, Dict[str, float]], now: datetime) -> Tuple[str, float]:
+    current = _month(now)
+    recent = [_shift_month(current, -i) for i in range(TREND_WINDOW_MONTHS)]
+    previous = [
+        _shift_month(current, -i) for i in range(TREND_WINDOW_MONTHS, 2 * TREND_WINDOW_MONTHS)
+    ]
+
+    recent_avg = _window_average(monthly, recent)
+    previous_avg = _window_average(monthly, previous)
+    if not recent_avg or not previous_avg:
+        return "stable", 0.0
+
+    change = (recent_avg - previous_avg) / previous_avg
+    if change > TREND_THRESHOLD:
+        trend = "rising"
+    elif change < -TREND_THRESHOLD:
+        trend = "falling"
+    else:
+        trend = "stable"
+    return trend, round(change * 100, 1)
+
+
+def _subtract(aggregate: Dict[str, Any], contribution: Contribution) -> None:
+    """Remove one property's own contribution from a loaded aggregate"""
+    _, increments = contribution
+    for field, value in increments.items():
+        if field.startswith("monthly."):
+            _, month, name = field.split(".")
+            bucket = aggregate.get("monthly", {}).get(month)
+            if bucket and name in bucket:
+                bucket[name] -= value
+        elif field in aggregate:
+            aggregate[field] -= value
+
+
+async def load_aggregates(
+    db: AsyncIOMotorDatabase, docs: Iterable[Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """The aggregates of the distinct localities/types of docs, in one query (for bulk creation)"""
+    keys = {aggregate_key(doc.get("location"), doc.get("property_type")) for doc in docs}
+    if not keys:
+        return {}
+    cursor = db[COLLECTION_NAME].find({"_id": {"$in": list(keys)}})
+    return {aggregate["_id"]: aggregate async for aggregate in cursor}
+
+
+async def get_market_insights(
+    db: AsyncIOMotorDatabase,
+    doc: Dict[str, Any],
+    exclude_self: bool = False
+) -> Dict[str, Any]:
+    """
+    Market insights for a property from comparable active listings in the
+    same locality and property type. With exclude_self the property's own
+    contribution is removed so it is not counted as its own competitor.
+    """
+    key = aggregate_key(doc.get("location"), doc.get("property_type"))
+    aggregate = await db[COLLECTION_NAME].find_one({"_id": key}) or {}
+    return market_insights(aggregate, doc, exclude_self=exclude_self)
+
+
+def market_insights(
+    aggregate: Optional[Dict[str, Any]],
+    doc: Dict[str, Any],
+    exclude_self: bool = False
+) -> Dict[str, Any]:
+    """Market insights for a property from its already loaded aggregate (not modified)"""
+    now = datetime.utcnow()
+    key = aggregate_key(doc.get("location"), doc.get("property_type"))
+    aggregate = copy.deepcopy(aggregate) if aggregate else {}
+
+    own = property_contribution(doc) if exclude_self else None
+    if aggregate and own and own[0] == key:
+        _subtract(aggregate, own)
+
+    count = int(round(aggregate.get("count", 0)))
+    price = float(doc.get("price") or 0)
+    insights: Dict[str, Any] = {
+        "locality": normalize_locality(doc.get("location")),
+        "property_type": doc.get("property_type"),
+        "competitor_count": count,
+        "average_price": None,
+        "price_range": None,
+        "price_per_sqft": None,
+        "price_position_percentage": None,
+        "market_trend": "stable",
+        "trend_percentage": 0.0,
+        "generated_at": now.isoformat(),
+    }
+    if count <= 0:
+        return insights
+
+    average = aggregate["sum_price"] / count
+    variance = max(aggregate.get("sum_price_sq", 0) / count - average * average, 0.0)
+    spread = PRICE_RANGE_STDDEVS * math.sqrt(variance)
+    insights["average_price"] = round(average, 2)
+    insights["price_range"] = [round(max(average - spread, 0.0), 2), round(average + spread, 2)]
+
+    area_count = int(round(aggregate.get("area_count", 0)))
+    if area_count > 0:
+        insights["price_per_sqft"] = round(aggregate["sum_price_per_sqft"] / area_count, 2)
+
+    if price > 0 and average > 0:
+        insights["price_position_percentage"] = round((price - average) / average * 100, 1)
+
+    trend, change = _market_trend(aggregate.get("monthly", {}), now)
+    insights["market_trend"] = trend
+    insights["trend_percentage"] = change
+    return insights
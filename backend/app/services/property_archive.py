@@ -0,0 +1,166 @@
+"""
+Property Archive
+================
+Cold tier for listings that are no longer on the market.
+
+Sold, inactive and archived listings that have not been updated for
+property_archive_after_days are moved from properties to properties_archive,
+keeping the live collection and its search/analytics indexes sized to the
+working set. Reads by id fall through to the archive, and analytics can
+union it back in on request. Archived listings are read-only: updates miss
+them (404), while deletes remove them from the archive.
+
+A move copies a batch into the archive first and only then deletes it from
+properties, so an interrupted run leaves duplicates (harmless, the next run
+overwrites them) rather than lost listings. The batch is deleted with one
+delete_many that re-checks the archive criteria. Every API worker schedules
+the sweep, but it only runs in the holder of the archive job lease, so two
+sweeps never remove the same listing and apply its read model changes twice.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.job_leases import acquire_lease
+from app.services.property_cache import invalidate_property
+from app.services.property_read_models import record_property_changes
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "properties_archive"
+
+# Listing statuses that are eligible for the archive
+ARCHIVABLE_STATUSES = ("sold", "inactive", "archived")
+
+# Lease held by the worker that runs the scheduled sweep
+ARCHIVE_LEASE = "property_archive"
+
+_archive_task: Optional[asyncio.Task] = None
+
+
+def archivable_filter(cutoff: datetime) -> Dict[str, Any]:
+    """Listings off the market or unpublished as archived, untouched since cutoff"""
+    return {
+        "$or": [
+            {"status": {"$in": list(ARCHIVABLE_STATUSES)}},
+            {"publishing_status": "archived"},
+        ],
+        "updated_at": {"$lt": cutoff},
+    }
+
+
+def union_archive_stage(match: Dict[str, Any]) -> Dict[str, Any]:
+    """$unionWith stage appending archived listings that match the same query"""
+    return {"$unionWith": {"coll": ARCHIVE_COLLECTION, "pipeline": [{"$match": match}]}}
+
+
+async def find_archived_property(
+    db: AsyncIOMotorDatabase,
+    query: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Look a listing up in the archive (used when the live collection misses)"""
+    return await db[ARCHIVE_COLLECTION].find_one(query)
+
+
+async def delete_archived_property(
+    db: AsyncIOMotorDatabase,
+    query: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Delete a listing from the archive (used when the live collection misses)"""
+    return await db[ARCHIVE_COLLECTION].find_one_and_delete(query)
+
+
+async def _archive_batch(
+    db: AsyncIOMotorDatabase,
+    docs: List[Dict[str, Any]],
+    criteria: Dict[str, Any]
+) -> int:
+    archived_at = datetime.utcnow()
+    await db[ARCHIVE_COLLECTION].bulk_write(
+        [
+            ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": archived_at}, upsert=True)
+            for doc in docs
+        ],
+        ordered=False
+    )
+
+    # Re-check the criteria so a listing reactivated mid-run stays live
+    ids = [doc["_id"] for doc in docs]
+    result = await db.properties.delete_many({"_id": {"$in": ids}, **criteria})
+    removed = docs
+    if result.deleted_count < len(docs):
+        live = await db.properties.find({"_id": {"$in": ids}}, {"_id": 1}).to_list(length=None)
+        still_live = {doc["_id"] for doc in live}
+        if still_live:
+            await db[ARCHIVE_COLLECTION].delete_many({"_id": {"$in": list(still_live)}})
+        removed = [doc for doc in docs if doc["_id"] not in still_live]
+
+    for doc in removed:
+        invalidate_property(doc["_id"])
+    # An archived publishing_status does not take a listing off the market,
+    # so every read model sees the removal, not only those of live listings
+    await record_property_changes(db, [(doc, None) for doc in removed])
+    return len(removed)
+
+
+async def archive_properties(
+    db: AsyncIOMotorDatabase,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """Move aged off-market listings to the archive; returns scanned/archived counts"""
+    if older_than_days is None:
+        older_than_days = settings.property_archive_after_days
+    batch_size = batch_size or settings.property_archive_batch_size
+    criteria = archivable_filter(datetime.utcnow() - timedelta(days=older_than_days))
+    stats = {"scanned": 0, "archived": 0}
+
+    while True:
+        docs = await db.properties.find(criteria).sort("_id", 1).limit(batch_size).to_list(
+            length=batch_size
+        )
+        if not docs:
+            break
+        stats["scanned"] += len(docs)
+        stats["archived"] += await _archive_batch(db, docs, criteria)
+
+    logger.info(f"Property archive run finished: {stats}")
+    return stats
+
+
+async def _archive_loop(db: AsyncIOMotorDatabase, interval_seconds: int) -> None:
+    while True:
+        try:
+            # The holder renews each run; a dead holder's lease lapses after two intervals
+            if await acquire_lease(db, ARCHIVE_LEASE, interval_seconds * 2):
+                await archive_properties(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Property archive run failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+def start_archive_scheduler(db: AsyncIOMotorDatabase) -> None:
+    """
+    Run archive_properties every property_archive_interval_hours in the
+    background, in whichever worker holds the archive lease.
+    """
+    global _archive_task
+    interval_hours = settings.property_archive_interval_hours
+    if interval_hours <= 0 or (_archive_task and not _archive_task.done()):
+        return
+    _archive_task = asyncio.create_task(_archive_loop(db, interval_hours * 3600))
+
+
+def stop_archive_scheduler() -> None:
+    """Cancel the background archive schedule, if running"""
+    global _archive_task
+    if _archive_task and not _archive_task.done():
+        _archive_task.cancel()
+    _archive_task = None
@@ -0,0 +1,22 @@
+"""
+Property Cache
+==============
+Process-wide read-through cache of raw property documents.
+
+Entries are keyed by property id and carry the owning agent_id, which
+readers must check before serving a hit. Every code path that writes a
+property document must call invalidate_property.
+"""
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+property_cache = TTLCache(
+    max_entries=settings.property_cache_max_entries,
+    ttl_seconds=settings.property_cache_ttl_seconds
+)
+
+
+def invalidate_property(property_id) -> None:
+    """Drop a property from the cache after it was written or deleted"""
+    property_cache.invalidate(str(property_id))
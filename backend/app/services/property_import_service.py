@@ -0,0 +1,305 @@
+"""
+Property Import Service
+=======================
+Background import of property listings from CSV or Excel spreadsheets.
+
+The uploaded file is read row by row from disk, rows are validated against
+PropertyCreate in a process pool, and valid rows are written in batches
+through UnifiedPropertyService.batch_create_properties. Only a few batches
+are in memory at any time. Progress is saved to a job document in
+property_import_jobs after every batch, so clients can poll it through any
+worker process; finished jobs expire JOB_RETENTION later. Jobs left unfinished
+by a worker that died are marked failed on the next startup.
+"""
+
+import asyncio
+import csv
+import logging
+import multiprocessing
+import re
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.schemas.unified_property import ImportRowError, PropertyCreate, PropertyImportJob
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError as PydanticValidationError
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "property_import_jobs"
+
+SUPPORTED_IMPORT_EXTENSIONS = {".csv": "csv", ".xlsx": "excel", ".xlsm": "excel"}
+
+# Spreadsheet cells holding several values ("Pool; Gym; Parking")
+LIST_COLUMNS = {"features", "images", "recommendations", "target_languages", "publishing_channels"}
+LIST_SEPARATORS = re.compile(r"\s*[;|,]\s*")
+
+# Rejected rows kept on the job record for display
+MAX_REPORTED_ERRORS = 100
+
+# Finished jobs are forgotten after this long
+JOB_RETENTION = timedelta(hours=6)
+
+_running_imports: Set[asyncio.Task] = set()
+_validation_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _normalize_header(name: Any) -> str:
+    return re.sub(r"\s+", "_", str(name or "").strip().lower())
+
+
+def _normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop empty cells so model defaults apply and split multi-value cells"""
+    data: Dict[str, Any] = {}
+    for key, value in row.items():
+        if not key:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if key in LIST_COLUMNS:
+                value = [item for item in LIST_SEPARATORS.split(value) if item]
+        if value is None or value == "" or value == []:
+            continue
+        data[key] = value
+    return data
+
+
+def iter_csv_rows(path: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (row number, row) from a CSV file; row 1 is the header"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [_normalize_header(name) for name in next(reader, [])]
+        for row_number, values in enumerate(reader, start=2):
+            if any(values):
+                yield row_number, _normalize_row(dict(zip(header, values)))
+
+
+def iter_excel_rows(path: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (row number, row) from the first worksheet of an Excel workbook"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValidationError("Excel import is not available: openpyxl is not installed")
+
+    # read_only streams rows from the zip instead of loading the whole sheet
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_normalize_header(name) for name in next(rows, ())]
+        for row_number, values in enumerate(rows, start=2):
+            if any(value is not None for value in values):
+                yield row_number, _normalize_row(dict(zip(header, values)))
+    finally:
+        workbook.close()
+
+
+def _format_validation_error(error: PydanticValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def validate_import_rows(
+    rows: List[Tuple[int, Dict[str, Any]]]
+) -> Tuple[List[Tuple[int, PropertyCreate]], List[Tuple[int, str]]]:
+    """
+    Validate a batch of rows against PropertyCreate.
+    Runs in a worker process, so it must stay a picklable module-level function.
+    """
+    valid: List[Tuple[int, PropertyCreate]] = []
+    errors: List[Tuple[int, str]] = []
+    for row_number, data in rows:
+        try:
+            valid.append((row_number, PropertyCreate(**data)))
+        except PydanticValidationError as e:
+            errors.append((row_number, _format_validation_error(e)))
+        except Exception as e:
+            errors.append((row_number, str(e)))
+    return valid, errors
+
+
+def _get_validation_pool() -> ProcessPoolExecutor:
+    global _validation_pool
+    if _validation_pool is None:
+        # spawn avoids inheriting the event loop and open database sockets
+        _validation_pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.property_import_workers),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _validation_pool
+
+
+def shutdown_import_workers() -> None:
+    """Stop the validation pool and cancel imports still running"""
+    global _validation_pool
+    for task in list(_running_imports):
+        task.cancel()
+    if _validation_pool is not None:
+        _validation_pool.shutdown(wait=False, cancel_futures=True)
+        _validation_pool = None
+
+
+def detect_import_format(filename: Optional[str]) -> str:
+    """Map an uploaded filename to 'csv' or 'excel'"""
+    kind = SUPPORTED_IMPORT_EXTENSIONS.get(Path(filename or "").suffix.lower())
+    if kind is None:
+        raise ValidationError(
+            f"Unsupported import file. Allowed extensions: {', '.join(SUPPORTED_IMPORT_EXTENSIONS)}"
+        )
+    return kind
+
+
+async def save_import_job(db: AsyncIOMotorDatabase, job: PropertyImportJob) -> None:
+    """Write a job's current progress to its document"""
+    document = {**job.model_dump(), "_id": job.job_id, "updated_at": datetime.utcnow()}
+    if job.finished_at:
+        document["expires_at"] = job.finished_at + JOB_RETENTION
+    await db[JOBS_COLLECTION].replace_one({"_id": job.job_id}, document, upsert=True)
+
+
+async def create_import_job(
+    db: AsyncIOMotorDatabase, agent_id: str, filename: str
+) -> PropertyImportJob:
+    """Register a new import job"""
+    job = PropertyImportJob(
+        job_id=str(uuid.uuid4()),
+        agent_id=str(agent_id),
+        filename=filename,
+        created_at=datetime.utcnow()
+    )
+    await save_import_job(db, job)
+    return job
+
+
+async def fail_stale_import_jobs(
+    db: AsyncIOMotorDatabase,
+    stale_after: Optional[timedelta] = None
+) -> int:
+    """
+    Mark queued or running jobs that saved no progress for stale_after as
+    failed, so clients polling a job whose worker died see a terminal state.
+    Running imports save after every batch, so live jobs are not matched.
+    """
+    if stale_after is None:
+        stale_after = timedelta(minutes=settings.property_import_stale_minutes)
+    now = datetime.utcnow()
+    result = await db[JOBS_COLLECTION].update_many(
+        {"status": {"$in": ["queued", "running"]}, "updated_at": {"$lt": now - stale_after}},
+        {"$set": {
+            "status": "failed",
+            "message": "Import was interrupted",
+            "finished_at": now,
+            "updated_at": now,
+            "expires_at": now + JOB_RETENTION,
+        }}
+    )
+    if result.modified_count:
+        logger.warning(f"Marked {result.modified_count} interrupted property imports as failed")
+    return result.modified_count
+
+
+async def get_import_job(db: AsyncIOMotorDatabase, job_id: str) -> Optional[PropertyImportJob]:
+    """Get an import job by id"""
+    document = await db[JOBS_COLLECTION].find_one({"_id": job_id})
+    return PropertyImportJob(**document) if document else None
+
+
+def _record_errors(job: PropertyImportJob, errors: List[Tuple[int, str]]) -> None:
+    job.failed_count += len(errors)
+    room = MAX_REPORTED_ERRORS - len(job.errors)
+    job.errors.extend(ImportRowError(row=row, error=error) for row, error in errors[:max(0, room)])
+
+
+async def _write_batch(
+    service, job: PropertyImportJob, valid: List[Tuple[int, PropertyCreate]]
+) -> None:
+    if not valid:
+        return
+    report = await service.batch_create_properties(
+        [model for _, model in valid], job.agent_id, chunk_size=len(valid)
+    )
+    job.created_count += report.created_count
+    _record_errors(job, [(valid[r.index][0], r.error) for r in report.results if r.error])
+
+
+async def run_import(
+    db: AsyncIOMotorDatabase,
+    job: PropertyImportJob,
+    path: Path,
+    kind: str,
+    service
+) -> None:
+    """
+    Import every row of the file at path, saving job as batches complete.
+
+    Reading, validation and writes overlap: while one batch is written the
+    next ones are already being validated by the pool. At most
+    property_import_workers batches are in flight at once. The file is
+    deleted when the import ends.
+    """
+    loop = asyncio.get_running_loop()
+    batch_size = max(1, settings.property_import_batch_size)
+    max_in_flight = max(1, settings.property_import_workers)
+    in_flight: deque = deque()
+
+    job.status = "running"
+    try:
+        await save_import_job(db, job)
+        rows = iter_csv_rows(path) if kind == "csv" else iter_excel_rows(path)
+        pool = _get_validation_pool()
+
+        while True:
+            batch = await asyncio.to_thread(lambda: list(islice(rows, batch_size)))
+            if batch:
+                job.rows_read += len(batch)
+                in_flight.append(loop.run_in_executor(pool, validate_import_rows, batch))
+
+            if in_flight and (len(in_flight) >= max_in_flight or not batch):
+                valid, errors = await in_flight.popleft()
+                _record_errors(job, errors)
+                await _write_batch(service, job, valid)
+                await save_import_job(db, job)
+
+            if not batch and not in_flight:
+                break
+
+        job.status = "completed"
+        job.message = f"Imported {job.created_count} of {job.rows_read} rows"
+    except asyncio.CancelledError:
+        job.status = "failed"
+        job.message = "Import was cancelled"
+        raise
+    except Exception as e:
+        logger.error(f"Property import {job.job_id} failed: {e}")
+        job.status = "failed"
+        job.message = str(e)
+    finally:
+        for future in in_flight:
+            future.cancel()
+        job.finished_at = datetime.utcnow()
+        path.unlink(missing_ok=True)
+        try:
+            await save_import_job(db, job)
+        except Exception as e:
+            logger.error(f"Failed to save property import {job.job_id}: {e}")
+        logger.info(
+            f"Property import {job.job_id} {job.status}: {job.rows_read} rows, "
+            f"{job.created_count} created, {job.failed_count} failed"
+        )
+
+
+def start_import(
+    db: AsyncIOMotorDatabase, job: PropertyImportJob, path: Path, kind: str, service
+) -> None:
+    """Run an import in the background of the current event loop"""
+    task = asyncio.create_task(run_import(db, job, path, kind, service))
+    _running_imports.add(task)
+    task.add_done_callback(_running_imports.discard)
@@ -12,6 +12,8 @@ from app.schemas.agent_language_preferences import (
 )
 from app.schemas.unified_property import PropertyResponse
 from app.core.database import get_database
+from app.services.property_cache import invalidate_property
+from app.services.property_read_models import record_property_changes
 
 logger = logging.getLogger(__name__)
 
@@ -70,18 +72,18 @@ class PropertyPublishingService:
             
             # Update property status
             update_query = self._get_property_query(property_id)
-            await self.properties_collection.update_one(
-                update_query,
-                {
-                    "$set": {
-                        "publishing_status": "published",
-                        "published_at": datetime.now(),
-                        "target_languages": publishing_request.target_languages,
-                        "publishing_channels": publishing_request.publishing_channels,
-                        "facebook_page_mappings": publishing_request.facebook_page_mappings or {},
-                        "updated_at": datetime.now()
-                    }
-                }
+            published_fields = {
+                "publishing_status": "published",
+                "published_at": datetime.now(),
+                "target_languages": publishing_request.target_languages,
+                "publishing_channels": publishing_request.publishing_channels,
+                "facebook_page_mappings": publishing_request.facebook_page_mappings or {},
+                "updated_at": datetime.now()
+            }
+            await self.properties_collection.update_one(update_query, {"$set": published_fields})
+            invalidate_property(property_id)
+            await record_property_changes(
+                self.db, [(property_doc, {**property_doc, **published_fields})]
             )
             
             # Publish to each channel and language
@@ -189,16 +191,20 @@ class PropertyPublishingService:
             # Update property status
             update_query = self._get_property_query(property_id)
             update_query["agent_id"] = str(agent_id)  # Ensure agent_id is a string
-            await self.properties_collection.update_one(
+            draft_fields = {
+                "publishing_status": "draft",
+                "published_at": None,
+                "updated_at": datetime.now()
+            }
+            previous_doc = await self.properties_collection.find_one_and_update(
                 update_query,
-                {
-                    "$set": {
-                        "publishing_status": "draft",
-                        "published_at": None,
-                        "updated_at": datetime.now()
-                    }
-                }
+                {"$set": draft_fields}
             )
+            invalidate_property(property_id)
+            if previous_doc:
+                await record_property_changes(
+                    self.db, [(previous_doc, {**previous_doc, **draft_fields})]
+                )
             
             # Record unpublishing
             await self._record_publishing_history(
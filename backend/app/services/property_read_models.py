@@ -0,0 +1,38 @@
+"""
+Property Read Models
+====================
+Fan-out of property writes to the read models derived from listings: the
+similarity index, market aggregates, daily analytics rollups, the status
+transition log and the public agent snapshots.
+
+Every write path hands its (old_doc, new_doc) pairs to record_property_changes,
+with None for the missing side of an insert or delete. The writers are
+independent and each logs and swallows its own failures (the rebuild jobs
+repair drift), so they run concurrently.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services import analytics_rollups, market_aggregates
+from app.services.agent_public_snapshots import affected_agents, refresh_agent_snapshots
+from app.services.property_transitions import record_transitions
+from app.services.similarity_index import similarity_index
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+Change = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+async def record_property_changes(db: AsyncIOMotorDatabase, changes: List[Change]) -> None:
+    """Keep every derived read model in step with a set of property writes"""
+    for old_doc, new_doc in changes:
+        if new_doc is not None:
+            similarity_index.upsert(new_doc)
+        elif old_doc is not None:
+            similarity_index.remove(old_doc["_id"])
+    await asyncio.gather(
+        market_aggregates.apply_property_changes(db, changes),
+        analytics_rollups.apply_property_changes(db, changes),
+        record_transitions(db, changes),
+        refresh_agent_snapshots(db, affected_agents(changes)),
+    )
@@ -0,0 +1,117 @@
+"""
+Property Status Transitions
+===========================
+Append-only log of listing status and publishing_status changes, one small
+document per transition:
+
+    {property_id, agent_id, field, from, to, at}
+
+Property writes derive transitions from the (old_doc, new_doc) pairs they
+already hand to the derived read models. A move into "sold" also stamps
+sold_at on the listing, so days on market (published_at, else created_at, to
+sold_at) can be computed from the document alone: the daily rollups count it
+incrementally on write and the raw dashboard pipeline reads it, neither
+replaying the log per request. The backfill job seeds the log and sold_at
+for listings written before it existed.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "property_status_transitions"
+
+# Document fields whose changes are logged
+TRACKED_FIELDS = ("status", "publishing_status")
+
+SOLD_STATUS = "sold"
+
+Change = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def as_datetime(value: Any) -> Optional[datetime]:
+    """A stored timestamp as datetime (ISO strings are parsed), or None"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, datetime) else None
+
+
+def days_on_market(doc: Dict[str, Any]) -> Optional[float]:
+    """Days from listing (published_at, else created_at) to sale, for sold listings with sold_at"""
+    if _value(doc.get("status")) != SOLD_STATUS:
+        return None
+    sold_at = as_datetime(doc.get("sold_at"))
+    listed_at = as_datetime(doc.get("published_at")) or as_datetime(doc.get("created_at"))
+    if sold_at is None or listed_at is None:
+        return None
+    return max((sold_at - listed_at).total_seconds() / 86400, 0.0)
+
+
+def transition_stamps(old_doc: Optional[Dict[str, Any]], new_doc: Dict[str, Any],
+                      now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Fields to set on a listing for its status change: sold_at on entering and leaving sold"""
+    was_sold = old_doc is not None and _value(old_doc.get("status")) == SOLD_STATUS
+    is_sold = _value(new_doc.get("status")) == SOLD_STATUS
+    if is_sold and not was_sold:
+        return {"sold_at": now or datetime.utcnow()}
+    if was_sold and not is_sold and new_doc.get("sold_at") is not None:
+        return {"sold_at": None}
+    return {}
+
+
+def sold_at_expression(status: Any, now: datetime) -> Dict[str, Any]:
+    """
+    transition_stamps as an aggregation expression for a pipeline update
+    setting status, evaluated against the stored (pre-update) status.
+    """
+    was_sold = {"$eq": ["$status", SOLD_STATUS]}
+    if _value(status) == SOLD_STATUS:
+        return {"$cond": [was_sold, "$sold_at", now]}
+    return {"$cond": [was_sold, None, "$sold_at"]}
+
+
+def transitions(changes: Iterable[Change], at: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Transition log entries for property writes; creations log their initial values"""
+    at = at or datetime.utcnow()
+    entries = []
+    for old_doc, new_doc in changes:
+        if new_doc is None or new_doc.get("_id") is None:
+            continue
+        for field in TRACKED_FIELDS:
+            before = _value(old_doc.get(field)) if old_doc is not None else None
+            after = _value(new_doc.get(field))
+            if after is None or before == after:
+                continue
+            entries.append({
+                "property_id": str(new_doc["_id"]),
+                "agent_id": str(new_doc.get("agent_id") or ""),
+                "field": field,
+                "from": before,
+                "to": after,
+                "at": at,
+            })
+    return entries
+
+
+async def record_transitions(db: AsyncIOMotorDatabase, changes: Iterable[Change]) -> None:
+    """Append the status transitions of property writes to the log"""
+    entries = transitions(changes)
+    if not entries:
+        return
+    try:
+        await db[COLLECTION_NAME].insert_many(entries, ordered=False)
+    except Exception as e:
+        # Best effort: the listing fields, not the log, feed the metrics
+        logger.error(f"Failed to record property status transitions: {e}")
+
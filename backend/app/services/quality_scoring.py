@@ -0,0 +1,169 @@
+"""
+Listing Quality Scoring
+=======================
+Scores how complete and well-presented a listing is. Scores are persisted on
+the property document (quality_score plus a quality_breakdown) so inventory
+can be sorted and filtered by quality with an index.
+
+Scoring is vectorized over a batch of documents; creations score a batch of
+one. Updates compute the score inside the write with score_expression, an
+aggregation expression built from the same fields and thresholds.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Fields a complete listing fills in
+COMPLETENESS_FIELDS = (
+    "title", "description", "property_type", "price", "location",
+    "bedrooms", "bathrooms", "area_sqft", "features", "images",
+)
+
+# Fields read by the scorer; anything else cannot change the score
+SCORING_FIELDS = frozenset(COMPLETENESS_FIELDS) | {"market_analysis"}
+SCORING_PROJECTION = {field: 1 for field in SCORING_FIELDS}
+
+# Description length thresholds (characters) and their scores
+DESCRIPTION_THRESHOLDS = (200, 100, 50, 1)
+DESCRIPTION_SCORES = (90, 70, 50, 30)
+
+# Image count thresholds and their scores
+IMAGE_THRESHOLDS = (5, 2, 1)
+IMAGE_SCORES = (90, 70, 50)
+
+# Used when no market comparison is available for the listing
+DEFAULT_PRICING_SCORE = 75
+
+COMPONENTS = ("completeness", "description_quality", "image_quality", "pricing_accuracy")
+
+
+def _filled(value: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return bool(value.strip())
+    if isinstance(value, (list, dict)):
+        return bool(value)
+    return True
+
+
+def _price_position(doc: Dict[str, Any]) -> float:
+    analysis = doc.get("market_analysis") or {}
+    position = analysis.get("price_position_percentage") if isinstance(analysis, dict) else None
+    try:
+        return float(position)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _tiered(values: np.ndarray, thresholds, scores) -> np.ndarray:
+    return np.select([values >= t for t in thresholds], scores, default=0)
+
+
+def score_properties(docs: List[Dict[str, Any]]) -> List[Dict[str, int]]:
+    """Quality breakdown for each document, in order"""
+    if not docs:
+        return []
+
+    filled = np.array(
+        [[_filled(doc.get(field)) for field in COMPLETENESS_FIELDS] for doc in docs],
+        dtype=bool
+    )
+    description_lengths = np.array([len(doc.get("description") or "") for doc in docs])
+    image_counts = np.array([len(doc.get("images") or []) for doc in docs])
+    price_positions = np.array([_price_position(doc) for doc in docs], dtype=float)
+
+    completeness = filled.mean(axis=1) * 100
+    description_quality = _tiered(description_lengths, DESCRIPTION_THRESHOLDS, DESCRIPTION_SCORES)
+    image_quality = _tiered(image_counts, IMAGE_THRESHOLDS, IMAGE_SCORES)
+    # Listings priced close to comparable listings score highest
+    pricing_accuracy = np.where(
+        np.isnan(price_positions),
+        DEFAULT_PRICING_SCORE,
+        np.clip(100 - np.abs(np.nan_to_num(price_positions)), 0, 100)
+    )
+
+    components = np.column_stack(
+        [completeness, description_quality, image_quality, pricing_accuracy]
+    ).astype(int)
+    overall = components.mean(axis=1).astype(int)
+
+    return [
+        {"overall": int(total), **dict(zip(COMPONENTS, map(int, row)))}
+        for total, row in zip(overall, components)
+    ]
+
+
+def score_property(doc: Dict[str, Any]) -> Dict[str, int]:
+    """Quality breakdown of a single document"""
+    return score_properties([doc])[0]
+
+
+def _filled_expression(field: str) -> Dict[str, Any]:
+    value = f"${field}"
+    kind = {"$type": value}
+    return {"$switch": {
+        "branches": [
+            {"case": {"$in": [kind, ["missing", "null"]]}, "then": False},
+            {"case": {"$eq": [kind, "string"]},
+             "then": {"$gt": [{"$strLenCP": {"$trim": {"input": value}}}, 0]}},
+            {"case": {"$eq": [kind, "array"]}, "then": {"$gt": [{"$size": value}, 0]}},
+            {"case": {"$eq": [kind, "object"]}, "then": {"$ne": [value, {}]}},
+        ],
+        "default": True,
+    }}
+
+
+def _tiered_expression(value: Dict[str, Any], thresholds, scores) -> Dict[str, Any]:
+    return {"$switch": {
+        "branches": [
+            {"case": {"$gte": [value, threshold]}, "then": score}
+            for threshold, score in zip(thresholds, scores)
+        ],
+        "default": 0,
+    }}
+
+
+def score_expression() -> Dict[str, Any]:
+    """
+    quality_score and quality_breakdown as aggregation expressions over the
+    document, for a pipeline-style update; mirrors score_properties.
+    """
+    filled_count = {"$sum": [
+        {"$cond": [_filled_expression(field), 1, 0]} for field in COMPLETENESS_FIELDS
+    ]}
+    position = {"$convert": {
+        "input": "$market_analysis.price_position_percentage",
+        "to": "double",
+        "onError": None,
+        "onNull": None,
+    }}
+    components = {
+        "completeness": {"$toInt": {
+            "$multiply": [{"$divide": [filled_count, len(COMPLETENESS_FIELDS)]}, 100]
+        }},
+        "description_quality": _tiered_expression(
+            {"$strLenCP": {"$ifNull": ["$description", ""]}},
+            DESCRIPTION_THRESHOLDS, DESCRIPTION_SCORES
+        ),
+        "image_quality": _tiered_expression(
+            {"$size": {"$ifNull": ["$images", []]}}, IMAGE_THRESHOLDS, IMAGE_SCORES
+        ),
+        # NaN sorts below -inf in MongoDB comparisons
+        "pricing_accuracy": {"$cond": [
+            {"$or": [{"$eq": [position, None]}, {"$lt": [position, float("-inf")]}]},
+            DEFAULT_PRICING_SCORE,
+            {"$toInt": {"$min": [100, {"$max": [0, {"$subtract": [100, {"$abs": position}]}]}]}},
+        ]},
+    }
+    overall = {"$toInt": {"$divide": [{"$add": list(components.values())}, len(COMPONENTS)]}}
+    return {
+        "quality_score": overall,
+        "quality_breakdown": {"overall": overall, **components},
+    }
+
+
+def quality_fields(breakdown: Dict[str, int]) -> Dict[str, Any]:
+    """The persisted fields for a breakdown"""
+    return {"quality_score": breakdown["overall"], "quality_breakdown": breakdown}
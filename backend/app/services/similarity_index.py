@@ -0,0 +1,276 @@
+"""
+Similarity Index
+================
+In-memory NumPy feature matrix of active listings used to rank comparable
+properties without scanning the collection per request.
+
+Each row holds log price, log area, bedrooms, bathrooms and coordinates of
+one active property; property type and agent are stored as integer codes.
+The index is built lazily from MongoDB, kept current by upsert/remove calls
+from the property write paths, and rebuilt periodically so writes made by
+other worker processes are eventually picked up.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Feature columns
+LOG_PRICE, LOG_AREA, BEDROOMS, BATHROOMS, LATITUDE, LONGITUDE = range(6)
+FEATURE_COUNT = 6
+
+# Differences that count as "one unit" of dissimilarity
+PRICE_SCALE = 0.25  # ~28% price difference (log scale)
+AREA_SCALE = 0.25
+GEO_SCALE_KM = 5.0
+MAX_GEO_PENALTY = 4.0  # beyond ~10km distance stops dominating the score
+MISSING_PENALTY = 1.0  # used when either side lacks area or coordinates
+
+FEATURE_WEIGHTS = {
+    "price": 3.0,
+    "area": 2.0,
+    "bedrooms": 1.5,
+    "bathrooms": 0.5,
+    "property_type": 4.0,
+    "location": 2.0,
+}
+
+INDEX_PROJECTION = {
+    "price": 1, "area_sqft": 1, "bedrooms": 1, "bathrooms": 1,
+    "geo_location": 1, "property_type": 1, "agent_id": 1, "status": 1,
+}
+
+_KM_PER_DEGREE = 111.2
+
+
+def _log_or_nan(value: Any) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return math.log1p(value) if value > 0 else math.nan
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def property_features(doc: Dict[str, Any]) -> np.ndarray:
+    """Feature vector of a property document (missing values are NaN)"""
+    longitude = latitude = math.nan
+    geo = doc.get("geo_location") or {}
+    coordinates = geo.get("coordinates") if isinstance(geo, dict) else None
+    if coordinates and len(coordinates) == 2:
+        longitude, latitude = float(coordinates[0]), float(coordinates[1])
+
+    vector = np.empty(FEATURE_COUNT)
+    vector[LOG_PRICE] = _log_or_nan(doc.get("price"))
+    vector[LOG_AREA] = _log_or_nan(doc.get("area_sqft"))
+    vector[BEDROOMS] = _number(doc.get("bedrooms"))
+    vector[BATHROOMS] = _number(doc.get("bathrooms"))
+    vector[LATITUDE] = latitude
+    vector[LONGITUDE] = longitude
+    return vector
+
+
+def _document_id(doc: Dict[str, Any]) -> Optional[str]:
+    doc_id = doc.get("_id", doc.get("id"))
+    return str(doc_id) if doc_id is not None else None
+
+
+class SimilarityIndex:
+    """Dense feature matrix with swap-remove deletes and amortized growth"""
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._features = np.empty((initial_capacity, FEATURE_COUNT))
+        self._type_codes = np.empty(initial_capacity, dtype=np.int32)
+        self._agent_codes = np.empty(initial_capacity, dtype=np.int32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._type_vocab: Dict[str, int] = {}
+        self._agent_vocab: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        # Writes seen while a rebuild is reading the collection; replayed after the swap
+        self._pending: Optional[List[Tuple[str, Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def _code(vocab: Dict[str, int], value: Any) -> int:
+        key = str(value or "").lower()
+        if key not in vocab:
+            vocab[key] = len(vocab)
+        return vocab[key]
+
+    def _grow(self) -> None:
+        capacity = self._features.shape[0] * 2
+        self._features = np.resize(self._features, (capacity, FEATURE_COUNT))
+        self._type_codes = np.resize(self._type_codes, capacity)
+        self._agent_codes = np.resize(self._agent_codes, capacity)
+
+    def upsert(self, doc: Dict[str, Any]) -> None:
+        """Add or refresh a property; non-active or unpriced properties are removed"""
+        property_id = _document_id(doc)
+        if property_id is None:
+            return
+
+        vector = property_features(doc)
+        if doc.get("status", "active") != "active" or math.isnan(vector[LOG_PRICE]):
+            self.remove(property_id)
+            return
+        if self._pending is not None:
+            self._pending.append(("upsert", doc))
+
+        row = self._rows.get(property_id)
+        if row is None:
+            row = len(self._ids)
+            if row == self._features.shape[0]:
+                self._grow()
+            self._ids.append(property_id)
+            self._rows[property_id] = row
+
+        self._features[row] = vector
+        self._type_codes[row] = self._code(self._type_vocab, doc.get("property_type"))
+        self._agent_codes[row] = self._code(self._agent_vocab, doc.get("agent_id"))
+
+    def remove(self, property_id: Any) -> None:
+        """Drop a property by moving the last row into its slot"""
+        property_id = str(property_id)
+        if self._pending is not None:
+            self._pending.append(("remove", property_id))
+
+        row = self._rows.pop(property_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._features[row] = self._features[last]
+            self._type_codes[row] = self._type_codes[last]
+            self._agent_codes[row] = self._agent_codes[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._ids.pop()
+
+    def _scores(self, target: Dict[str, Any]) -> np.ndarray:
+        """Weighted dissimilarity of every indexed row to target (lower is closer)"""
+        size = len(self._ids)
+        features = self._features[:size]
+        vector = property_features(target)
+
+        price = ((features[:, LOG_PRICE] - vector[LOG_PRICE]) / PRICE_SCALE) ** 2
+        price = np.where(np.isnan(price), MISSING_PENALTY, price)
+        area = ((features[:, LOG_AREA] - vector[LOG_AREA]) / AREA_SCALE) ** 2
+        area = np.where(np.isnan(area), MISSING_PENALTY, area)
+        bedrooms = (features[:, BEDROOMS] - vector[BEDROOMS]) ** 2
+        bathrooms = (features[:, BATHROOMS] - vector[BATHROOMS]) ** 2
+
+        if math.isnan(vector[LATITUDE]):
+            location = np.full(size, MISSING_PENALTY)
+        else:
+            dy = (features[:, LATITUDE] - vector[LATITUDE]) * _KM_PER_DEGREE
+            dx = (
+                (features[:, LONGITUDE] - vector[LONGITUDE])
+                * _KM_PER_DEGREE * math.cos(math.radians(vector[LATITUDE]))
+            )
+            location = np.minimum((dx ** 2 + dy ** 2) / GEO_SCALE_KM ** 2, MAX_GEO_PENALTY)
+            location = np.where(np.isnan(location), MISSING_PENALTY, location)
+
+        type_code = self._type_vocab.get(str(target.get("property_type") or "").lower(), -1)
+        property_type = (self._type_codes[:size] != type_code).astype(float)
+
+        return (
+            FEATURE_WEIGHTS["price"] * price
+            + FEATURE_WEIGHTS["area"] * area
+            + FEATURE_WEIGHTS["bedrooms"] * bedrooms
+            + FEATURE_WEIGHTS["bathrooms"] * bathrooms
+            + FEATURE_WEIGHTS["property_type"] * property_type
+            + FEATURE_WEIGHTS["location"] * location
+        )
+
+    def query(
+        self,
+        target: Dict[str, Any],
+        limit: int = 10,
+        agent_id: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Return up to limit (property_id, score) pairs most similar to target,
+        closest first. The target itself is excluded; agent_id restricts
+        candidates to one agent's listings.
+        """
+        if limit <= 0 or not self._ids:
+            return []
+
+        scores = self._scores(target)
+        target_row = self._rows.get(_document_id(target) or "")
+        if target_row is not None:
+            scores[target_row] = np.inf
+        if agent_id is not None:
+            agent_code = self._agent_vocab.get(str(agent_id).lower(), -1)
+            scores[self._agent_codes[:len(self._ids)] != agent_code] = np.inf
+
+        candidates = int(np.count_nonzero(np.isfinite(scores)))
+        limit = min(limit, candidates)
+        if limit == 0:
+            return []
+
+        top = np.argpartition(scores, limit - 1)[:limit]
+        top = top[np.argsort(scores[top])]
+        return [(self._ids[row], float(scores[row])) for row in top]
+
+    async def ensure_fresh(self, collection) -> None:
+        """Build the index on first use and rebuild it once it is older than the refresh interval"""
+        max_age = settings.similarity_index_refresh_seconds
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < max_age:
+            return
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < max_age:
+                return
+            await self._rebuild(collection)
+
+    async def _rebuild(self, collection) -> None:
+        started = time.monotonic()
+        rebuilt = SimilarityIndex()
+        self._pending = []
+        try:
+            cursor = collection.find({"status": "active"}, INDEX_PROJECTION).batch_size(1000)
+            async for doc in cursor:
+                rebuilt.upsert(doc)
+            pending = self._pending
+        finally:
+            self._pending = None
+
+        for operation, payload in pending:
+            if operation == "upsert":
+                rebuilt.upsert(payload)
+            else:
+                rebuilt.remove(payload)
+
+        self._features = rebuilt._features
+        self._type_codes = rebuilt._type_codes
+        self._agent_codes = rebuilt._agent_codes
+        self._ids = rebuilt._ids
+        self._rows = rebuilt._rows
+        self._type_vocab = rebuilt._type_vocab
+        self._agent_vocab = rebuilt._agent_vocab
+        self._loaded_at = time.monotonic()
+        logger.info(
+            f"Similarity index rebuilt with {len(self)} properties "
+            f"in {(self._loaded_at - started) * 1000:.0f}ms"
+        )
+
+
+similarity_index = SimilarityIndex()
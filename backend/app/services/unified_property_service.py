@@ -6,23 +6,89 @@ This service consolidates all property-related business logic into a single,
 maintainable service that handles both standard and smart properties.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 import logging
+import re
 
 from app.schemas.unified_property import (
     PropertyCreate,
     PropertyUpdate,
     PropertyResponse,
-    PropertyDocument
+    PropertySummary,
+    NearbyPropertySummary,
+    SimilarPropertySummary,
+    PropertyPage,
+    FacetBucket,
+    FacetedSearchResult,
+    PropertyDocument,
+    BatchCreateItemResult,
+    BatchCreateReport
 )
 from app.core.exceptions import NotFoundError, ValidationError
-from app.services.analytics_service import analytics_service
+from app.services.analytics_service import AnalyticsService
+from app.services.property_cache import property_cache, invalidate_property
+from app.services.similarity_index import similarity_index
+from app.services.market_aggregates import (
+    aggregate_key,
+    get_market_insights,
+    load_aggregates,
+    market_insights,
+)
+from app.services.quality_scoring import (
+    SCORING_FIELDS,
+    quality_fields,
+    score_expression,
+    score_property,
+)
+from app.services.property_archive import delete_archived_property, find_archived_property
+from app.services.property_read_models import record_property_changes
+from app.services.property_transitions import sold_at_expression, transition_stamps
+from app.utils.geo import EARTH_RADIUS_KM, bounding_box_polygon, geo_point, get_gazetteer
+from app.utils.pagination import encode_cursor, keyset_filter, merge_filters
+from app.utils.serialization import construct_trusted
 
 logger = logging.getLogger(__name__)
 
+# Listing order shared by all paginated queries; backed by the
+# (agent_id, created_at, _id) compound indexes created in database_init.
+LIST_SORT = [("created_at", -1), ("_id", -1)]
+
+# Projections for list/search views: only PropertySummary fields and the
+# cover image are read from disk and sent over the wire.
+SUMMARY_FIELDS = tuple(field for field in PropertySummary.model_fields if field != "id")
+SUMMARY_PROJECTION = {**{field: 1 for field in SUMMARY_FIELDS}, "images": {"$slice": 1}}
+SUMMARY_PIPELINE_PROJECTION = {
+    **{field: 1 for field in SUMMARY_FIELDS},
+    "images": {"$slice": [{"$ifNull": ["$images", []]}, 1]},
+}
+
+# Price facet buckets (INR); the last bucket is open-ended
+PRICE_FACET_BOUNDARIES = [
+    0, 2500000, 5000000, 10000000, 20000000, 50000000, 100000000, float("inf")
+]
+
+# Maximum number of locality facet values returned
+LOCALITY_FACET_LIMIT = 20
+
+# Number of documents sent per insert_many call by batch_create_properties
+DEFAULT_BATCH_CHUNK_SIZE = 500
+
+# Fields available to the inventory export and the default column set
+EXPORT_FIELDS = tuple(PropertyResponse.model_fields)
+DEFAULT_EXPORT_FIELDS = (
+    "id", "title", "description", "property_type", "price", "location",
+    "bedrooms", "bathrooms", "area_sqft", "features", "amenities", "status",
+    "publishing_status", "published_at", "images", "created_at", "updated_at",
+)
+
+# Documents fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = 500
+
 class UnifiedPropertyService:
     """Unified service for all property operations"""
     
@@ -32,11 +98,106 @@ class UnifiedPropertyService:
         self.logger = logging.getLogger(__name__)
     
     def _convert_doc_to_response(self, doc: dict) -> PropertyResponse:
-        """Convert MongoDB document to PropertyResponse, handling ObjectId conversion"""
+        """
+        Convert MongoDB document to PropertyResponse, handling ObjectId conversion.
+        Documents were validated on write, so they are constructed without re-validation.
+        """
         if doc and '_id' in doc:
             doc['id'] = str(doc['_id'])
             doc.pop('_id', None)  # Remove the ObjectId field
-        return PropertyResponse(**doc)
+        return construct_trusted(PropertyResponse, doc)
+    
+    def _convert_doc_to_summary(self, doc: dict) -> PropertySummary:
+        """Convert a projected MongoDB document to PropertySummary (trusted construction)"""
+        if doc and '_id' in doc:
+            doc['id'] = str(doc['_id'])
+            doc.pop('_id', None)
+        return construct_trusted(PropertySummary, doc)
+    
+    async def _find_page(
+        self,
+        query: Dict[str, Any],
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> PropertyPage:
+        """
+        Run a paginated listing query ordered by (created_at, _id) descending.
+        
+        When a cursor is given the page starts right after it using an index
+        range scan and skip is ignored; otherwise legacy skip/limit paging applies.
+        """
+        if limit <= 0:
+            return PropertyPage(items=[], next_cursor=None)
+        
+        page_query = merge_filters(query, keyset_filter("created_at", cursor))
+        db_cursor = self.collection.find(page_query, SUMMARY_PROJECTION).sort(LIST_SORT)
+        if skip and not cursor:
+            db_cursor = db_cursor.skip(skip)
+        docs = await db_cursor.limit(limit).to_list(length=limit)
+        
+        next_cursor = None
+        if len(docs) == limit:
+            last = docs[-1]
+            next_cursor = encode_cursor(last.get("created_at"), last["_id"])
+        
+        return PropertyPage(
+            items=[self._convert_doc_to_summary(doc) for doc in docs],
+            next_cursor=next_cursor
+        )
+    
+    async def _prepare_property_document(
+        self,
+        property_data: PropertyCreate,
+        user_id: str,
+        now: Optional[datetime] = None,
+        market_aggregates: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> PropertyDocument:
+        """
+        Build a ready-to-insert PropertyDocument, including optional AI content
+        and market insights. Shared by single and bulk creation; bulk creation
+        passes the locality aggregates it prefetched for the chunk.
+        """
+        now = now or datetime.utcnow()
+        
+        property_dict = property_data.model_dump()
+        # Remove agent_id from property data to avoid duplicate keyword argument
+        property_dict.pop('agent_id', None)
+        
+        property_doc = PropertyDocument(
+            **property_dict,
+            agent_id=str(user_id),  # Convert ObjectId to string for compatibility
+            created_at=now,
+            updated_at=now
+        )
+        
+        # Geocode from the free-text location against the local gazetteer
+        if property_doc.geo_location is None:
+            property_doc.geo_location = get_gazetteer().lookup(property_doc.location)
+        
+        # Generate AI content if requested
+        if property_data.ai_generate:
+            property_doc.ai_content = await self._generate_ai_content(property_doc)
+        
+        # Generate market insights if requested
+        if property_data.market_analysis:
+            if market_aggregates is not None:
+                key = aggregate_key(property_doc.location, property_doc.property_type)
+                property_doc.market_analysis = market_insights(
+                    market_aggregates.get(key), property_doc.model_dump()
+                )
+            else:
+                property_doc.market_analysis = await self._generate_market_insights(property_doc)
+        
+        document = property_doc.model_dump()
+        breakdown = score_property(document)
+        property_doc.quality_score = breakdown["overall"]
+        property_doc.quality_breakdown = breakdown
+        
+        # Listings created as sold are stamped like ones that move into sold
+        property_doc.sold_at = transition_stamps(None, document, now).get("sold_at")
+        
+        return property_doc
     
     async def create_property(
         self,
@@ -52,31 +213,13 @@ class UnifiedPropertyService:
         try:
             self.logger.info(f"Creating property for user {user_id}")
             
-            # Create property document
-            property_dict = property_data.model_dump()
-            # Remove agent_id from property data to avoid duplicate keyword argument
-            property_dict.pop('agent_id', None)
-            
-            property_doc = PropertyDocument(
-                **property_dict,
-                agent_id=str(user_id),  # Convert ObjectId to string for compatibility
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            
-            # Generate AI content if requested
-            if property_data.ai_generate:
-                ai_content = await self._generate_ai_content(property_doc)
-                property_doc.ai_content = ai_content
-            
-            # Generate market insights if requested
-            if property_data.market_analysis:
-                market_insights = await self._generate_market_insights(property_doc)
-                property_doc.market_analysis = market_insights
+            property_doc = await self._prepare_property_document(property_data, user_id)
             
             # Insert into database
-            result = await self.collection.insert_one(property_doc.model_dump(by_alias=True))
+            document = property_doc.model_dump(by_alias=True)
+            result = await self.collection.insert_one(document)
             property_doc.id = result.inserted_id
+            await self._record_property_changes([(None, document)])
             
             self.logger.info(f"Property created successfully with ID: {property_doc.id}")
             
@@ -89,24 +232,50 @@ class UnifiedPropertyService:
             self.logger.error(f"Error creating property: {e}")
             raise ValidationError(f"Failed to create property: {str(e)}")
     
-    async def get_property(
+    async def get_property_document(
         self,
         property_id: str,
         user_id: str
-    ) -> Optional[PropertyResponse]:
+    ) -> Optional[Dict[str, Any]]:
         """
-        Get a property by ID for the specified user.
+        Get the stored document of a property owned by the specified user.
+        
+        Reads through the process-wide property cache; a cached document
+        owned by another agent is treated as not found, like the DB query.
+        Listings moved to the archive tier are found there on a live miss.
+        The returned dict is a copy and may be modified by the caller.
         """
         try:
             obj_id = ObjectId(property_id)
         except:
             return None
         
-        doc = await self.collection.find_one({
-            "_id": obj_id,
-            "agent_id": str(user_id)
-        })
+        cache_key = str(obj_id)
+        cached = property_cache.get(cache_key)
+        if cached is not None:
+            if cached.get("agent_id") != str(user_id):
+                return None
+            return dict(cached)
+        
+        query = {"_id": obj_id, "agent_id": str(user_id)}
+        doc = await self.collection.find_one(query)
+        if not doc:
+            doc = await find_archived_property(self.db, query)
         
+        if doc:
+            property_cache.set(cache_key, doc)
+            return dict(doc)
+        return None
+    
+    async def get_property(
+        self,
+        property_id: str,
+        user_id: str
+    ) -> Optional[PropertyResponse]:
+        """
+        Get a property by ID for the specified user.
+        """
+        doc = await self.get_property_document(property_id, user_id)
         if doc:
             return self._convert_doc_to_response(doc)
         return None
@@ -116,27 +285,28 @@ class UnifiedPropertyService:
         user_id: str,
         skip: int = 0,
         limit: int = 100,
-        publishing_status: Optional[str] = None
-    ) -> List[PropertyResponse]:
+        publishing_status: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> PropertyPage:
         """
-        Get all properties for a user with pagination.
+        Get all properties for a user with pagination, newest first.
         Optionally filter by publishing status.
+        
+        Pass the next_cursor of the previous page as cursor for keyset paging.
         """
         query = {"agent_id": str(user_id)}
         if publishing_status:
             query["publishing_status"] = publishing_status
-            
-        cursor = self.collection.find(query).skip(skip).limit(limit)
-        docs = await cursor.to_list(length=None)
         
-        return [self._convert_doc_to_response(doc) for doc in docs]
+        return await self._find_page(query, skip=skip, limit=limit, cursor=cursor)
     
     async def get_published_properties_by_agent(
         self,
         agent_id: str,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[PropertyResponse]:
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> PropertyPage:
         """
         Get published properties for an agent (for public website display).
         Only returns properties with publishing_status = 'published'.
@@ -146,10 +316,41 @@ class UnifiedPropertyService:
             "publishing_status": "published"
         }
         
-        cursor = self.collection.find(query).skip(skip).limit(limit)
-        docs = await cursor.to_list(length=None)
+        return await self._find_page(query, skip=skip, limit=limit, cursor=cursor)
+    
+    def resolve_export_fields(self, fields: Optional[List[str]] = None) -> List[str]:
+        """Validate a requested export column list, falling back to the defaults"""
+        if not fields:
+            return list(DEFAULT_EXPORT_FIELDS)
+        unknown = [field for field in fields if field not in EXPORT_FIELDS]
+        if unknown:
+            raise ValidationError(f"Unknown export fields: {', '.join(unknown)}")
+        return list(dict.fromkeys(fields))
+    
+    async def iter_properties_for_export(
+        self,
+        user_id: str,
+        fields: List[str],
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every property of a user as a plain dict restricted to fields,
+        newest first. Documents are pulled from the server batch_size at a
+        time, so memory stays bounded regardless of inventory size.
+        """
+        projection = {field: 1 for field in fields if field != "id"}
+        if "id" not in fields:
+            projection["_id"] = 0
+        
+        db_cursor = self.collection.find(
+            {"agent_id": str(user_id)},
+            projection or {"_id": 1}
+        ).sort(LIST_SORT).batch_size(batch_size)
         
-        return [self._convert_doc_to_response(doc) for doc in docs]
+        async for doc in db_cursor:
+            if "_id" in doc:
+                doc["id"] = str(doc.pop("_id"))
+            yield doc
     
     async def update_property(
         self,
@@ -158,35 +359,54 @@ class UnifiedPropertyService:
         user_id: str
     ) -> Optional[PropertyResponse]:
         """
-        Update a property.
+        Update a property. Archived listings are read-only and return None,
+        like a missing one.
         """
         try:
             obj_id = ObjectId(property_id)
         except:
             return None
         
-        # Check if property exists and belongs to user
-        existing_prop = await self.collection.find_one({
-            "_id": obj_id,
-            "agent_id": user_id
-        })
-        
-        if not existing_prop:
-            return None
-        
         # Prepare update data
         update_data = property_data.model_dump(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
+        if update_data.get("location") and "geo_location" not in update_data:
+            update_data["geo_location"] = get_gazetteer().lookup(update_data["location"])
+        
+        rescore = bool(SCORING_FIELDS.intersection(update_data))
+        update: Union[Dict[str, Any], List[Dict[str, Any]]] = {"$set": update_data}
+        if rescore or "status" in update_data:
+            # The sold_at stamp and the quality score depend on the stored
+            # document, so they are computed by the server inside the write.
+            assigned = {field: {"$literal": value} for field, value in update_data.items()}
+            if "status" in update_data:
+                assigned["sold_at"] = sold_at_expression(
+                    update_data["status"], update_data["updated_at"]
+                )
+            update = [{"$set": assigned}]
+            if rescore:
+                update.append({"$set": score_expression()})
         
-        # Update in database
-        result = await self.collection.update_one(
-            {"_id": obj_id, "agent_id": user_id},
-            {"$set": update_data}
+        # Ownership check and write in a single atomic update. The previous
+        # version is returned so derived aggregates can apply the difference;
+        # the new one is rebuilt from it with the same rules the server applied.
+        previous_doc = await self.collection.find_one_and_update(
+            {"_id": obj_id, "agent_id": str(user_id)},
+            update,
+            return_document=ReturnDocument.BEFORE
         )
+        if not previous_doc:
+            invalidate_property(obj_id)
+            return None
         
-        if result.modified_count == 1:
-            return await self.get_property(property_id, user_id)
-        return None
+        updated_doc = {**previous_doc, **update_data}
+        updated_doc.update(transition_stamps(previous_doc, updated_doc, update_data["updated_at"]))
+        if rescore:
+            updated_doc.update(quality_fields(score_property(updated_doc)))
+        
+        property_cache.set(str(obj_id), updated_doc)
+        await self._record_property_changes([(previous_doc, updated_doc)])
+        return self._convert_doc_to_response(dict(updated_doc))
     
     async def delete_property(
         self,
@@ -194,19 +414,90 @@ class UnifiedPropertyService:
         user_id: str
     ) -> bool:
         """
-        Delete a property.
+        Delete a property. Listings moved to the archive tier are deleted
+        there on a live miss; they are already out of the derived read models.
         """
         try:
             obj_id = ObjectId(property_id)
         except:
             return False
         
-        result = await self.collection.delete_one({
-            "_id": obj_id,
-            "agent_id": user_id
-        })
+        query = {"_id": obj_id, "agent_id": str(user_id)}
+        deleted_doc = await self.collection.find_one_and_delete(query)
+        invalidate_property(obj_id)
+        if deleted_doc:
+            await self._record_property_changes([(deleted_doc, None)])
+            return True
         
-        return result.deleted_count == 1
+        return await delete_archived_property(self.db, query) is not None
+    
+    async def _record_property_changes(
+        self,
+        changes: List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]
+    ) -> None:
+        """
+        Keep derived read models in step with property writes. Each change is
+        (old_doc, new_doc) with None for the missing side of an insert or delete.
+        """
+        await record_property_changes(self.db, changes)
+    
+    async def get_lowest_quality_properties(
+        self,
+        user_id: str,
+        limit: int = 20,
+        max_score: Optional[int] = None
+    ) -> List[PropertySummary]:
+        """
+        Get the user's listings with the lowest persisted quality score,
+        worst first. Served by the (agent_id, quality_score) index.
+        """
+        score_filter: Dict[str, Any] = {"$ne": None}
+        if max_score is not None:
+            score_filter["$lte"] = max_score
+        
+        docs = await self.collection.find(
+            {"agent_id": str(user_id), "quality_score": score_filter},
+            SUMMARY_PROJECTION
+        ).sort([("quality_score", 1), ("_id", 1)]).limit(limit).to_list(length=limit)
+        
+        return [self._convert_doc_to_summary(doc) for doc in docs]
+    
+    async def find_similar_properties(
+        self,
+        property_id: str,
+        user_id: str,
+        limit: int = 10
+    ) -> Optional[List[SimilarPropertySummary]]:
+        """
+        Rank the user's other active listings by similarity to a property.
+        
+        Scoring runs against the in-memory similarity index; only the top
+        matches are read from MongoDB. Returns None if the property is not found.
+        """
+        target = await self.get_property(property_id, user_id)
+        if target is None:
+            return None
+        
+        await similarity_index.ensure_fresh(self.collection)
+        matches = similarity_index.query(target.model_dump(), limit=limit, agent_id=str(user_id))
+        if not matches:
+            return []
+        
+        docs = await self.collection.find(
+            {"_id": {"$in": [ObjectId(match_id) for match_id, _ in matches]}},
+            SUMMARY_PROJECTION
+        ).to_list(length=len(matches))
+        docs_by_id = {str(doc["_id"]): doc for doc in docs}
+        
+        results = []
+        for match_id, score in matches:
+            doc = docs_by_id.get(match_id)
+            if doc is None:
+                continue
+            doc["id"] = str(doc.pop("_id"))
+            doc["similarity"] = round(1.0 / (1.0 + score), 4)
+            results.append(construct_trusted(SimilarPropertySummary, doc))
+        return results
     
     async def generate_ai_suggestions(
         self,
@@ -247,8 +538,8 @@ class UnifiedPropertyService:
         if not property_data:
             raise NotFoundError("Property not found")
         
-        # Generate market insights based on property data
-        insights = await self._generate_market_insights(property_data)
+        # Generate market insights from comparables, not counting the property itself
+        insights = await self._generate_market_insights(property_data, exclude_self=True)
         
         # Update property with insights
         await self.update_property(
@@ -274,14 +565,15 @@ class UnifiedPropertyService:
         if not property_data:
             raise NotFoundError("Property not found")
         
-        # Get analytics from analytics service
-        property_analytics = await analytics_service.get_property_analytics(
+        # Get engagement analytics from the analytics service
+        property_analytics = await AnalyticsService(self.db).get_property_analytics(
             property_id=str(property_data.id),
             days=30
         )
         
         analytics = {
             "views": property_analytics["metrics"].get("views", 0),
+            "unique_visitors": property_analytics["metrics"].get("unique_visitors", 0),
             "inquiries": property_analytics["metrics"].get("inquiries", 0),
             "shares": property_analytics["metrics"].get("shares", 0),
             "favorites": property_analytics["metrics"].get("favorites", 0),
@@ -290,55 +582,126 @@ class UnifiedPropertyService:
             "ai_generated": bool(property_data.ai_content),
             "market_insights": bool(property_data.market_analysis),
             "quality_score": self._calculate_quality_score(property_data),
-            "engagement_rate": property_analytics.get("engagement_rate", 0.0)
+            "engagement_rate": property_analytics.get("engagement_rate", 0.0),
+            "engagement_trend": property_analytics.get("trend")
         }
         
         return analytics
     
     async def batch_create_properties(
         self,
-        properties_data: List[PropertyCreate],
-        user_id: str
-    ) -> List[PropertyResponse]:
+        properties_data: List[Union[PropertyCreate, Dict[str, Any]]],
+        user_id: str,
+        chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE
+    ) -> BatchCreateReport:
         """
-        Create multiple properties in a batch operation.
+        Create multiple properties in a bulk operation.
+        
+        All items are validated in a single pass first; valid items are then
+        prepared and written with unordered insert_many in chunks of
+        chunk_size, with the market aggregates a chunk needs loaded in one
+        query. The report contains one entry per input item, with the new id
+        or the error.
         """
-        results = []
+        chunk_size = max(1, chunk_size)
+        now = datetime.utcnow()
+        results: List[BatchCreateItemResult] = []
+        valid: List[Tuple[int, PropertyCreate]] = []
         
-        for property_data in properties_data:
+        for index, item in enumerate(properties_data):
             try:
-                result = await self.create_property(property_data, user_id)
-                results.append(result)
+                if not isinstance(item, PropertyCreate):
+                    item = PropertyCreate(**item)
+                valid.append((index, item))
             except Exception as e:
-                self.logger.error(f"Error creating property in batch: {e}")
-                # Continue with other properties
-                continue
+                results.append(BatchCreateItemResult(index=index, error=str(e)))
+        
+        for start in range(0, len(valid), chunk_size):
+            items = valid[start:start + chunk_size]
+            market_aggregates = await load_aggregates(self.db, [
+                {"location": data.location, "property_type": data.property_type}
+                for _, data in items if data.market_analysis
+            ])
+            
+            chunk: List[Tuple[int, Dict[str, Any]]] = []
+            for index, property_data in items:
+                try:
+                    property_doc = await self._prepare_property_document(
+                        property_data, user_id, now, market_aggregates
+                    )
+                    chunk.append((index, property_doc.model_dump(by_alias=True)))
+                except Exception as e:
+                    results.append(BatchCreateItemResult(index=index, error=str(e)))
+            if chunk:
+                results.extend(await self._insert_chunk(chunk))
+        
+        results.sort(key=lambda r: r.index)
+        created_count = sum(1 for r in results if r.id)
+        self.logger.info(
+            f"Batch create for user {user_id}: {created_count} created, "
+            f"{len(results) - created_count} failed"
+        )
+        
+        return BatchCreateReport(
+            created_count=created_count,
+            failed_count=len(results) - created_count,
+            results=results
+        )
+    
+    async def _insert_chunk(
+        self,
+        chunk: List[Tuple[int, Dict[str, Any]]]
+    ) -> List[BatchCreateItemResult]:
+        """
+        Insert one chunk with a single unordered insert_many and map any write
+        errors back to the original item indexes.
+        """
+        documents = [doc for _, doc in chunk]
+        write_errors: Dict[int, str] = {}
+        
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                write_errors[error["index"]] = error.get("errmsg", "Write failed")
+        except Exception as e:
+            self.logger.error(f"Error inserting property chunk: {e}")
+            return [BatchCreateItemResult(index=index, error=str(e)) for index, _ in chunk]
         
+        results = []
+        created = []
+        for position, (index, doc) in enumerate(chunk):
+            if position in write_errors:
+                results.append(BatchCreateItemResult(index=index, error=write_errors[position]))
+            else:
+                created.append((None, doc))
+                results.append(BatchCreateItemResult(index=index, id=str(doc["_id"])))
+        await self._record_property_changes(created)
         return results
     
-    async def search_properties(
+    def _build_search_filter(
         self,
-        query: str,
         property_type: Optional[str] = None,
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
         location: Optional[str] = None,
         user_id: Optional[str] = None,
-        skip: int = 0,
-        limit: int = 20
-    ) -> List[PropertyResponse]:
+        bedrooms: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        Search properties with advanced filtering.
+        Build the structured (non-text) part of a property search filter.
         """
-        # Build search query
         search_query = {}
         
         if user_id:
-            search_query["agent_id"] = user_id
+            search_query["agent_id"] = str(user_id)
         
         if property_type:
             search_query["property_type"] = property_type
         
+        if bedrooms is not None:
+            search_query["bedrooms"] = bedrooms
+        
         if min_price is not None or max_price is not None:
             price_query = {}
             if min_price is not None:
@@ -348,24 +711,279 @@ class UnifiedPropertyService:
             search_query["price"] = price_query
         
         if location:
+            pattern = re.escape(location)
             search_query["$or"] = [
-                {"location": {"$regex": location, "$options": "i"}},
-                {"address": {"$regex": location, "$options": "i"}}
+                {"location": {"$regex": pattern, "$options": "i"}},
+                {"address": {"$regex": pattern, "$options": "i"}}
             ]
         
-        if query:
-            search_query["$or"] = [
-                {"title": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"location": {"$regex": query, "$options": "i"}},
-                {"address": {"$regex": query, "$options": "i"}}
+        return search_query
+    
+    async def search_properties(
+        self,
+        query: str,
+        property_type: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        location: Optional[str] = None,
+        user_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> PropertyPage:
+        """
+        Search properties with advanced filtering.
+        
+        Free-text queries are served by the property_text_search index and
+        ranked by relevance; type, price and location filters are applied on
+        top of the text match. Without a query results are listed newest first.
+        """
+        search_query = self._build_search_filter(
+            property_type=property_type,
+            min_price=min_price,
+            max_price=max_price,
+            location=location,
+            user_id=user_id
+        )
+        
+        if not query or not query.strip():
+            return await self._find_page(search_query, skip=skip, limit=limit, cursor=cursor)
+        
+        return await self._text_search_page(
+            query, search_query, skip=skip, limit=limit, cursor=cursor
+        )
+    
+    async def _text_search_page(
+        self,
+        query: str,
+        filters: Dict[str, Any],
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> PropertyPage:
+        """
+        Run a relevance-ranked text search page ordered by (text score, _id).
+        """
+        if limit <= 0:
+            return PropertyPage(items=[], next_cursor=None)
+        
+        pipeline = [
+            {"$match": {**filters, "$text": {"$search": query}}},
+            {"$addFields": {"_score": {"$meta": "textScore"}}},
+        ]
+        if cursor:
+            pipeline.append({"$match": keyset_filter("_score", cursor)})
+        pipeline.append({"$sort": {"_score": -1, "_id": -1}})
+        if skip and not cursor:
+            pipeline.append({"$skip": skip})
+        pipeline.append({"$limit": limit})
+        pipeline.append({"$project": {**SUMMARY_PIPELINE_PROJECTION, "_score": 1}})
+        
+        docs = await self.collection.aggregate(pipeline).to_list(length=limit)
+        
+        next_cursor = None
+        if len(docs) == limit:
+            last = docs[-1]
+            next_cursor = encode_cursor(last["_score"], last["_id"])
+        
+        items = []
+        for doc in docs:
+            doc.pop("_score", None)
+            items.append(self._convert_doc_to_summary(doc))
+        return PropertyPage(items=items, next_cursor=next_cursor)
+    
+    async def faceted_search(
+        self,
+        query: Optional[str] = None,
+        property_type: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        location: Optional[str] = None,
+        bedrooms: Optional[int] = None,
+        user_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> FacetedSearchResult:
+        """
+        Search properties and compute facet counts in a single aggregation.
+        
+        One $facet pipeline returns the hit page, the total, and counts per
+        property_type, bedrooms, price bucket and locality, all under the same
+        filter, so refining by a facet costs one database call.
+        """
+        match = self._build_search_filter(
+            property_type=property_type,
+            min_price=min_price,
+            max_price=max_price,
+            location=location,
+            user_id=user_id,
+            bedrooms=bedrooms
+        )
+        
+        pipeline: List[Dict[str, Any]] = []
+        if query and query.strip():
+            match["$text"] = {"$search": query}
+            pipeline.append({"$match": match})
+            pipeline.append({"$addFields": {"_score": {"$meta": "textScore"}}})
+            hits_sort = {"_score": -1, "_id": -1}
+        else:
+            pipeline.append({"$match": match})
+            hits_sort = dict(LIST_SORT)
+        
+        pipeline.append({"$facet": {
+            "hits": [
+                {"$sort": hits_sort},
+                {"$skip": max(0, skip)},
+                {"$limit": max(1, limit)},
+                {"$project": SUMMARY_PIPELINE_PROJECTION},
+            ],
+            "total": [{"$count": "count"}],
+            "property_type": [
+                {"$group": {"_id": "$property_type", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ],
+            "bedrooms": [
+                {"$group": {"_id": "$bedrooms", "count": {"$sum": 1}}},
+                {"$sort": {"_id": 1}},
+            ],
+            "price": [
+                {"$bucket": {
+                    "groupBy": "$price",
+                    "boundaries": PRICE_FACET_BOUNDARIES,
+                    "default": "other",
+                    "output": {"count": {"$sum": 1}},
+                }},
+            ],
+            "locality": [
+                {"$group": {
+                    "_id": {"$trim": {"input": {
+                        "$arrayElemAt": [{"$split": [{"$ifNull": ["$location", ""]}, ","]}, 0]
+                    }}},
+                    "count": {"$sum": 1},
+                }},
+                {"$sort": {"count": -1}},
+                {"$limit": LOCALITY_FACET_LIMIT},
+            ],
+        }})
+        
+        results = await self.collection.aggregate(pipeline).to_list(length=1)
+        facet_doc = results[0] if results else {}
+        
+        upper_bounds = {
+            lower: (upper if upper != float("inf") else None)
+            for lower, upper in zip(PRICE_FACET_BOUNDARIES, PRICE_FACET_BOUNDARIES[1:])
+        }
+        facets = {
+            name: [
+                FacetBucket(value=bucket["_id"], count=bucket["count"])
+                for bucket in facet_doc.get(name, [])
             ]
+            for name in ("property_type", "bedrooms", "locality")
+        }
+        facets["price"] = [
+            FacetBucket(
+                value=bucket["_id"],
+                count=bucket["count"],
+                max_value=upper_bounds.get(bucket["_id"])
+            )
+            for bucket in facet_doc.get("price", [])
+        ]
+        
+        total = facet_doc.get("total") or [{"count": 0}]
+        return FacetedSearchResult(
+            items=[self._convert_doc_to_summary(doc) for doc in facet_doc.get("hits", [])],
+            total=total[0]["count"],
+            facets=facets
+        )
+    
+    async def find_properties_within_radius(
+        self,
+        longitude: float,
+        latitude: float,
+        radius_km: float,
+        user_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[PropertySummary]:
+        """
+        Find properties within radius_km of a point (2dsphere $centerSphere).
+        """
+        query = {
+            "geo_location": {
+                "$geoWithin": {
+                    "$centerSphere": [[longitude, latitude], radius_km / EARTH_RADIUS_KM]
+                }
+            }
+        }
+        if user_id:
+            query["agent_id"] = str(user_id)
         
-        # Execute search
-        cursor = self.collection.find(search_query).skip(skip).limit(limit)
-        docs = await cursor.to_list(length=None)
+        cursor = self.collection.find(query, SUMMARY_PROJECTION).limit(limit)
+        docs = await cursor.to_list(length=limit)
+        return [self._convert_doc_to_summary(doc) for doc in docs]
+    
+    async def find_properties_in_bounding_box(
+        self,
+        min_longitude: float,
+        min_latitude: float,
+        max_longitude: float,
+        max_latitude: float,
+        user_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[PropertySummary]:
+        """
+        Find properties inside a longitude/latitude box (e.g. the visible map area).
+        """
+        query = {
+            "geo_location": {
+                "$geoWithin": {
+                    "$geometry": bounding_box_polygon(
+                        min_longitude, min_latitude, max_longitude, max_latitude
+                    )
+                }
+            }
+        }
+        if user_id:
+            query["agent_id"] = str(user_id)
         
-        return [self._convert_doc_to_response(doc) for doc in docs]
+        cursor = self.collection.find(query, SUMMARY_PROJECTION).limit(limit)
+        docs = await cursor.to_list(length=limit)
+        return [self._convert_doc_to_summary(doc) for doc in docs]
+    
+    async def find_nearest_properties(
+        self,
+        longitude: float,
+        latitude: float,
+        limit: int = 10,
+        max_distance_km: Optional[float] = None,
+        user_id: Optional[str] = None
+    ) -> List[NearbyPropertySummary]:
+        """
+        Find the nearest properties to a point, closest first, with distances.
+        """
+        geo_near: Dict[str, Any] = {
+            "near": geo_point(longitude, latitude),
+            "distanceField": "distance_m",
+            "key": "geo_location",
+            "spherical": True,
+        }
+        if max_distance_km is not None:
+            geo_near["maxDistance"] = max_distance_km * 1000
+        if user_id:
+            geo_near["query"] = {"agent_id": str(user_id)}
+        
+        pipeline = [
+            {"$geoNear": geo_near},
+            {"$limit": limit},
+            {"$project": {**SUMMARY_PIPELINE_PROJECTION, "distance_m": 1}},
+        ]
+        docs = await self.collection.aggregate(pipeline).to_list(length=limit)
+        
+        results = []
+        for doc in docs:
+            doc["distance_km"] = round(doc.pop("distance_m", 0.0) / 1000, 3)
+            doc["id"] = str(doc.pop("_id"))
+            results.append(construct_trusted(NearbyPropertySummary, doc))
+        return results
     
     async def _generate_ai_content(self, property_doc: PropertyDocument) -> str:
         """
@@ -391,35 +1009,30 @@ class UnifiedPropertyService:
             self.logger.error(f"Error generating AI content: {e}")
             return f"Beautiful {property_doc.property_type} at {property_doc.location} for ₹{property_doc.price:,.0f}."
     
-    async def _generate_market_insights(self, property_doc: PropertyDocument) -> Dict[str, Any]:
+    async def _generate_market_insights(
+        self,
+        property_doc: Union[PropertyDocument, PropertyResponse],
+        exclude_self: bool = False
+    ) -> Dict[str, Any]:
         """
-        Generate market insights for a property.
+        Generate market insights for a property from the precomputed
+        per-locality aggregates of comparable active listings.
         """
         try:
-            # Simple market insights generation (replace with real market data service)
-            insights = {
-                "average_price": property_doc.price * 0.95,  # 5% below asking
-                "price_range": [property_doc.price * 0.85, property_doc.price * 1.15],
-                "market_trend": "rising",
-                "competitor_count": 12,
-                "trend_percentage": 8.5,
-                "location_score": 85,
-                "amenities_score": 78,
-                "generated_at": datetime.utcnow().isoformat()
-            }
-            
-            return insights
+            return await get_market_insights(
+                self.db, property_doc.model_dump(), exclude_self=exclude_self
+            )
             
         except Exception as e:
             self.logger.error(f"Error generating market insights: {e}")
             return {
-                "average_price": property_doc.price,
-                "price_range": [property_doc.price * 0.9, property_doc.price * 1.1],
-                "market_trend": "stable",
                 "competitor_count": 0,
-                "trend_percentage": 0,
-                "location_score": 50,
-                "amenities_score": 50,
+                "average_price": None,
+                "price_range": None,
+                "price_per_sqft": None,
+                "price_position_percentage": None,
+                "market_trend": "stable",
+                "trend_percentage": 0.0,
                 "generated_at": datetime.utcnow().isoformat()
             }
     
@@ -473,56 +1086,8 @@ class UnifiedPropertyService:
     
     def _calculate_quality_score(self, property_data: PropertyResponse) -> Dict[str, int]:
         """
-        Calculate quality score for a property.
+        Get the quality breakdown for a property, preferring the persisted one.
         """
-        try:
-            score = {
-                "overall": 0,
-                "completeness": 0,
-                "description_quality": 0,
-                "image_quality": 0,
-                "pricing_accuracy": 0
-            }
-            
-            # Calculate completeness score
-            fields = [
-                property_data.title, property_data.description, property_data.location,
-                property_data.address, property_data.property_type, property_data.price
-            ]
-            completed_fields = sum(1 for field in fields if field and str(field).strip())
-            score["completeness"] = int((completed_fields / len(fields)) * 100)
-            
-            # Calculate description quality
-            if property_data.description:
-                desc_length = len(property_data.description)
-                if desc_length >= 200:
-                    score["description_quality"] = 90
-                elif desc_length >= 100:
-                    score["description_quality"] = 70
-                elif desc_length >= 50:
-                    score["description_quality"] = 50
-                else:
-                    score["description_quality"] = 30
-            else:
-                score["description_quality"] = 0
-            
-            # Calculate image quality (placeholder)
-            score["image_quality"] = 60 if property_data.images else 0
-            
-            # Calculate pricing accuracy (placeholder)
-            score["pricing_accuracy"] = 75
-            
-            # Calculate overall score
-            score["overall"] = int(sum(score.values()) / len(score))
-            
-            return score
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating quality score: {e}")
-            return {
-                "overall": 50,
-                "completeness": 50,
-                "description_quality": 50,
-                "image_quality": 50,
-                "pricing_accuracy": 50
-            }
\ No newline at end of file
+        if property_data.quality_breakdown:
+            return property_data.quality_breakdown
+        return score_property(property_data.model_dump())
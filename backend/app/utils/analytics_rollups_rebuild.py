@@ -0,0 +1,159 @@
+"""
+Analytics Rollups Rebuild
+=========================
+
+Recompute the analytics_daily_rollups buckets from the properties and leads
+collections. A full run seeds the rollups and repairs drift; a catch-up run
+limited to the last N days recomputes only the buckets of documents created
+in that window, picking up writes made outside the service layer.
+
+Property and lead writes keep incrementing the buckets while a run scans, so
+a run never replaces a bucket. It reads the counters of the rebuilt range
+before the scan and applies the difference between the scanned totals and
+those counters with $inc: increments made during the run are kept on top of
+the rebuilt totals. Every bucket of the range is tagged with the run's
+generation, and those left with no properties and no leads are deleted.
+
+Usage: python -m app.utils.analytics_rollups_rebuild [days]
+"""
+
+import asyncio
+import logging
+import sys
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.services.analytics_rollups import (
+    COLLECTION_NAME,
+    add_change,
+    lead_contribution,
+    mark_rollups_ready,
+    new_totals,
+    property_contribution,
+)
+
+logger = logging.getLogger(__name__)
+
+PROPERTY_PROJECTION = {
+    "agent_id": 1, "team_id": 1, "created_at": 1, "publishing_status": 1,
+    "property_type": 1, "location": 1, "price": 1, "status": 1, "published_at": 1, "sold_at": 1,
+}
+LEAD_PROJECTION = {
+    "agent_id": 1, "team_id": 1, "created_at": 1, "status": 1, "source": 1,
+    "urgency": 1, "budget": 1, "score": 1, "conversion_value": 1,
+}
+
+# Bucket sections holding counters; the other fields describe the bucket
+COUNTER_SECTIONS = ("properties", "leads")
+
+
+def bucket_counters(bucket: Dict[str, Any]) -> Dict[str, float]:
+    """Counters of a stored bucket as dotted paths, the form of the totals"""
+    counters: Dict[str, float] = {}
+
+    def collect(node: Dict[str, Any], prefix: str) -> None:
+        for name, value in node.items():
+            path = f"{prefix}.{name}"
+            if isinstance(value, dict):
+                collect(value, path)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                counters[path] = value
+
+    for section in COUNTER_SECTIONS:
+        collect(bucket.get(section) or {}, section)
+    return counters
+
+
+def merge_operations(
+    totals: Dict[str, Dict[str, float]],
+    bucket_fields: Dict[str, Dict[str, Any]],
+    live: Dict[str, Dict[str, float]],
+    generation: str
+) -> List[UpdateOne]:
+    """Updates moving every bucket from its live counters to the scanned totals"""
+    now = datetime.utcnow()
+    operations = []
+    for key in sorted(set(totals) | set(live)):
+        scanned, before = totals.get(key, {}), live.get(key, {})
+        difference = {
+            path: scanned.get(path, 0) - before.get(path, 0)
+            for path in sorted(set(scanned) | set(before))
+        }
+        update: Dict[str, Any] = {"$set": {"generation": generation, "updated_at": now}}
+        increments = {path: value for path, value in difference.items() if value != 0}
+        if increments:
+            update["$inc"] = increments
+        if key in bucket_fields:
+            update["$setOnInsert"] = bucket_fields[key]
+        operations.append(UpdateOne({"_id": key}, update, upsert=key in bucket_fields))
+    return operations
+
+
+async def rebuild_analytics_rollups(
+    db: AsyncIOMotorDatabase,
+    days: Optional[int] = None
+) -> Dict[str, int]:
+    """Reset rollup buckets to totals computed from raw documents (all, or the last days)"""
+    generation = uuid.uuid4().hex
+    totals = new_totals()
+    bucket_fields: Dict[str, Dict[str, Any]] = {}
+    since = None
+    query: Dict[str, Any] = {}
+    if days is not None:
+        since = (datetime.utcnow() - timedelta(days=days)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        query = {"created_at": {"$gte": since}}
+
+    rollups = db[COLLECTION_NAME]
+    bucket_query: Dict[str, Any] = {}
+    if since is not None:
+        bucket_query["day"] = {"$gte": since.strftime("%Y-%m-%d")}
+    live: Dict[str, Dict[str, float]] = {}
+    async for bucket in rollups.find(bucket_query, {section: 1 for section in COUNTER_SECTIONS}):
+        live[bucket["_id"]] = bucket_counters(bucket)
+
+    stats = {"properties": 0, "leads": 0}
+    for collection, projection, contribution_fn, name in (
+        (db.properties, PROPERTY_PROJECTION, property_contribution, "properties"),
+        (db.leads, LEAD_PROJECTION, lead_contribution, "leads"),
+    ):
+        cursor = collection.find(query, projection).batch_size(1000)
+        async for doc in cursor:
+            add_change(totals, bucket_fields, contribution_fn, None, doc)
+            stats[name] += 1
+
+    operations = merge_operations(totals, bucket_fields, live, generation)
+    if operations:
+        await rollups.bulk_write(operations, ordered=False)
+    deleted = await rollups.delete_many({
+        **bucket_query,
+        "generation": generation,
+        **{f"{section}.count": {"$in": [0, None]} for section in COUNTER_SECTIONS},
+    })
+
+    if days is None:
+        await mark_rollups_ready(db)
+
+    stats["buckets"] = len(operations)
+    stats["deleted"] = deleted.deleted_count
+    logger.info(f"Analytics rollups rebuilt: {stats}")
+    return stats
+
+
+async def main():
+    """Run the rebuild against the configured database"""
+    from app.core.database import get_database, init_database
+
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    await init_database()
+    stats = await rebuild_analytics_rollups(get_database(), days=days)
+    print(f"✅ Analytics rollups rebuild completed: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
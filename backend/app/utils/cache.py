@@ -0,0 +1,215 @@
+"""
+In-Process Caches
+=================
+Small bounded caches used by services for hot read paths.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-entry time-to-live and usage counters.
+
+    Designed for the single-threaded asyncio event loop, so no locking is
+    done. Entries live in process memory only: callers that write the
+    underlying data must invalidate, and the TTL bounds staleness between
+    worker processes.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None on miss/expiry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop a key; returns True if it was cached"""
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+            return True
+        return False
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Usage counters for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class StaleWhileRevalidateCache:
+    """
+    Bounded LRU cache for expensive async computations.
+
+    An entry younger than fresh_seconds is served as is. An older one is
+    still served immediately, up to max_stale_seconds, while a background
+    task recomputes it. Past that (or on a miss) the caller waits for the
+    computation. Computations are single-flight per key: concurrent misses
+    and refreshes share one task, which a cancelled caller does not cancel.
+    """
+
+    def __init__(self, max_entries: int = 1024, fresh_seconds: float = 30.0,
+                 max_stale_seconds: float = 600.0):
+        self.max_entries = max(1, max_entries)
+        self.fresh_seconds = fresh_seconds
+        self.max_stale_seconds = max(fresh_seconds, max_stale_seconds)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.evictions = 0
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Cached value for key, computing it with compute() when missing or too
+        old. Results rejected by cacheable are returned but not stored.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self.max_stale_seconds:
+                self._entries.move_to_end(key)
+                if age < self.fresh_seconds:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+                    if key not in self._pending:
+                        self._start(key, compute, cacheable)
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._start(key, compute, cacheable)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(pending)
+
+    def _start(self, key: Hashable, compute: Callable[[], Awaitable[Any]],
+               cacheable: Optional[Callable[[Any], bool]]) -> asyncio.Future:
+        self.refreshes += 1
+        task = asyncio.ensure_future(self._compute(key, compute, cacheable))
+        self._pending[key] = task
+        task.add_done_callback(lambda done: self._finished(key, done))
+        return task
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]],
+                       cacheable: Optional[Callable[[Any], bool]]) -> Any:
+        value = await compute()
+        if cacheable is None or cacheable(value):
+            self.set(key, value)
+        return value
+
+    def _finished(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        # Retrieve the error so background refreshes nobody awaits don't warn;
+        # callers waiting on the task still receive it
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_failures += 1
+            logger.warning(f"Cache refresh for {key!r} failed: {task.exception()}")
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a freshly computed value, evicting the least recently used entry when full"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (value, time.monotonic())
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop a key so the next read recomputes it; returns True if it was cached"""
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop all entries (counters and in-flight computations are kept)"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Usage counters for sizing the cache and its windows"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "fresh_seconds": self.fresh_seconds,
+            "max_stale_seconds": self.max_stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "evictions": self.evictions,
+            "in_flight": len(self._pending),
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
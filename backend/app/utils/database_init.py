@@ -25,6 +25,15 @@ async def initialize_database():
         # Initialize properties collection
         await initialize_properties_collection(db)
         
+        # Initialize properties_archive collection
+        await initialize_properties_archive_collection(db)
+        
+        # Initialize property status transition log
+        await initialize_property_transitions_collection(db)
+        
+        # Initialize property import jobs collection
+        await initialize_property_import_jobs_collection(db)
+        
         # Initialize users collection
         await initialize_users_collection(db)
         
@@ -34,6 +43,15 @@ async def initialize_database():
         # Initialize agent_profiles collection
         await initialize_agent_profiles_collection(db)
         
+        # Initialize analytics rollup collections
+        await initialize_analytics_rollups_collection(db)
+        
+        # Initialize agent public website collections
+        await initialize_agent_public_collections(db)
+        
+        # Initialize engagement counter and event collections
+        await initialize_engagement_collections(db)
+        
         # Initialize facebook collections
         await initialize_facebook_collections(db)
         
@@ -84,12 +102,94 @@ async def initialize_properties_collection(db: AsyncIOMotorDatabase):
         await collection.create_index([("property_type", 1), ("location", 1)])
         await collection.create_index([("price", 1), ("location", 1)])
         
+        # Keyset pagination indexes: (created_at, _id) ordering per agent
+        await collection.create_index([("agent_id", 1), ("created_at", -1), ("_id", -1)])
+        await collection.create_index([
+            ("agent_id", 1), ("publishing_status", 1), ("created_at", -1), ("_id", -1)
+        ])
+        
+        # Persisted listing quality, for "lowest-quality listings" queries
+        await collection.create_index([("agent_id", 1), ("quality_score", 1), ("_id", 1)])
+        
+        # Archive sweep: aged sold/inactive/archived listings
+        await collection.create_index([("status", 1), ("updated_at", 1)])
+        await collection.create_index([("publishing_status", 1), ("updated_at", 1)])
+        
+        # Geospatial index for radius, bounding-box and nearest queries
+        await collection.create_index([("geo_location", "2dsphere")])
+        
+        # Full-text search index. language_override points at a field we never
+        # set because the documents' own "language" field holds UI language
+        # codes (e.g. "mr") that the text index does not support.
+        await collection.create_index(
+            [
+                ("title", "text"),
+                ("location", "text"),
+                ("address", "text"),
+                ("features", "text"),
+                ("amenities", "text"),
+                ("description", "text"),
+            ],
+            name="property_text_search",
+            weights={
+                "title": 10,
+                "location": 6,
+                "address": 6,
+                "features": 3,
+                "amenities": 2,
+                "description": 1,
+            },
+            default_language="english",
+            language_override="text_search_language"
+        )
+        
         logger.info("Properties collection initialized with indexes")
         
     except Exception as e:
         logger.error(f"Error initializing properties collection: {e}")
         raise
 
+async def initialize_properties_archive_collection(db: AsyncIOMotorDatabase):
+    """Initialize properties_archive with the indexes used by id fall-through and analytics"""
+    try:
+        collection = db.properties_archive
+        
+        await collection.create_index([("agent_id", 1), ("created_at", -1), ("_id", -1)])
+        await collection.create_index("archived_at")
+        
+        logger.info("Properties archive collection initialized with indexes")
+        
+    except Exception as e:
+        logger.error(f"Error initializing properties archive collection: {e}")
+        raise
+
+async def initialize_property_transitions_collection(db: AsyncIOMotorDatabase):
+    """Initialize property_status_transitions with per-property and per-agent time indexes"""
+    try:
+        collection = db.property_status_transitions
+        
+        await collection.create_index([("property_id", 1), ("at", 1)])
+        await collection.create_index([("agent_id", 1), ("field", 1), ("at", -1)])
+        
+        logger.info("Property status transitions collection initialized with indexes")
+        
+    except Exception as e:
+        logger.error(f"Error initializing property status transitions collection: {e}")
+        raise
+
+async def initialize_property_import_jobs_collection(db: AsyncIOMotorDatabase):
+    """Initialize property_import_jobs; finished jobs expire at their own expires_at"""
+    try:
+        collection = db.property_import_jobs
+        
+        await collection.create_index("expires_at", expireAfterSeconds=0)
+        
+        logger.info("Property import jobs collection initialized with indexes")
+        
+    except Exception as e:
+        logger.error(f"Error initializing property import jobs collection: {e}")
+        raise
+
 async def initialize_users_collection(db: AsyncIOMotorDatabase):
     """Initialize users collection with indexes"""
     try:
@@ -148,6 +248,65 @@ async def initialize_agent_profiles_collection(db: AsyncIOMotorDatabase):
         logger.error(f"Error initializing agent_profiles collection: {e}")
         raise
 
+async def initialize_analytics_rollups_collection(db: AsyncIOMotorDatabase):
+    """Initialize analytics_daily_rollups with per-agent and per-team day indexes"""
+    try:
+        collection = db.analytics_daily_rollups
+        
+        await collection.create_index([("agent_id", 1), ("team_id", 1), ("day", 1)])
+        await collection.create_index([("team_id", 1), ("day", 1)])
+        await collection.create_index("day")
+        
+        logger.info("Analytics rollups collection initialized with indexes")
+        
+    except Exception as e:
+        logger.error(f"Error initializing analytics rollups collection: {e}")
+        raise
+
+async def initialize_agent_public_collections(db: AsyncIOMotorDatabase):
+    """Initialize agent_public_profiles and agent_public_snapshots with indexes"""
+    try:
+        await db.agent_public_profiles.create_index("slug")
+        
+        # Public pages are served by a single read on slug
+        await db.agent_public_snapshots.create_index(
+            "slug",
+            unique=True,
+            partialFilterExpression={"slug": {"$type": "string"}}
+        )
+        
+        logger.info("Agent public collections initialized with indexes")
+        
+    except Exception as e:
+        logger.error(f"Error initializing agent public collections: {e}")
+        raise
+
+async def initialize_engagement_collections(db: AsyncIOMotorDatabase):
+    """Initialize the engagement counter, event and series collections with indexes and retention"""
+    try:
+        await db.engagement_counters.create_index(
+            [("entity_type", 1), ("entity_id", 1), ("day", 1)]
+        )
+        await db.engagement_counters.create_index([("agent_id", 1), ("day", 1)])
+        await db.engagement_events.create_index(
+            [("entity_type", 1), ("entity_id", 1), ("occurred_at", -1)]
+        )
+        # Raw events carry their own expires_at, so changing the retention
+        # setting never conflicts with the index options
+        await db.engagement_events.create_index("expires_at", expireAfterSeconds=0)
+        
+        # Minute and hour buckets expire at their own expires_at
+        await db.engagement_series.create_index(
+            [("entity_type", 1), ("entity_id", 1), ("resolution", 1), ("start", 1)]
+        )
+        await db.engagement_series.create_index("expires_at", expireAfterSeconds=0)
+        
+        logger.info("Engagement collections initialized with indexes")
+        
+    except Exception as e:
+        logger.error(f"Error initializing engagement collections: {e}")
+        raise
+
 async def initialize_facebook_collections(db: AsyncIOMotorDatabase):
     """Initialize Facebook-related collections with indexes"""
     try:
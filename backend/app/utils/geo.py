@@ -0,0 +1,118 @@
+"""
+Geo Utilities
+=============
+GeoJSON helpers and a local gazetteer used to geocode free-text property
+locations without calling an external service.
+"""
+
+import csv
+import logging
+import math
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6378.1
+
+DEFAULT_GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "data" / "gazetteer_in.csv"
+
+
+def geo_point(longitude: float, latitude: float) -> Dict[str, Any]:
+    """Build a GeoJSON point (MongoDB expects [longitude, latitude])"""
+    return {"type": "Point", "coordinates": [float(longitude), float(latitude)]}
+
+
+def haversine_km(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9 ]", " ", text.lower())).strip()
+
+
+class Gazetteer:
+    """
+    In-memory place-name lookup loaded from a CSV file with
+    name, latitude, longitude columns.
+    """
+
+    def __init__(self, entries: Dict[str, Tuple[float, float]]):
+        # normalized name -> (longitude, latitude)
+        self._entries = entries
+        # Longest names first so "Bandra West" wins over "Bandra"
+        self._names_by_length = sorted(entries, key=len, reverse=True)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "Gazetteer":
+        entries: Dict[str, Tuple[float, float]] = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                try:
+                    entries[_normalize(row["name"])] = (
+                        float(row["longitude"]),
+                        float(row["latitude"]),
+                    )
+                except (KeyError, TypeError, ValueError):
+                    logger.warning(f"Skipping malformed gazetteer row: {row}")
+        logger.info(f"Loaded {len(entries)} gazetteer entries from {path}")
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, location: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Geocode a free-text location such as "Bandra West, Mumbai".
+
+        Comma-separated parts are tried most-specific first for an exact
+        match, then the longest gazetteer name contained in the text wins.
+        """
+        if not location:
+            return None
+
+        for part in location.split(","):
+            coords = self._entries.get(_normalize(part))
+            if coords:
+                return geo_point(*coords)
+
+        padded = f" {_normalize(location)} "
+        for name in self._names_by_length:
+            if f" {name} " in padded:
+                return geo_point(*self._entries[name])
+        return None
+
+
+@lru_cache()
+def get_gazetteer() -> Gazetteer:
+    """Get the process-wide gazetteer (path configurable via settings.gazetteer_path)"""
+    from app.core.config import settings
+
+    path = Path(settings.gazetteer_path) if settings.gazetteer_path else DEFAULT_GAZETTEER_PATH
+    try:
+        return Gazetteer.from_csv(path)
+    except OSError as e:
+        logger.error(f"Could not load gazetteer {path}: {e}")
+        return Gazetteer({})
+
+
+def bounding_box_polygon(
+    min_longitude: float, min_latitude: float, max_longitude: float, max_latitude: float
+) -> Dict[str, Any]:
+    """GeoJSON polygon for a longitude/latitude box (usable with 2dsphere indexes)"""
+    ring: List[List[float]] = [
+        [min_longitude, min_latitude],
+        [max_longitude, min_latitude],
+        [max_longitude, max_latitude],
+        [min_longitude, max_latitude],
+        [min_longitude, min_latitude],
+    ]
+    return {"type": "Polygon", "coordinates": [ring]}
@@ -0,0 +1,78 @@
+"""
+Geocode Backfill
+================
+
+Populate geo_location on existing properties by matching their free-text
+location against the local gazetteer. Safe to re-run: only documents without
+a geo_location are touched.
+
+The job runs in its own process, so it cannot clear the API workers'
+property caches: cached documents stay without geo_location until their
+property_cache_ttl_seconds expiry.
+
+Usage: python -m app.utils.geocode_backfill
+"""
+
+import asyncio
+import logging
+from typing import Dict
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.core.database import get_database, init_database
+from app.utils.geo import get_gazetteer
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 500
+
+
+async def backfill_geo_locations(
+    db: AsyncIOMotorDatabase,
+    batch_size: int = BACKFILL_BATCH_SIZE
+) -> Dict[str, int]:
+    """Geocode every property missing geo_location; returns matched/unmatched counts"""
+    gazetteer = get_gazetteer()
+    collection = db.properties
+    stats = {"scanned": 0, "geocoded": 0, "unmatched": 0}
+
+    cursor = collection.find(
+        {"geo_location": None},
+        {"location": 1}
+    ).batch_size(batch_size)
+
+    operations = []
+    async for doc in cursor:
+        stats["scanned"] += 1
+        point = gazetteer.lookup(doc.get("location"))
+        if point is None:
+            stats["unmatched"] += 1
+            continue
+
+        operations.append(UpdateOne(
+            {"_id": doc["_id"], "geo_location": None},
+            {"$set": {"geo_location": point}}
+        ))
+        if len(operations) >= batch_size:
+            result = await collection.bulk_write(operations, ordered=False)
+            stats["geocoded"] += result.modified_count
+            operations = []
+
+    if operations:
+        result = await collection.bulk_write(operations, ordered=False)
+        stats["geocoded"] += result.modified_count
+
+    logger.info(f"Geocode backfill finished: {stats}")
+    return stats
+
+
+async def main():
+    """Run the backfill against the configured database"""
+    await init_database()
+    stats = await backfill_geo_locations(get_database())
+    print(f"✅ Geocode backfill completed: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+HyperLogLog
+===========
+Mergeable cardinality sketch for counting distinct visitors without storing
+their ids.
+
+With the default precision p=12 a sketch has 4096 one-byte registers and
+estimates cardinality within about 1.6% (standard error 1.04 / sqrt(4096)).
+Two sketches merge by taking the register-wise maximum, which is what makes
+per-day sketches cheap to combine into weekly and monthly figures, and what
+lets a stored sketch be updated with $max on individual register fields.
+"""
+
+import hashlib
+import math
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+DEFAULT_PRECISION = 12
+
+HASH_BITS = 64
+
+
+def _hash(item: str) -> int:
+    return int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def position(item: str, precision: int = DEFAULT_PRECISION) -> Tuple[int, int]:
+    """
+    The (register index, rank) an item sets: the index is the first
+    precision bits of its hash, the rank the position of the first 1-bit in
+    the remaining bits.
+    """
+    value = _hash(item)
+    remaining_bits = HASH_BITS - precision
+    index = value >> remaining_bits
+    rest = value & ((1 << remaining_bits) - 1)
+    return index, remaining_bits - rest.bit_length() + 1
+
+
+class HyperLogLog:
+    """HyperLogLog sketch with 2**precision registers"""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytearray] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError(f"expected {self.size} registers, got {len(self.registers)}")
+
+    @classmethod
+    def from_sparse(cls, registers: Mapping, precision: int = DEFAULT_PRECISION) -> "HyperLogLog":
+        """Sketch from a {index: rank} mapping; keys may be strings, as stored in documents"""
+        sketch = cls(precision)
+        sketch.update_registers((int(index), int(rank)) for index, rank in registers.items())
+        return sketch
+
+    def add(self, item: str) -> None:
+        """Count an item (a visitor id)"""
+        self.update_registers([position(item, self.precision)])
+
+    def update_registers(self, updates: Iterable[Tuple[int, int]]) -> None:
+        """Raise registers to at least the given ranks"""
+        for index, rank in updates:
+            if rank > self.registers[index]:
+                self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold another sketch of the same precision into this one (set union)"""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def to_sparse(self) -> Dict[str, int]:
+        """Non-zero registers as {index: rank}, keyed by string for storage in documents"""
+        return {str(index): rank for index, rank in enumerate(self.registers) if rank}
+
+    def count(self) -> int:
+        """Estimated number of distinct items added"""
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        # Linear counting is more accurate while many registers are still empty
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
@@ -0,0 +1,122 @@
+"""
+Market Aggregates Rebuild
+=========================
+
+Recompute the market_aggregates collection from the properties collection.
+Needed once to seed the aggregates and occasionally to clear floating-point
+drift from incremental updates.
+
+Property writes keep incrementing the aggregates while a run scans, so a run
+never replaces a document. It reads the live counters before the scan and
+applies the difference between the scanned totals and those counters with
+$inc: increments made during the run are kept on top of the rebuilt totals.
+Every document is tagged with the run's generation, and those left with no
+active listings are deleted.
+
+Usage: python -m app.utils.market_aggregates_rebuild
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.services.market_aggregates import (
+    ACTIVE_FILTER,
+    COLLECTION_NAME,
+    add_change,
+    new_totals,
+)
+
+logger = logging.getLogger(__name__)
+
+REBUILD_PROJECTION = {
+    "location": 1, "property_type": 1, "price": 1,
+    "area_sqft": 1, "status": 1, "created_at": 1,
+}
+
+# Aggregate fields that are not counters
+DESCRIPTIVE_FIELDS = ("_id", "locality", "property_type", "updated_at", "generation")
+
+
+def aggregate_counters(aggregate: Dict[str, Any]) -> Dict[str, float]:
+    """Counters of a stored aggregate as dotted paths, the form of the totals"""
+    counters: Dict[str, float] = {}
+    for name, value in aggregate.items():
+        if name in DESCRIPTIVE_FIELDS:
+            continue
+        if name == "monthly" and isinstance(value, dict):
+            for month, bucket in value.items():
+                for field, amount in (bucket or {}).items():
+                    counters[f"monthly.{month}.{field}"] = amount
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            counters[name] = value
+    return counters
+
+
+def merge_operations(
+    totals: Dict[str, Dict[str, float]],
+    live: Dict[str, Dict[str, float]],
+    generation: str
+) -> List[UpdateOne]:
+    """Updates moving every aggregate from its live counters to the scanned totals"""
+    now = datetime.utcnow()
+    operations = []
+    for key in sorted(set(totals) | set(live)):
+        scanned, before = totals.get(key, {}), live.get(key, {})
+        increments = {
+            path: scanned.get(path, 0) - before.get(path, 0)
+            for path in sorted(set(scanned) | set(before))
+        }
+        increments = {path: value for path, value in increments.items() if value != 0}
+        locality, property_type = key.split("|", 1)
+        update: Dict[str, Any] = {
+            "$set": {"generation": generation, "updated_at": now},
+            "$setOnInsert": {"locality": locality, "property_type": property_type},
+        }
+        if increments:
+            update["$inc"] = increments
+        operations.append(UpdateOne({"_id": key}, update, upsert=True))
+    return operations
+
+
+async def rebuild_market_aggregates(db: AsyncIOMotorDatabase) -> Dict[str, int]:
+    """Reset all market aggregates to totals computed from active properties"""
+    generation = uuid.uuid4().hex
+    collection = db[COLLECTION_NAME]
+    live = {}
+    async for aggregate in collection.find({}):
+        live[aggregate["_id"]] = aggregate_counters(aggregate)
+
+    totals = new_totals()
+    scanned = 0
+    cursor = db.properties.find(ACTIVE_FILTER, REBUILD_PROJECTION).batch_size(1000)
+    async for doc in cursor:
+        add_change(totals, None, doc)
+        scanned += 1
+
+    operations = merge_operations(totals, live, generation)
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+    deleted = await collection.delete_many({"generation": generation, "count": {"$in": [0, None]}})
+
+    stats = {"properties": scanned, "aggregates": len(operations), "deleted": deleted.deleted_count}
+    logger.info(f"Market aggregates rebuilt: {stats}")
+    return stats
+
+
+async def main():
+    """Run the rebuild against the configured database"""
+    from app.core.database import get_database, init_database
+
+    await init_database()
+    stats = await rebuild_market_aggregates(get_database())
+    print(f"✅ Market aggregates rebuilt: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
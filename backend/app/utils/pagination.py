@@ -0,0 +1,74 @@
+"""
+Keyset Pagination Helpers
+=========================
+Opaque cursor encoding and filter building for keyset (cursor) pagination.
+
+A cursor captures the sort key and ``_id`` of the last document on a page, so
+the next page is fetched with a range predicate on an index instead of
+``skip``, and every page costs the same regardless of depth.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(sort_value: Any, document_id: Any) -> str:
+    """Encode the sort key and id of the last item of a page into an opaque cursor"""
+    if isinstance(sort_value, datetime):
+        payload = {"t": "dt", "v": sort_value.isoformat()}
+    else:
+        payload = {"t": "raw", "v": sort_value}
+    payload["id"] = str(document_id)
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """Decode a cursor produced by encode_cursor into (sort_value, ObjectId)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort_value = payload["v"]
+        if payload.get("t") == "dt":
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, ObjectId(payload["id"])
+    except Exception:
+        raise ValidationError("Invalid pagination cursor")
+
+
+def keyset_filter(
+    sort_field: str, cursor: Optional[str], descending: bool = True
+) -> Dict[str, Any]:
+    """
+    Build the range predicate that selects documents after the cursor.
+
+    Pages are ordered by (sort_field, _id) so ties on the sort key are broken
+    deterministically. Returns an empty filter when no cursor is given.
+    """
+    if not cursor:
+        return {}
+
+    sort_value, last_id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {
+        "$or": [
+            {sort_field: {op: sort_value}},
+            {sort_field: sort_value, "_id": {op: last_id}},
+        ]
+    }
+
+
+def merge_filters(*filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine filters with $and, dropping empty ones"""
+    non_empty = [f for f in filters if f]
+    if not non_empty:
+        return {}
+    if len(non_empty) == 1:
+        return non_empty[0]
+    return {"$and": non_empty}
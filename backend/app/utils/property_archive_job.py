@@ -0,0 +1,29 @@
+"""
+Property Archive Run
+====================
+
+Move sold, inactive and archived listings untouched for the configured
+number of days from properties to properties_archive. The API process runs
+the same sweep on a schedule; this entry point is for cron deployments with
+the in-process schedule disabled, and for one-off runs with another age.
+
+Usage: python -m app.utils.property_archive_job [older_than_days]
+"""
+
+import asyncio
+import sys
+
+from app.core.database import get_database, init_database
+from app.services.property_archive import archive_properties
+
+
+async def main():
+    """Run one archive sweep against the configured database"""
+    older_than_days = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    await init_database()
+    stats = await archive_properties(get_database(), older_than_days=older_than_days)
+    print(f"✅ Property archive completed: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+"""
+Property Transitions Backfill
+=============================
+
+Seed property_status_transitions for listings written before the log
+existed, from the timestamps they carry: the initial draft/active state at
+created_at, publishing at published_at, and the current status or
+publishing_status (when it moved on) at updated_at. Sold listings without a
+sold_at stamp get updated_at, the closest known sale time. Listings that
+already have logged transitions are skipped, and entries have deterministic
+ids, so the job can be re-run.
+
+The analytics rollups are rebuilt afterwards so days on market and
+conversion rates pick up the new sold_at stamps.
+
+Usage: python -m app.utils.property_transitions_backfill
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+
+from app.core.database import get_database, init_database
+from app.services.property_transitions import COLLECTION_NAME, SOLD_STATUS, as_datetime
+from app.utils.analytics_rollups_rebuild import rebuild_analytics_rollups
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+PROJECTION = {
+    "agent_id": 1, "status": 1, "publishing_status": 1,
+    "created_at": 1, "published_at": 1, "updated_at": 1, "sold_at": 1,
+}
+
+
+def backfill_entries(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Reconstructed transitions of one listing, oldest first"""
+    property_id = str(doc["_id"])
+    created_at = as_datetime(doc.get("created_at"))
+    published_at = as_datetime(doc.get("published_at"))
+    updated_at = as_datetime(doc.get("updated_at")) or created_at
+    if created_at is None:
+        return []
+
+    def entry(field: str, before: Any, after: Any, at: Any) -> Dict[str, Any]:
+        return {
+            "_id": f"{property_id}|backfill|{field}|{after}",
+            "property_id": property_id,
+            "agent_id": str(doc.get("agent_id") or ""),
+            "field": field,
+            "from": before,
+            "to": after,
+            "at": at,
+            "backfilled": True,
+        }
+
+    entries = [entry("publishing_status", None, "draft", created_at)]
+    publishing_status = doc.get("publishing_status") or "draft"
+    if published_at:
+        entries.append(entry("publishing_status", "draft", "published", published_at))
+    if publishing_status not in ("draft", "published"):
+        before = "published" if published_at else "draft"
+        entries.append(entry("publishing_status", before, publishing_status, updated_at))
+
+    entries.append(entry("status", None, "active", created_at))
+    status = doc.get("status") or "active"
+    if status != "active":
+        at = as_datetime(doc.get("sold_at")) if status == SOLD_STATUS else None
+        entries.append(entry("status", "active", status, at or updated_at))
+    return entries
+
+
+async def _backfill_batch(
+    db: AsyncIOMotorDatabase, docs: List[Dict[str, Any]], stats: Dict[str, int]
+) -> None:
+    ids = [str(doc["_id"]) for doc in docs]
+    logged = set(await db[COLLECTION_NAME].distinct(
+        "property_id", {"property_id": {"$in": ids}, "backfilled": {"$ne": True}}
+    ))
+
+    entries = []
+    stamps = []
+    for doc in docs:
+        if str(doc["_id"]) in logged:
+            stats["skipped"] += 1
+            continue
+        entries.extend(backfill_entries(doc))
+        unstamped = doc.get("sold_at") is None and doc.get("updated_at")
+        if doc.get("status") == SOLD_STATUS and unstamped:
+            stamps.append(UpdateOne(
+                {"_id": doc["_id"], "sold_at": None},
+                {"$set": {"sold_at": doc["updated_at"]}}
+            ))
+
+    if entries:
+        await db[COLLECTION_NAME].bulk_write(
+            [ReplaceOne({"_id": e["_id"]}, e, upsert=True) for e in entries],
+            ordered=False
+        )
+    if stamps:
+        await db.properties.bulk_write(stamps, ordered=False)
+    stats["transitions"] += len(entries)
+    stats["sold_at_stamped"] += len(stamps)
+
+
+async def backfill_property_transitions(db: AsyncIOMotorDatabase) -> Dict[str, int]:
+    """Seed the transition log and sold_at stamps, then rebuild the rollups"""
+    stats = {"properties": 0, "skipped": 0, "transitions": 0, "sold_at_stamped": 0}
+    batch: List[Dict[str, Any]] = []
+
+    cursor = db.properties.find({}, PROJECTION).batch_size(BATCH_SIZE)
+    async for doc in cursor:
+        batch.append(doc)
+        stats["properties"] += 1
+        if len(batch) >= BATCH_SIZE:
+            await _backfill_batch(db, batch, stats)
+            batch = []
+    if batch:
+        await _backfill_batch(db, batch, stats)
+
+    await rebuild_analytics_rollups(db)
+    logger.info(f"Property transitions backfill finished: {stats}")
+    return stats
+
+
+async def main():
+    """Run the backfill against the configured database"""
+    await init_database()
+    stats = await backfill_property_transitions(get_database())
+    print(f"✅ Property transitions backfill completed: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Quality Score Recompute
+=======================
+
+Score every property in vectorized batches and persist quality_score and
+quality_breakdown. Only documents whose breakdown changed are written, so
+re-running after a scoring change touches just the affected listings.
+
+Rescoring is not an edit: updated_at is left alone (the archive cutoff and
+the sold_at backfill read it) and quality_scored_at is stamped instead, which
+the HTTP ETags include. A write only applies while the document still has the
+updated_at it was scored from; a concurrent edit rescored it already.
+
+The job runs in its own process, so it cannot clear the API workers'
+property caches: cached documents keep their old scores until their
+property_cache_ttl_seconds expiry.
+
+Usage: python -m app.utils.quality_rescore
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.services.quality_scoring import SCORING_PROJECTION, quality_fields, score_properties
+
+logger = logging.getLogger(__name__)
+
+RESCORE_BATCH_SIZE = 1000
+
+
+async def _score_batch(collection, batch, stats: Dict[str, int]) -> None:
+    breakdowns = score_properties(batch)
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"_id": doc["_id"], "updated_at": doc.get("updated_at")},
+            {"$set": {**quality_fields(breakdown), "quality_scored_at": now}}
+        )
+        for doc, breakdown in zip(batch, breakdowns)
+        if doc.get("quality_breakdown") != breakdown
+    ]
+    if operations:
+        result = await collection.bulk_write(operations, ordered=False)
+        stats["updated"] += result.modified_count
+
+
+async def rescore_properties(
+    db: AsyncIOMotorDatabase,
+    batch_size: int = RESCORE_BATCH_SIZE
+) -> Dict[str, int]:
+    """Recompute quality scores for the whole collection; returns scanned/updated counts"""
+    collection = db.properties
+    stats = {"scanned": 0, "updated": 0}
+
+    cursor = collection.find(
+        {},
+        {**SCORING_PROJECTION, "quality_breakdown": 1, "updated_at": 1}
+    ).batch_size(batch_size)
+
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            stats["scanned"] += len(batch)
+            await _score_batch(collection, batch, stats)
+            batch = []
+
+    if batch:
+        stats["scanned"] += len(batch)
+        await _score_batch(collection, batch, stats)
+
+    logger.info(f"Quality rescore finished: {stats}")
+    return stats
+
+
+async def main():
+    """Run the recompute against the configured database"""
+    from app.core.database import get_database, init_database
+
+    await init_database()
+    stats = await rescore_properties(get_database())
+    print(f"✅ Quality rescore completed: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""
+Serialization Fast Paths
+========================
+Helpers for documents read from our own database, which were validated on
+the way in and do not need to be validated again on the way out.
+
+construct_trusted builds a response model without validation (recursing into
+nested models and enums so serialization stays warning-free), and
+TrustedJSONResponse serializes models with pydantic-core directly, skipping
+FastAPI's response_model re-validation and jsonable_encoder pass.
+
+pydantic-core is the one JSON encoder of the API: TrustedJSONResponse is also
+the application's default response class. It ships with pydantic, so there is
+no optional dependency to fall back from, and it serializes models natively,
+where orjson needs a model_dump pass first (about twice the time for 500
+property responses). On the plain data of default responses orjson encodes
+faster, but that is a millisecond against the jsonable_encoder pass FastAPI
+runs before it (see serialization_benchmark).
+"""
+
+import types
+from enum import Enum
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _needs_coercion(annotation: Any) -> bool:
+    if get_origin(annotation) is None and isinstance(annotation, type):
+        return issubclass(annotation, (BaseModel, Enum))
+    return any(_needs_coercion(arg) for arg in get_args(annotation))
+
+
+@lru_cache(maxsize=None)
+def _field_plan(
+    model_cls: Type[BaseModel]
+) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, Any], ...], Tuple[Tuple[str, Callable[[], Any]], ...]]:
+    """Required field names, fields holding nested models or enums, and default factories"""
+    # get_type_hints resolves forward references such as List['PublicProperty']
+    hints = get_type_hints(model_cls)
+    required = tuple(name for name, field in model_cls.model_fields.items() if field.is_required())
+    nested = tuple(
+        (name, hints.get(name, field.annotation))
+        for name, field in model_cls.model_fields.items()
+        if _needs_coercion(hints.get(name, field.annotation))
+    )
+    # model_construct inspects each factory's signature on every call, which
+    # costs more than the rest of the construction; plain factories are called here
+    factories = tuple(
+        (name, field.default_factory)
+        for name, field in model_cls.model_fields.items()
+        if field.default_factory is not None
+        and not getattr(field, "default_factory_takes_validated_data", False)
+    )
+    return required, nested, factories
+
+
+def _coerce(annotation: Any, value: Any) -> Any:
+    if value is None:
+        return None
+
+    origin = get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        for arg in get_args(annotation):
+            if arg is not type(None) and _needs_coercion(arg):
+                return _coerce(arg, value)
+        return value
+    if origin in (list, tuple, set) and isinstance(value, (list, tuple, set)):
+        (item_type, *_) = get_args(annotation) or (Any,)
+        return [_coerce(item_type, item) for item in value]
+    if origin is dict and isinstance(value, dict):
+        _, value_type = get_args(annotation) or (Any, Any)
+        return {key: _coerce(value_type, item) for key, item in value.items()}
+
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel) and isinstance(value, dict):
+            return construct_trusted(annotation, value)
+        if issubclass(annotation, Enum) and not isinstance(value, annotation):
+            try:
+                return annotation(value)
+            except ValueError:
+                return value
+    return value
+
+
+def construct_trusted(model_cls: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """
+    Build model_cls from a trusted dict without validation.
+
+    Falls back to full validation when a required field is missing, so
+    legacy documents still fail loudly instead of serializing half-built.
+    """
+    required, nested, factories = _field_plan(model_cls)
+    if any(name not in data for name in required):
+        return model_cls(**data)
+
+    values = dict(data)
+    for name, annotation in nested:
+        if name in values:
+            values[name] = _coerce(annotation, values[name])
+    for name, factory in factories:
+        if name not in values:
+            values[name] = factory()
+    fields_set = {
+        name for name, field in model_cls.model_fields.items()
+        if name in data or (field.alias is not None and field.alias in data)
+    }
+    return model_cls.model_construct(_fields_set=fields_set, **values)
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Serialize models, lists of models and plain JSON data in one pass.
+    NaN and infinities become null, as in model serialization, instead of
+    the bare NaN/Infinity tokens JSON parsers reject.
+    """
+    return to_json(content, serialize_unknown=True, inf_nan_mode="null")
+
+
+class TrustedJSONResponse(JSONResponse):
+    """JSON response rendered straight from pydantic models via pydantic-core"""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
@@ -0,0 +1,159 @@
+"""
+Serialization Benchmark
+=======================
+
+Compare the validated response path (model validation, then FastAPI-style
+jsonable_encoder + json.dumps) against the trusted path (construct_trusted,
+then pydantic-core to_json) for property, lead and public profile payloads.
+
+Usage: python -m app.utils.serialization_benchmark [items] [rounds]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.agent_public import AgentPublicProfile
+from app.schemas.lead import LeadResponse
+from app.schemas.unified_property import PropertyResponse, PropertySummary
+from app.utils.serialization import construct_trusted, dump_json
+
+
+def _property_doc(i: int) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
+        "id": f"prop-{i}",
+        "title": f"3 BHK Apartment {i}",
+        "description": (
+            "Spacious apartment close to the metro with covered parking and a park view."
+        ),
+        "property_type": "apartment",
+        "price": 7500000.0 + i,
+        "location": "Whitefield, Bangalore",
+        "geo_location": {"type": "Point", "coordinates": [77.75, 12.97]},
+        "bedrooms": 3,
+        "bathrooms": 2.0,
+        "area_sqft": 1450,
+        "features": ["parking", "gym", "pool"],
+        "images": [f"/uploads/{i}-{n}.jpg" for n in range(4)],
+        "agent_id": "agent-1",
+        "market_analysis": {"price_position_percentage": 72, "trend": "rising"},
+        "ai_insights": {"summary": "Well priced for the locality"},
+        "quality_score": 81,
+        "quality_breakdown": {
+            "completeness": 90,
+            "description_quality": 70,
+            "image_quality": 85,
+            "pricing_accuracy": 79,
+        },
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _lead_doc(i: int) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
+        "id": f"lead-{i}",
+        "agent_id": "agent-1",
+        "name": f"Lead {i}",
+        "email": f"lead{i}@example.com",
+        "phone": "+919800000000",
+        "source": "website",
+        "status": "new",
+        "urgency": "medium",
+        "budget": 6000000.0,
+        "score": 75,
+        "activities": [
+            {"id": f"act-{i}-{n}", "lead_id": f"lead-{i}", "activity_type": "note",
+             "description": "Called, asked for a site visit", "performed_by": "agent-1",
+             "timestamp": now}
+            for n in range(3)
+        ],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _profile_doc(items: int) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
+        "id": "agent-1",
+        "agent_id": "agent-1",
+        "agent_name": "Priya Sharma",
+        "slug": "priya-sharma",
+        "bio": "Residential specialist in east Bangalore.",
+        "specialties": ["Residential"],
+        "languages": ["English", "Hindi"],
+        "created_at": now,
+        "updated_at": now,
+        "properties": [
+            {
+                "id": f"prop-{i}", "agent_id": "agent-1", "title": f"3 BHK Apartment {i}",
+                "description": "Spacious apartment close to the metro.", "price": 7500000.0,
+                "property_type": "Apartment", "bedrooms": 3, "bathrooms": 2, "area": 1450.0,
+                "location": "Whitefield, Bangalore", "images": [f"/uploads/{i}.jpg"],
+                "features": ["parking"], "created_at": now, "updated_at": now,
+            }
+            for i in range(items)
+        ],
+    }
+
+
+def _validated(model_cls, docs: List[Dict[str, Any]]) -> bytes:
+    models = [model_cls(**doc) for doc in docs]
+    return json.dumps(jsonable_encoder(models)).encode("utf-8")
+
+
+def _trusted(model_cls, docs: List[Dict[str, Any]]) -> bytes:
+    return dump_json([construct_trusted(model_cls, doc) for doc in docs])
+
+
+def _time(fn: Callable[[], Any], rounds: int) -> float:
+    """Best-of-rounds wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(items: int = 500, rounds: int = 5) -> List[Dict[str, Any]]:
+    """Time both paths per payload; returns one row per payload"""
+    cases = [
+        ("property summaries", PropertySummary, [_property_doc(i) for i in range(items)]),
+        ("property responses", PropertyResponse, [_property_doc(i) for i in range(items)]),
+        ("leads", LeadResponse, [_lead_doc(i) for i in range(items)]),
+        ("public profile", AgentPublicProfile, [_profile_doc(items)]),
+    ]
+    rows = []
+    for name, model_cls, docs in cases:
+        validated_ms = _time(lambda: _validated(model_cls, docs), rounds)
+        trusted_ms = _time(lambda: _trusted(model_cls, docs), rounds)
+        rows.append({
+            "payload": name,
+            "validated_ms": round(validated_ms, 2),
+            "trusted_ms": round(trusted_ms, 2),
+            "speedup": round(validated_ms / trusted_ms, 1) if trusted_ms else None,
+        })
+    return rows
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print(f"Serialization benchmark: {items} items, best of {rounds} rounds")
+    for row in run(items, rounds):
+        print(
+            f"  {row['payload']:<20} validated {row['validated_ms']:>9.2f} ms"
+            f"  trusted {row['trusted_ms']:>9.2f} ms  x{row['speedup']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Streaming Serialization
+=======================
+Async generators that turn a stream of records into NDJSON or CSV bytes,
+optionally gzip-compressed on the fly, for use with StreamingResponse.
+Memory use is bounded by one output chunk regardless of record count.
+"""
+
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List
+
+# Records are buffered into chunks of roughly this many bytes before yielding
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+async def ndjson_stream(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Serialize records as newline-delimited JSON"""
+    buffer: List[str] = []
+    size = 0
+    async for record in records:
+        line = json.dumps(record, default=_json_default, ensure_ascii=False) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= STREAM_CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+async def csv_stream(
+    records: AsyncIterator[Dict[str, Any]],
+    fields: List[str]
+) -> AsyncIterator[bytes]:
+    """Serialize records as CSV with a header row; nested values are JSON-encoded"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    async for record in records:
+        writer.writerow([_csv_value(record.get(field)) for field in fields])
+        if buffer.tell() >= STREAM_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a single gzip member incrementally"""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,36 @@
+"""
+Shared test fixtures
+====================
+"""
+
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture
+def make_listing():
+    """Factory for stored property documents; keyword overrides replace the defaults"""
+
+    def make(property_id="p1", **overrides):
+        doc = {
+            "_id": property_id,
+            "agent_id": "agent-1",
+            "team_id": "team-1",
+            "status": "active",
+            "publishing_status": "published",
+            "property_type": "apartment",
+            "location": "Bandra West, Mumbai",
+            "price": 10000000.0,
+            "area_sqft": 1000,
+            "bedrooms": 2,
+            "bathrooms": 2,
+            "geo_location": {"type": "Point", "coordinates": [72.83, 19.06]},
+            "created_at": datetime(2024, 5, 10),
+            "published_at": datetime(2024, 5, 10),
+            "updated_at": datetime(2024, 5, 10),
+        }
+        doc.update(overrides)
+        return doc
+
+    return make
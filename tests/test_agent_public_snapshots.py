@@ -0,0 +1,58 @@
+"""
+Test cases for public agent snapshots
+=====================================
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.schemas.agent_public import PropertySearchFilters
+from app.services import agent_public_snapshots
+from app.services.agent_public_snapshots import _card_query, refresh_agent_snapshot
+
+
+class TestAgentPublicSnapshots:
+    """Test cases for snapshot refreshes and the paginated card query"""
+
+    @pytest.mark.asyncio
+    async def test_refresh_embeds_only_the_newest_cards(self):
+        """A refresh reads at most agent_snapshot_max_cards listings"""
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.limit.return_value = cursor
+        cursor.__aiter__.return_value = iter([])
+        collections = {
+            agent_public_snapshots.PROFILES_COLLECTION: MagicMock(
+                find_one=AsyncMock(
+                    return_value={"_id": "agent-1", "agent_id": "agent-1", "slug": "jane"}
+                )
+            ),
+            agent_public_snapshots.COLLECTION_NAME: MagicMock(replace_one=AsyncMock()),
+            "properties": MagicMock(find=MagicMock(return_value=cursor)),
+        }
+        db = MagicMock()
+        db.get_collection.side_effect = collections.__getitem__
+
+        snapshot = await refresh_agent_snapshot(db, "agent-1")
+
+        cursor.limit.assert_called_once_with(agent_public_snapshots.settings.agent_snapshot_max_cards)
+        assert snapshot["slug"] == "jane"
+        assert snapshot["properties"] == []
+
+    def test_card_query_applies_the_public_filters(self):
+        """Filters narrow the agent's published listings"""
+        filters = PropertySearchFilters(
+            location="Bandra (West)", property_type="Apartment",
+            min_price=5000000, min_bedrooms=2, features=["Parking"],
+        )
+
+        query = _card_query("agent-1", filters)
+
+        assert query["agent_id"] == "agent-1"
+        assert query["publishing_status"] == "published"
+        assert query["location"] == {"$regex": r"Bandra\ \(West\)", "$options": "i"}
+        assert query["property_type"] == {"$regex": "^Apartment$", "$options": "i"}
+        assert query["price"] == {"$gte": 5000000}
+        assert query["bedrooms"] == {"$gte": 2}
+        assert query["features"] == {"$all": ["Parking"]}
+        assert "area_sqft" not in query
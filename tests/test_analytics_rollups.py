@@ -0,0 +1,142 @@
+"""
+Test cases for analytics daily rollups
+======================================
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services import analytics_rollups
+from app.services.analytics_rollups import (
+    add_change,
+    decode_counts,
+    lead_contribution,
+    new_totals,
+    property_contribution,
+)
+from app.services.lead_service import LeadService
+from app.utils.analytics_rollups_rebuild import bucket_counters, rebuild_analytics_rollups
+from pymongo import ReplaceOne
+
+
+def _lead(**overrides):
+    doc = {
+        "agent_id": "agent-1",
+        "status": "new",
+        "source": "website",
+        "urgency": "medium",
+        "budget": 300000.0,
+        "score": 80,
+        "created_at": datetime(2024, 5, 10, 14, 30),
+    }
+    doc.update(overrides)
+    return doc
+
+
+class TestAnalyticsRollups:
+    """Test cases for rollup contributions and bucket building"""
+
+    def test_bucket_keyed_by_agent_team_and_created_day(self, make_listing):
+        """Documents count in the bucket of their created_at day"""
+        key, fields, _ = property_contribution(make_listing())
+        assert key == "agent-1|team-1|2024-05-10"
+        assert fields == {"agent_id": "agent-1", "team_id": "team-1", "day": "2024-05-10"}
+
+    def test_status_change_moves_counts_within_bucket(self):
+        """Converting a lead moves it between statuses and adds the deal value"""
+        totals, fields = new_totals(), {}
+        converted = _lead(status="converted", conversion_value=250000.0)
+        add_change(totals, fields, lead_contribution, _lead(), converted)
+
+        increments = totals["agent-1||2024-05-10"]
+        assert increments["leads.count"] == 0
+        assert increments["leads.by_status.new"] == -1
+        assert increments["leads.by_status.converted"] == 1
+        assert increments["leads.converted_value_sum"] == 250000.0
+        assert increments["leads.converted_by_source.website.value"] == 250000.0
+
+    def test_dimension_values_are_escaped_field_names(self, make_listing):
+        """Dots in locations do not create nested fields and decode back"""
+        listing = make_listing(location="St. Mark's Road, Bangalore")
+        _, _, increments = property_contribution(listing)
+        [location_field] = [f for f in increments if f.startswith("properties.by_location.")]
+        assert location_field.count(".") == 2
+        label = location_field.split(".", 2)[2]
+        assert decode_counts({label: 1}) == {"St. Mark's Road, Bangalore": 1}
+
+
+
+class TestRollupsRebuild:
+    """Test cases for the rollup rebuild job"""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_merges_into_live_counters(self, make_listing):
+        """The scan's difference to the live counters is applied with $inc, never a replace"""
+        listing = make_listing(team_id=None, price=800000.0)
+        live_bucket = {
+            "_id": "agent-1||2024-05-10",
+            "properties": {"count": 3, "by_price_range": {"750000": 3}},
+            "leads": {"count": 1},
+        }
+        gone_bucket = {"_id": "agent-2||2024-05-09", "properties": {"count": 2}}
+        rollups = MagicMock(bulk_write=AsyncMock(), delete_many=AsyncMock())
+        rollups.find.return_value.__aiter__.return_value = [live_bucket, gone_bucket]
+        db = MagicMock()
+        db.__getitem__.return_value = rollups
+        db.properties.find.return_value.batch_size.return_value.__aiter__.return_value = [listing]
+        db.leads.find.return_value.batch_size.return_value.__aiter__.return_value = [_lead()]
+
+        stats = await rebuild_analytics_rollups(db, days=30)
+
+        [operations], kwargs = rollups.bulk_write.call_args
+        assert kwargs == {"ordered": False}
+        assert not any(isinstance(op, ReplaceOne) for op in operations)
+        updates = {op._filter["_id"]: op._doc for op in operations}
+        kept = updates["agent-1||2024-05-10"]
+        assert kept["$inc"]["properties.count"] == -2
+        assert kept["$inc"]["properties.by_price_range.750000"] == -2
+        assert "leads.count" not in kept["$inc"]
+        assert kept["$setOnInsert"]["day"] == "2024-05-10"
+        assert updates["agent-2||2024-05-09"]["$inc"] == {"properties.count": -2}
+        generations = {update["$set"]["generation"] for update in updates.values()}
+        assert len(generations) == 1
+        [query], _ = rollups.delete_many.call_args
+        assert query["generation"] in generations
+        assert query["properties.count"] == {"$in": [0, None]}
+        assert "day" in query
+        assert stats["buckets"] == 2
+
+    def test_bucket_counters_flatten_sections(self):
+        """Stored buckets read back as the dotted totals the rebuild computes"""
+        bucket = {
+            "_id": "agent-1||2024-05-10",
+            "agent_id": "agent-1",
+            "properties": {"count": 1, "by_type": {"apartment": 1}, "sum_price": 800000.0},
+            "updated_at": datetime(2024, 5, 10),
+        }
+
+        assert bucket_counters(bucket) == {
+            "properties.count": 1,
+            "properties.by_type.apartment": 1,
+            "properties.sum_price": 800000.0,
+        }
+
+
+class TestLeadRollupHooks:
+    """Test cases for the lead service's rollup updates"""
+
+    @pytest.mark.asyncio
+    async def test_hooks_use_the_repository_database(self, monkeypatch):
+        """Rollups are written to the database the leads live in"""
+        apply_changes = AsyncMock()
+        monkeypatch.setattr(analytics_rollups, "apply_lead_changes", apply_changes)
+        repository = MagicMock()
+        repository.get_by_id = AsyncMock(return_value=_lead(id="l1"))
+        repository.delete = AsyncMock(return_value=True)
+
+        await LeadService(repository).delete_lead("l1", "agent-1")
+
+        apply_changes.assert_awaited_once_with(
+            repository.collection.database, [(_lead(id="l1"), None)]
+        )
@@ -0,0 +1,106 @@
+"""
+Test cases for the analytics dashboard queries
+==============================================
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.config import settings
+from app.schemas.analytics import AnalyticsFilter
+from app.services.analytics_service import AnalyticsService
+
+
+def _collection(facets):
+    """Collection mock whose aggregate cursor yields one $facet result"""
+    collection = MagicMock()
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[facets])
+    collection.aggregate = MagicMock(return_value=cursor)
+    collection.count_documents = AsyncMock(return_value=0)
+    return collection
+
+
+def _scanned_db():
+    """Database mock whose properties and leads each return one $facet result"""
+    db = MagicMock()
+    db.properties = _collection({
+        "overview": [{"count": 3}],
+        "by_status": [{"_id": "published", "count": 2}, {"_id": "draft", "count": 1}],
+        "price": [{"_id": None, "avg_price": 500000.0, "total_value": 1500000.0}],
+    })
+    db.leads = _collection({
+        "overview": [{"_id": None, "count": 4, "converted": 1, "avg_deal_value": 250000.0}],
+        "by_status": [{"_id": "new", "count": 3}, {"_id": "converted", "count": 1}],
+    })
+    return db
+
+
+class TestDashboardQueries:
+    """Test cases for the raw (non-rollup) dashboard path"""
+
+    @pytest.mark.asyncio
+    async def test_each_collection_is_scanned_once(self):
+        """Properties and leads each get a single $facet aggregate per dashboard"""
+        db = _scanned_db()
+        service = AnalyticsService(db)
+
+        with patch("app.services.analytics_service.rollups_ready", AsyncMock(return_value=False)):
+            metrics = await service.get_dashboard_metrics("agent-1", None, AnalyticsFilter())
+
+        assert db.properties.aggregate.call_count == 1
+        assert db.leads.aggregate.call_count == 1
+        db.properties.count_documents.assert_not_called()
+        db.leads.count_documents.assert_not_called()
+        assert "$facet" in db.properties.aggregate.call_args[0][0][-1]
+
+        assert metrics.failed_sections == []
+        assert metrics.property_analytics.published_properties == 2
+        assert metrics.lead_analytics.conversion_rate == 25.0
+        assert metrics.overview_metrics[0].value == 3
+
+
+class TestSectionIsolation:
+    """Test cases for section timeouts, failures and the query bound"""
+
+    @pytest.mark.asyncio
+    async def test_failed_and_slow_sections_leave_the_rest_populated(self, monkeypatch):
+        """A raising section and a timed-out section are both named; others still load"""
+        monkeypatch.setattr(settings, "analytics_section_timeout_seconds", 0.05)
+        service = AnalyticsService(_scanned_db())
+
+        async def slow_team_analytics(*args):
+            await asyncio.sleep(5)
+
+        service._get_lead_analytics = AsyncMock(side_effect=RuntimeError("leads unavailable"))
+        service._get_team_analytics = slow_team_analytics
+
+        with patch("app.services.analytics_service.rollups_ready", AsyncMock(return_value=False)):
+            metrics = await asyncio.wait_for(
+                service.get_dashboard_metrics("agent-1", "team-1", AnalyticsFilter()), timeout=2
+            )
+
+        assert sorted(metrics.failed_sections) == ["lead_analytics", "team_analytics"]
+        assert metrics.lead_analytics is None
+        assert metrics.team_analytics is None
+        assert metrics.property_analytics.published_properties == 2
+        assert metrics.overview_metrics[0].value == 3
+
+    @pytest.mark.asyncio
+    async def test_bounded_queries_never_exceed_the_limit(self, monkeypatch):
+        """_bounded lets at most analytics_max_concurrent_queries run at once"""
+        monkeypatch.setattr(settings, "analytics_max_concurrent_queries", 2)
+        service = AnalyticsService(MagicMock())
+        running = peak = 0
+
+        async def query():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(service._bounded(query()) for _ in range(6)))
+
+        assert peak == 2
@@ -0,0 +1,67 @@
+"""
+Test cases for BaseRepository writes
+====================================
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.core.exceptions import NotFoundError
+from app.repositories.base_repository import BaseRepository
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+
+def _repository(collection):
+    repository = BaseRepository("leads")
+    repository._collection = collection
+    return repository
+
+
+class TestBaseRepositoryWrites:
+    """Test cases for single round trip create and update"""
+
+    @pytest.mark.asyncio
+    async def test_create_returns_the_inserted_document(self):
+        """create issues one insert_one and never reads the document back"""
+        inserted_id = ObjectId()
+        collection = MagicMock()
+        collection.insert_one = AsyncMock(return_value=MagicMock(inserted_id=inserted_id))
+        collection.find_one = AsyncMock()
+
+        created = await _repository(collection).create({"name": "Asha"})
+
+        collection.insert_one.assert_awaited_once()
+        collection.find_one.assert_not_awaited()
+        assert created["id"] == str(inserted_id)
+        assert created["name"] == "Asha"
+        assert "_id" not in created
+
+    @pytest.mark.asyncio
+    async def test_update_returns_the_document_after_the_write(self):
+        """update is one find_one_and_update returning the updated version"""
+        document_id = ObjectId()
+        collection = MagicMock()
+        collection.find_one_and_update = AsyncMock(
+            return_value={"_id": document_id, "name": "Asha", "status": "contacted"}
+        )
+        collection.find_one = AsyncMock()
+
+        updated = await _repository(collection).update(str(document_id), {"status": "contacted"})
+
+        [query, update], kwargs = collection.find_one_and_update.call_args
+        assert query == {"_id": document_id}
+        assert update["$set"]["status"] == "contacted"
+        assert "updated_at" in update["$set"]
+        assert kwargs == {"return_document": ReturnDocument.AFTER}
+        collection.find_one.assert_not_awaited()
+        assert updated == {"id": str(document_id), "name": "Asha", "status": "contacted"}
+
+    @pytest.mark.asyncio
+    async def test_update_of_a_missing_document_raises_not_found(self):
+        """A filter that matches nothing surfaces as NotFoundError"""
+        collection = MagicMock()
+        collection.find_one_and_update = AsyncMock(return_value=None)
+
+        with pytest.raises(NotFoundError):
+            await _repository(collection).update(str(ObjectId()), {"status": "contacted"})
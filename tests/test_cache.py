@@ -0,0 +1,112 @@
+"""
+Test cases for the in-process TTL cache
+=======================================
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from app.utils.cache import StaleWhileRevalidateCache, TTLCache
+
+
+class TestTTLCache:
+    """Test cases for TTLCache"""
+
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted as hits or misses"""
+        cache = TTLCache(max_entries=4, ttl_seconds=60)
+        cache.set("a", {"title": "A"})
+
+        assert cache.get("a") == {"title": "A"}
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when full"""
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entries_are_misses(self):
+        """Entries older than the TTL are dropped on read"""
+        cache = TTLCache(max_entries=2, ttl_seconds=10)
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("app.utils.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        """Invalidation removes the entry and is counted"""
+        cache = TTLCache()
+        cache.set("a", 1)
+
+        assert cache.invalidate("a") is True
+        assert cache.invalidate("a") is False
+        assert cache.get("a") is None
+        assert cache.stats()["invalidations"] == 1
+
+
+class TestStaleWhileRevalidateCache:
+    """Test cases for StaleWhileRevalidateCache"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_computation(self):
+        """Single-flight: simultaneous misses await the same compute call"""
+        cache = StaleWhileRevalidateCache(fresh_seconds=30, max_stale_seconds=60)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return {"total": 1}
+
+        results = await asyncio.gather(*(cache.get_or_compute("a", compute) for _ in range(5)))
+
+        assert results == [{"total": 1}] * 5
+        assert len(calls) == 1
+        assert cache.stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_refreshing(self):
+        """Past the freshness window the old value is returned and refreshed in the background"""
+        cache = StaleWhileRevalidateCache(fresh_seconds=30, max_stale_seconds=60)
+        values = iter([1, 2])
+
+        async def compute():
+            return next(values)
+
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            assert await cache.get_or_compute("a", compute) == 1
+        with patch("app.utils.cache.time.monotonic", return_value=140.0):
+            assert await cache.get_or_compute("a", compute) == 1
+            await asyncio.sleep(0)
+            assert await cache.get_or_compute("a", compute) == 2
+
+        assert cache.stats()["stale_hits"] == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_results_are_not_stored(self):
+        """Results rejected by cacheable are returned but recomputed next time"""
+        cache = StaleWhileRevalidateCache()
+
+        async def compute():
+            return {"failed_sections": ["lead_analytics"]}
+
+        await cache.get_or_compute(
+            "a", compute, cacheable=lambda value: not value["failed_sections"]
+        )
+
+        assert len(cache) == 0
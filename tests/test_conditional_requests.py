@@ -0,0 +1,164 @@
+"""
+Test cases for conditional GET on read endpoints
+================================================
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+
+pytest.importorskip("fastapi_users")
+
+from app.api.v1.endpoints import agent_public, unified_properties  # noqa: E402
+from app.core.auth_backend import current_active_user  # noqa: E402
+from app.core.database import get_database  # noqa: E402
+from app.schemas.agent_public import PublicProperty  # noqa: E402
+from app.schemas.unified_property import PropertyPage, PropertySummary  # noqa: E402
+from app.services.agent_public_service import AgentPublicService  # noqa: E402
+from app.services.unified_property_service import UnifiedPropertyService  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+UPDATED_AT = datetime(2024, 5, 10)
+
+
+def _stored_property(**overrides):
+    doc = {
+        "_id": ObjectId(),
+        "agent_id": "agent-1",
+        "title": "Sea-facing apartment",
+        "description": "Two bedroom apartment",
+        "property_type": "apartment",
+        "price": 10000000.0,
+        "location": "Bandra West, Mumbai",
+        "bedrooms": 2,
+        "bathrooms": 2,
+        "created_at": UPDATED_AT,
+        "updated_at": UPDATED_AT,
+    }
+    doc.update(overrides)
+    return doc
+
+
+def _public_property(**overrides):
+    data = {
+        "id": "p1",
+        "agent_id": "agent-1",
+        "title": "Sea-facing apartment",
+        "description": "Two bedroom apartment",
+        "price": 10000000.0,
+        "property_type": "Apartment",
+        "location": "Bandra West, Mumbai",
+        "created_at": UPDATED_AT,
+        "updated_at": UPDATED_AT,
+    }
+    data.update(overrides)
+    return PublicProperty(**data)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """App with the property and agent public routers and stubbed dependencies"""
+    app = FastAPI()
+    app.include_router(unified_properties.router)
+    app.include_router(agent_public.router)
+    app.dependency_overrides[current_active_user] = lambda: SimpleNamespace(id="agent-1")
+    app.dependency_overrides[get_database] = lambda: MagicMock()
+
+    service = UnifiedPropertyService(MagicMock())
+    monkeypatch.setattr(unified_properties, "get_unified_property_service", lambda: service)
+
+    agent = SimpleNamespace(
+        id="agent-1", agent_name="Asha Rao", is_public=True,
+        updated_at=UPDATED_AT, properties=[],
+    )
+    monkeypatch.setattr(AgentPublicService, "get_agent_by_slug", AsyncMock(return_value=agent))
+    monkeypatch.setattr(AgentPublicService, "increment_view_count", AsyncMock())
+    monkeypatch.setattr(AgentPublicService, "increment_property_view_count", AsyncMock())
+    return TestClient(app), service
+
+
+def _revalidate(client, url):
+    """First GET, then a conditional GET with the returned ETag"""
+    first = client.get(url)
+    assert first.status_code == 200
+    second = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    return first, second
+
+
+class TestPropertyConditionalGet:
+    """Test cases for /properties/ and /properties/{id}"""
+
+    def test_property_detail_revalidates_to_304(self, client):
+        """An unchanged document answers 304 with its validators"""
+        client, service = client
+        doc = _stored_property()
+        service.get_property_document = AsyncMock(side_effect=lambda *args: dict(doc))
+
+        first, second = _revalidate(client, f"/properties/{doc['_id']}")
+
+        assert second.status_code == 304
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert second.headers["Cache-Control"] == "private, no-cache"
+        assert second.content == b""
+
+        doc["updated_at"] = datetime(2024, 5, 11)
+        third = client.get(
+            f"/properties/{doc['_id']}",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        assert third.status_code == 200
+
+    def test_property_list_revalidates_to_304(self, client):
+        """A list page answers 304 while its items and cursor are unchanged"""
+        client, service = client
+        summary = PropertySummary(
+            id="p1", title="A", property_type="apartment", price=1.0, location="Bandra West",
+            bedrooms=2, bathrooms=2, created_at=UPDATED_AT, updated_at=UPDATED_AT,
+        )
+        service.get_properties_by_user = AsyncMock(return_value=PropertyPage(items=[summary]))
+
+        first, second = _revalidate(client, "/properties/")
+
+        assert second.status_code == 304
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+
+class TestAgentPublicConditionalGet:
+    """Test cases for the public agent pages"""
+
+    def test_public_properties_revalidate_to_304(self, client, monkeypatch):
+        """The listing page ETag comes from the cards, not the serialized body"""
+        client, _ = client
+        cards = {"properties": [_public_property()], "total": 1, "total_pages": 1}
+        monkeypatch.setattr(
+            AgentPublicService, "get_agent_properties", AsyncMock(return_value=cards)
+        )
+
+        first, second = _revalidate(client, "/agent-public/asha/properties")
+
+        assert first.json()["agent_name"] == "Asha Rao"
+        assert second.status_code == 304
+        assert second.headers["Cache-Control"].startswith("public, max-age=")
+        page_two = client.get(
+            "/agent-public/asha/properties?page=2",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        assert page_two.status_code == 200
+
+    def test_public_property_detail_revalidates_to_304(self, client, monkeypatch):
+        """A public property answers 304 until its updated_at moves"""
+        client, _ = client
+        monkeypatch.setattr(
+            AgentPublicService, "get_agent_property", AsyncMock(return_value=_public_property())
+        )
+
+        first, second = _revalidate(client, "/agent-public/asha/properties/p1")
+
+        assert first.json()["id"] == "p1"
+        assert second.status_code == 304
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert second.headers["Cache-Control"].startswith("public, max-age=")
@@ -0,0 +1,82 @@
+"""
+Test cases for buffered engagement event ingestion
+==================================================
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services import engagement_events
+from app.services.engagement_events import flush_events, pending_events, record_event
+
+
+def _db():
+    collections = {
+        engagement_events.COUNTERS_COLLECTION: MagicMock(bulk_write=AsyncMock()),
+        engagement_events.EVENTS_COLLECTION: MagicMock(insert_many=AsyncMock()),
+        engagement_events.SERIES_COLLECTION: MagicMock(bulk_write=AsyncMock()),
+    }
+    db = MagicMock()
+    db.__getitem__.side_effect = collections.__getitem__
+    return db, collections
+
+
+class TestEngagementEvents:
+    """Test cases for record_event and flush_events"""
+
+    @pytest.mark.asyncio
+    async def test_events_are_buffered_and_flushed_in_one_batch(self):
+        """Recording never touches the database; a flush folds events into per-day counters"""
+        db, collections = _db()
+        await flush_events(db)
+
+        record_event("property", "p1", "views", agent_id="agent-1")
+        record_event("property", "p1", "views", agent_id="agent-1")
+        record_event("property", "p1", "inquiries", agent_id="agent-1")
+        record_event("agent", "agent-1", "views", agent_id="agent-1")
+
+        assert pending_events() == 4
+        collections[engagement_events.COUNTERS_COLLECTION].bulk_write.assert_not_called()
+
+        assert await flush_events(db) == 4
+        assert pending_events() == 0
+
+        [operations], _ = collections[engagement_events.COUNTERS_COLLECTION].bulk_write.call_args
+        increments = {op._filter["_id"].split("|")[0]: op._doc["$inc"] for op in operations}
+        assert increments == {"property": {"views": 2, "inquiries": 1}, "agent": {"views": 1}}
+        [events], _ = collections[engagement_events.EVENTS_COLLECTION].insert_many.call_args
+        assert len(events) == 4
+
+    def test_unknown_metrics_are_rejected(self):
+        """Only the known counter fields can be incremented"""
+        assert record_event("property", "p1", "$set") is False
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_the_flusher_then_flushes(self):
+        """Stopping cancels and awaits the background task before the final flush"""
+        db, collections = _db()
+        await flush_events(db)
+
+        engagement_events.start_engagement_flusher(db)
+        task = engagement_events._flush_task
+        record_event("property", "p1", "views", agent_id="agent-1")
+
+        await engagement_events.stop_engagement_flusher()
+
+        assert task.done()
+        assert engagement_events._flush_task is None
+        assert pending_events() == 0
+        collections[engagement_events.EVENTS_COLLECTION].insert_many.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_raw_events_carry_their_expiry(self):
+        """Raw events are stamped with expires_at from the retention setting"""
+        db, collections = _db()
+        await flush_events(db)
+
+        record_event("property", "p1", "shares")
+        await flush_events(db)
+
+        [[event]], _ = collections[engagement_events.EVENTS_COLLECTION].insert_many.call_args
+        retention = event["expires_at"] - event["occurred_at"]
+        assert retention.days == engagement_events.settings.engagement_event_retention_days
@@ -0,0 +1,42 @@
+"""
+Test cases for engagement time-series buckets
+=============================================
+"""
+
+from datetime import datetime, timedelta
+
+from app.services.engagement_series import DAY, HOUR, MINUTE, choose_resolution, series_operations
+
+
+def _event(minute, metric="views"):
+    return {
+        "entity_type": "property",
+        "entity_id": "p1",
+        "metric": metric,
+        "occurred_at": datetime(2024, 5, 10, 14, minute, 30),
+    }
+
+
+class TestEngagementSeries:
+    """Test cases for bucketing and resolution choice"""
+
+    def test_events_fold_into_minute_and_hour_buckets(self):
+        """One flush writes one minute bucket and one hour bucket per entity"""
+        operations = series_operations([_event(5), _event(5), _event(7, "shares")])
+
+        updates = {op._filter["_id"].split("|")[2]: op._doc for op in operations}
+        assert updates[MINUTE]["$inc"] == {"counts.05.views": 2, "counts.07.shares": 1}
+        assert updates[MINUTE]["$setOnInsert"]["start"] == datetime(2024, 5, 10, 14)
+        assert updates[HOUR]["$inc"] == {"counts.14.views": 2, "counts.14.shares": 1}
+        assert updates[HOUR]["$setOnInsert"]["start"] == datetime(2024, 5, 10)
+        hour_expiry = updates[HOUR]["$setOnInsert"]["expires_at"]
+        assert hour_expiry > updates[MINUTE]["$setOnInsert"]["expires_at"]
+
+    def test_resolution_follows_span_and_retention(self):
+        """Short recent spans chart per minute, longer or older ones coarser"""
+        now = datetime(2024, 5, 10, 12)
+
+        assert choose_resolution(now - timedelta(hours=2), now, now) == MINUTE
+        assert choose_resolution(now - timedelta(days=3), now, now) == HOUR
+        assert choose_resolution(now - timedelta(days=30), now, now) == DAY
+        assert choose_resolution(now - timedelta(days=400), now - timedelta(days=399), now) == DAY
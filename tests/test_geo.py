@@ -0,0 +1,140 @@
+"""
+Test cases for geo utilities and geospatial property queries
+============================================================
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services.unified_property_service import UnifiedPropertyService
+from app.utils.geo import EARTH_RADIUS_KM, Gazetteer, bounding_box_polygon
+
+
+def _gazetteer(tmp_path):
+    path = tmp_path / "gazetteer.csv"
+    path.write_text(
+        "name,latitude,longitude\n"
+        "Bandra,19.0596,72.8295\n"
+        "Bandra West,19.0600,72.8300\n"
+        "Mumbai,19.0760,72.8777\n"
+        "Broken,not-a-number,72.0\n",
+        encoding="utf-8",
+    )
+    return Gazetteer.from_csv(path)
+
+
+def _service(docs):
+    collection = MagicMock()
+    collection.find.return_value.limit.return_value.to_list = AsyncMock(return_value=docs)
+    collection.aggregate.return_value.to_list = AsyncMock(return_value=docs)
+    db = MagicMock()
+    db.properties = collection
+    return UnifiedPropertyService(db), collection
+
+
+class TestGazetteer:
+    """Test cases for the CSV gazetteer lookup"""
+
+    def test_malformed_rows_are_skipped(self, tmp_path):
+        """Rows without numeric coordinates are left out"""
+        assert len(_gazetteer(tmp_path)) == 3
+
+    def test_lookup_normalizes_case_whitespace_and_punctuation(self, tmp_path):
+        """Names match regardless of case, extra spaces or punctuation"""
+        gazetteer = _gazetteer(tmp_path)
+        expected = {"type": "Point", "coordinates": [72.83, 19.06]}
+
+        assert gazetteer.lookup("  bandra   WEST , Mumbai") == expected
+        assert gazetteer.lookup("Flat 4, Bandra-West") == expected
+
+    def test_longest_contained_name_wins(self, tmp_path):
+        """Without an exact part match the most specific name in the text is used"""
+        gazetteer = _gazetteer(tmp_path)
+
+        assert gazetteer.lookup("Near Bandra West station")["coordinates"] == [72.83, 19.06]
+        assert gazetteer.lookup("Near Bandra station")["coordinates"] == [72.8295, 19.0596]
+
+    def test_unknown_or_empty_locations_return_none(self, tmp_path):
+        """Places missing from the gazetteer are not geocoded"""
+        gazetteer = _gazetteer(tmp_path)
+
+        assert gazetteer.lookup("Koregaon Park, Pune") is None
+        assert gazetteer.lookup("") is None
+        assert gazetteer.lookup(None) is None
+
+
+class TestGeoQueries:
+    """Test cases for the geospatial query builders"""
+
+    def test_bounding_box_is_a_closed_ring(self):
+        """The polygon ring starts and ends at the south-west corner"""
+        polygon = bounding_box_polygon(72.8, 19.0, 72.9, 19.1)
+
+        assert polygon["type"] == "Polygon"
+        [ring] = polygon["coordinates"]
+        assert ring == [[72.8, 19.0], [72.9, 19.0], [72.9, 19.1], [72.8, 19.1], [72.8, 19.0]]
+
+    @pytest.mark.asyncio
+    async def test_radius_search_uses_center_sphere_in_radians(self):
+        """The radius in km is converted to radians on the Earth's sphere"""
+        service, collection = _service([])
+
+        await service.find_properties_within_radius(72.83, 19.06, 5, user_id="agent-1")
+
+        [query, _], _ = collection.find.call_args
+        assert query == {
+            "geo_location": {
+                "$geoWithin": {"$centerSphere": [[72.83, 19.06], 5 / EARTH_RADIUS_KM]}
+            },
+            "agent_id": "agent-1",
+        }
+
+    @pytest.mark.asyncio
+    async def test_bounding_box_search_uses_a_polygon_geometry(self):
+        """Box searches match within the box polygon"""
+        service, collection = _service([])
+
+        await service.find_properties_in_bounding_box(72.8, 19.0, 72.9, 19.1)
+
+        [query, _], _ = collection.find.call_args
+        assert query == {
+            "geo_location": {
+                "$geoWithin": {"$geometry": bounding_box_polygon(72.8, 19.0, 72.9, 19.1)}
+            }
+        }
+
+    @pytest.mark.asyncio
+    async def test_nearest_search_runs_geo_near_and_reports_km(self):
+        """$geoNear is the first stage; distances come back in kilometres"""
+        doc = {
+            "_id": "p1",
+            "distance_m": 1234.5,
+            "title": "A",
+            "property_type": "apartment",
+            "price": 10000000.0,
+            "location": "Bandra West, Mumbai",
+            "bedrooms": 2,
+            "bathrooms": 2,
+            "created_at": datetime(2024, 5, 10),
+            "updated_at": datetime(2024, 5, 10),
+        }
+        service, collection = _service([doc])
+
+        [nearest] = await service.find_nearest_properties(
+            72.83, 19.06, limit=5, max_distance_km=2, user_id="agent-1"
+        )
+
+        [pipeline], _ = collection.aggregate.call_args
+        assert pipeline[0] == {
+            "$geoNear": {
+                "near": {"type": "Point", "coordinates": [72.83, 19.06]},
+                "distanceField": "distance_m",
+                "key": "geo_location",
+                "spherical": True,
+                "maxDistance": 2000,
+                "query": {"agent_id": "agent-1"},
+            }
+        }
+        assert pipeline[1] == {"$limit": 5}
+        assert (nearest.id, nearest.distance_km) == ("p1", 1.234)
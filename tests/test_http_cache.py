@@ -0,0 +1,77 @@
+"""
+Test cases for HTTP caching helpers
+===================================
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.core.http_cache import (
+    collection_etag,
+    document_etag,
+    etag_matches,
+    not_modified,
+    public_cache_control,
+)
+from starlette.requests import Request
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestEtagMatches:
+    """Test cases for etag_matches"""
+
+    def test_exact_and_listed_tags_match(self):
+        """The tag may appear alone or in a comma-separated list"""
+        etag = document_etag({"_id": "p1", "updated_at": datetime(2024, 5, 10)})
+
+        assert etag_matches(_request(etag), etag)
+        assert etag_matches(_request(f'"other", {etag}'), etag)
+        assert not etag_matches(_request('"other"'), etag)
+        assert not etag_matches(_request(), etag)
+
+    def test_weak_tags_and_wildcard_match(self):
+        """If-None-Match uses weak comparison and * matches any current tag"""
+        etag = document_etag({"_id": "p1", "updated_at": datetime(2024, 5, 10)})
+
+        assert etag_matches(_request(f"W/{etag}"), etag)
+        assert etag_matches(_request("*"), etag)
+
+
+class TestEtags:
+    """Test cases for document_etag and collection_etag"""
+
+    def test_document_etag_moves_with_updated_at(self):
+        """Any write that bumps updated_at changes the tag"""
+        doc = {"_id": "p1", "updated_at": datetime(2024, 5, 10)}
+
+        assert document_etag(doc) == document_etag(dict(doc))
+        assert document_etag(doc) != document_etag({**doc, "updated_at": datetime(2024, 5, 11)})
+
+    def test_collection_etag_covers_items_and_page(self):
+        """Item versions and the page position both version a list"""
+        items = [
+            SimpleNamespace(id="p1", updated_at=datetime(2024, 5, 10), quality_score=80),
+            {"_id": "p2", "updated_at": datetime(2024, 5, 10)},
+        ]
+        etag = collection_etag(items, "cursor-1")
+
+        assert etag == collection_etag(list(items), "cursor-1")
+        assert etag != collection_etag(items, "cursor-2")
+        assert etag != collection_etag(items[:1], "cursor-1")
+        edited = [items[0], {**items[1], "updated_at": datetime(2024, 5, 11)}]
+        assert etag != collection_etag(edited, "cursor-1")
+        rescored = [SimpleNamespace(**{**vars(items[0]), "quality_score": 60}), items[1]]
+        assert etag != collection_etag(rescored, "cursor-1")
+
+    def test_not_modified_carries_the_validators(self):
+        """304 responses repeat the ETag and Cache-Control"""
+        response = not_modified('"abc"', public_cache_control(60))
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == '"abc"'
+        assert response.headers["Cache-Control"] == "public, max-age=60, stale-while-revalidate=300"
+        assert response.body == b""
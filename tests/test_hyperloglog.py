@@ -0,0 +1,50 @@
+"""
+Test cases for the HyperLogLog sketch
+=====================================
+"""
+
+import pytest
+from app.utils.hyperloglog import HyperLogLog, position
+
+
+class TestHyperLogLog:
+    """Test cases for HyperLogLog estimates and merges"""
+
+    def test_repeated_items_count_once(self):
+        """Refreshes by the same visitor do not raise the estimate"""
+        sketch = HyperLogLog()
+        for _ in range(100):
+            sketch.add("203.0.113.7|Mozilla/5.0")
+
+        assert sketch.count() == 1
+
+    @pytest.mark.parametrize("cardinality", [1000, 50000])
+    def test_estimate_within_error_bound(self, cardinality):
+        """Estimates stay within a few standard errors (1.6% at p=12)"""
+        sketch = HyperLogLog()
+        for i in range(cardinality):
+            sketch.add(f"visitor-{i}")
+
+        assert abs(sketch.count() - cardinality) / cardinality < 0.05
+
+    def test_merge_is_union_of_days(self):
+        """Merging daily sketches counts visitors seen on several days once"""
+        monday, tuesday = HyperLogLog(), HyperLogLog()
+        for i in range(3000):
+            monday.add(f"visitor-{i}")
+        for i in range(2000, 5000):
+            tuesday.add(f"visitor-{i}")
+
+        monday.merge(tuesday)
+        assert abs(monday.count() - 5000) / 5000 < 0.05
+
+    def test_sparse_round_trip(self):
+        """Stored {index: rank} registers rebuild the same sketch"""
+        sketch = HyperLogLog()
+        for i in range(500):
+            sketch.add(f"visitor-{i}")
+
+        restored = HyperLogLog.from_sparse(sketch.to_sparse())
+        assert restored.registers == sketch.registers
+        index, rank = position("visitor-1")
+        assert restored.registers[index] >= rank
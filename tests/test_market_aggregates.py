@@ -0,0 +1,111 @@
+"""
+Test cases for incremental market aggregates
+============================================
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services.market_aggregates import (
+    ACTIVE_FILTER,
+    add_change,
+    aggregate_key,
+    new_totals,
+    property_contribution,
+)
+from app.utils.market_aggregates_rebuild import aggregate_counters, rebuild_market_aggregates
+
+
+class TestMarketAggregates:
+    """Test cases for market aggregate contributions"""
+
+    def test_key_uses_first_location_part(self):
+        """Localities are normalized to the first comma-separated part"""
+        assert aggregate_key("  Bandra   West , Mumbai", "Apartment") == "bandra west|apartment"
+
+    def test_inactive_listings_do_not_count(self, make_listing):
+        """Only active, priced listings contribute"""
+        assert property_contribution(make_listing(status="sold")) is None
+        assert property_contribution(make_listing(price=0)) is None
+
+    def test_listings_without_status_count_as_active(self, make_listing):
+        """The contribution rule and the rebuild query agree on missing status"""
+        listing = make_listing()
+        listing.pop("status", None)
+        assert property_contribution(listing) is not None
+        assert property_contribution({**listing, "status": None}) is not None
+        assert None in ACTIVE_FILTER["status"]["$in"]
+
+    def test_update_applies_net_difference(self, make_listing):
+        """A price change only moves the price sums"""
+        totals = new_totals()
+        add_change(totals, make_listing(), make_listing(price=12000000.0))
+
+        increments = dict(totals["bandra west|apartment"])
+        assert increments["count"] == 0
+        assert increments["sum_price"] == 2000000.0
+        assert increments["monthly.2024-05.sum_price"] == 2000000.0
+
+    def test_moving_locality_transfers_counts(self, make_listing):
+        """Changing location decrements one aggregate and increments another"""
+        totals = new_totals()
+        add_change(totals, make_listing(), make_listing(location="Powai, Mumbai"))
+
+        assert totals["bandra west|apartment"]["count"] == -1
+        assert totals["powai|apartment"]["count"] == 1
+
+
+class TestMarketAggregatesRebuild:
+    """Test cases for the market aggregates rebuild job"""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_merges_into_live_counters(self, make_listing):
+        """The scan's difference to the live counters is applied with $inc"""
+        live = {
+            "_id": "bandra west|apartment",
+            "locality": "bandra west",
+            "property_type": "apartment",
+            "count": 3,
+            "sum_price": 30000000.0,
+            "monthly": {"2024-05": {"count": 3}},
+        }
+        collection = MagicMock(bulk_write=AsyncMock(), delete_many=AsyncMock())
+        collection.find.return_value.__aiter__.return_value = [live]
+        db = MagicMock()
+        db.__getitem__.return_value = collection
+        db.properties.find.return_value.batch_size.return_value.__aiter__.return_value = [
+            make_listing(), make_listing(location="Powai, Mumbai")
+        ]
+
+        await rebuild_market_aggregates(db)
+
+        [query, _], _ = db.properties.find.call_args
+        assert query == ACTIVE_FILTER
+        [operations], _ = collection.bulk_write.call_args
+        updates = {op._filter["_id"]: op._doc for op in operations}
+        assert updates["bandra west|apartment"]["$inc"]["count"] == -2
+        assert updates["bandra west|apartment"]["$inc"]["monthly.2024-05.count"] == -2
+        assert updates["powai|apartment"]["$inc"]["count"] == 1
+        assert updates["powai|apartment"]["$setOnInsert"] == {
+            "locality": "powai", "property_type": "apartment"
+        }
+        [cleanup], _ = collection.delete_many.call_args
+        assert cleanup["count"] == {"$in": [0, None]}
+        assert cleanup["generation"] == updates["powai|apartment"]["$set"]["generation"]
+
+    def test_stored_counters_match_the_totals_form(self, make_listing):
+        """Stored aggregates read back as dotted paths, monthly buckets included"""
+        totals = new_totals()
+        add_change(totals, None, make_listing())
+        stored = {
+            "_id": "bandra west|apartment",
+            "locality": "bandra west",
+            "property_type": "apartment",
+            "count": 1,
+            "sum_price": 10000000.0,
+            "monthly": {"2024-05": {"count": 1, "sum_price": 10000000.0}},
+        }
+
+        counters = aggregate_counters(stored)
+        assert counters["monthly.2024-05.sum_price"] == 10000000.0
+        assert set(counters) <= set(totals["bandra west|apartment"])
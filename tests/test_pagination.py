@@ -0,0 +1,65 @@
+"""
+Test cases for keyset pagination helpers
+========================================
+"""
+
+from datetime import datetime
+
+import pytest
+from app.core.exceptions import ValidationError
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter, merge_filters
+from bson import ObjectId
+
+
+class TestKeysetPagination:
+    """Test cases for cursor encoding and keyset filters"""
+
+    def test_cursor_round_trip_with_datetime(self):
+        """Datetime sort keys survive encoding"""
+        created_at = datetime(2024, 1, 15, 10, 30, 0)
+        doc_id = ObjectId()
+
+        sort_value, last_id = decode_cursor(encode_cursor(created_at, doc_id))
+
+        assert sort_value == created_at
+        assert last_id == doc_id
+
+    def test_cursor_round_trip_with_number(self):
+        """Numeric sort keys (e.g. text scores) survive encoding"""
+        doc_id = ObjectId()
+
+        sort_value, last_id = decode_cursor(encode_cursor(1.75, doc_id))
+
+        assert sort_value == 1.75
+        assert last_id == doc_id
+
+    def test_invalid_cursor_raises_validation_error(self):
+        """Garbage cursors are rejected"""
+        with pytest.raises(ValidationError):
+            decode_cursor("not-a-cursor")
+
+    def test_keyset_filter_descending(self):
+        """Descending pages select strictly older items with an _id tie-break"""
+        created_at = datetime(2024, 1, 15)
+        doc_id = ObjectId()
+
+        query = keyset_filter("created_at", encode_cursor(created_at, doc_id))
+
+        assert query == {
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": doc_id}},
+            ]
+        }
+
+    def test_keyset_filter_without_cursor(self):
+        """First page has no range predicate"""
+        assert keyset_filter("created_at", None) == {}
+
+    def test_merge_filters_keeps_existing_or(self):
+        """Merging never overwrites an $or already present in the base query"""
+        base = {"agent_id": "a1", "$or": [{"title": "x"}]}
+        page = {"$or": [{"created_at": {"$lt": 1}}]}
+
+        assert merge_filters(base, page) == {"$and": [base, page]}
+        assert merge_filters(base, {}) == base
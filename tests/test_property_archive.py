@@ -0,0 +1,101 @@
+"""
+Test cases for the property archive tier
+========================================
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+import pytest
+from app.services import property_archive
+from app.services.job_leases import HOLDER_ID
+from app.services.property_archive import (
+    ARCHIVE_COLLECTION,
+    ARCHIVE_LEASE,
+    archivable_filter,
+    archive_properties,
+)
+from pymongo.errors import DuplicateKeyError
+
+
+def _db(found, deleted_count, still_live):
+    """found: the batch read; still_live: ids left in properties after the delete"""
+    properties = MagicMock()
+    properties.find.side_effect = [
+        MagicMock(sort=MagicMock(return_value=MagicMock(limit=MagicMock(return_value=MagicMock(
+            to_list=AsyncMock(return_value=found)
+        ))))),
+        MagicMock(to_list=AsyncMock(return_value=[{"_id": i} for i in still_live])),
+        MagicMock(sort=MagicMock(return_value=MagicMock(limit=MagicMock(return_value=MagicMock(
+            to_list=AsyncMock(return_value=[])
+        ))))),
+    ]
+    properties.delete_many = AsyncMock(return_value=MagicMock(deleted_count=deleted_count))
+    archive = MagicMock(bulk_write=AsyncMock(), delete_many=AsyncMock())
+
+    db = MagicMock()
+    db.properties = properties
+    db.__getitem__.side_effect = {ARCHIVE_COLLECTION: archive}.__getitem__
+    return db, archive
+
+
+class TestPropertyArchive:
+    """Test cases for archive_properties"""
+
+    def test_filter_matches_aged_off_market_listings(self):
+        """Sold, inactive or archived listings older than the cutoff qualify"""
+        cutoff = datetime(2024, 1, 1)
+        criteria = archivable_filter(cutoff)
+
+        assert criteria["updated_at"] == {"$lt": cutoff}
+        assert {"publishing_status": "archived"} in criteria["$or"]
+
+    @pytest.mark.asyncio
+    async def test_removed_listings_update_every_read_model(self, make_listing, monkeypatch):
+        """One delete_many moves the batch; reactivated listings leave the archive"""
+        aged = datetime(2023, 1, 1)
+        moved = make_listing("p1", status="sold", updated_at=aged)
+        unpublished = make_listing("p2", publishing_status="archived", updated_at=aged)
+        reactivated = make_listing("p3", status="sold", updated_at=aged)
+        db, archive = _db(
+            found=[moved, unpublished, reactivated], deleted_count=2, still_live=["p3"]
+        )
+        record_changes = AsyncMock()
+        monkeypatch.setattr(property_archive, "record_property_changes", record_changes)
+
+        stats = await archive_properties(db, older_than_days=365, batch_size=10)
+
+        assert stats == {"scanned": 3, "archived": 2}
+        [operations], _ = archive.bulk_write.call_args
+        assert [op._filter["_id"] for op in operations] == ["p1", "p2", "p3"]
+        [query], _ = db.properties.delete_many.call_args
+        assert query["_id"] == {"$in": ["p1", "p2", "p3"]}
+        assert query["updated_at"] == {"$lt": ANY}
+        archive.delete_many.assert_awaited_once_with({"_id": {"$in": ["p3"]}})
+        record_changes.assert_awaited_once_with(db, [(moved, None), (unpublished, None)])
+
+
+class TestArchiveLease:
+    """Test cases for the scheduled sweep's job lease"""
+
+    @pytest.mark.asyncio
+    async def test_sweep_runs_only_in_the_lease_holder(self, monkeypatch):
+        """A worker that cannot take the lease skips the run"""
+        runs = AsyncMock()
+        monkeypatch.setattr(property_archive, "archive_properties", runs)
+        sleep = AsyncMock(side_effect=asyncio.CancelledError)
+        monkeypatch.setattr(property_archive.asyncio, "sleep", sleep)
+        db = MagicMock()
+        db.__getitem__.return_value.update_one = AsyncMock(
+            side_effect=DuplicateKeyError("E11000 duplicate key")
+        )
+
+        with pytest.raises(asyncio.CancelledError):
+            await property_archive._archive_loop(db, 3600)
+
+        runs.assert_not_awaited()
+        [query, update], kwargs = db.__getitem__.return_value.update_one.call_args
+        assert query["_id"] == ARCHIVE_LEASE
+        assert update["$set"]["holder"] == HOLDER_ID
+        assert kwargs == {"upsert": True}
@@ -0,0 +1,135 @@
+"""
+Test cases for spreadsheet property imports
+===========================================
+"""
+
+import csv
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.schemas.unified_property import PropertyImportJob
+from app.services.property_import_service import (
+    JOB_RETENTION,
+    JOBS_COLLECTION,
+    fail_stale_import_jobs,
+    iter_csv_rows,
+    iter_excel_rows,
+    save_import_job,
+    validate_import_rows,
+)
+
+HEADER = ["Title", "Description", "Property Type", "Price", "Location", "Bedrooms", "Bathrooms",
+          "Features"]
+VALID_ROW = ["Sea view flat", "Two bedroom flat near the promenade", "apartment", "12500000",
+             "Bandra West, Mumbai", "2", "2", "Parking; Gym | Pool"]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        csv.writer(f).writerows(rows)
+    return path
+
+
+class TestPropertyImportParsing:
+    """Test cases for CSV and Excel row parsing"""
+
+    def test_csv_rows_are_normalized(self, tmp_path):
+        """Headers become field names, empty cells are dropped and list cells are split"""
+        path = _write_csv(tmp_path / "listings.csv", [
+            HEADER,
+            VALID_ROW,
+            [""] * len(HEADER),
+            ["Studio", "", "apartment", "4000000", "Andheri East", "1", "1", ""],
+        ])
+
+        rows = list(iter_csv_rows(path))
+
+        assert [row_number for row_number, _ in rows] == [2, 4]
+        _, first = rows[0]
+        assert first["title"] == "Sea view flat"
+        assert first["property_type"] == "apartment"
+        assert first["features"] == ["Parking", "Gym", "Pool"]
+        _, second = rows[1]
+        assert "description" not in second
+        assert "features" not in second
+
+    def test_excel_rows_are_normalized(self, tmp_path):
+        """The first worksheet is read like a CSV, keeping typed cell values"""
+        openpyxl = pytest.importorskip("openpyxl")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(HEADER)
+        sheet.append(["Sea view flat", "Two bedroom flat near the promenade", "apartment", 12500000,
+                      "Bandra West, Mumbai", 2, 2, "Parking;Gym"])
+        sheet.append([None] * len(HEADER))
+        path = tmp_path / "listings.xlsx"
+        workbook.save(path)
+
+        rows = list(iter_excel_rows(path))
+
+        assert len(rows) == 1
+        row_number, row = rows[0]
+        assert row_number == 2
+        assert row["price"] == 12500000
+        assert row["features"] == ["Parking", "Gym"]
+
+
+class TestPropertyImportValidation:
+    """Test cases for validate_import_rows"""
+
+    def test_valid_and_invalid_rows_are_separated(self, tmp_path):
+        """Valid rows become PropertyCreate models; invalid ones report the failing fields"""
+        path = _write_csv(tmp_path / "listings.csv", [
+            HEADER,
+            VALID_ROW,
+            ["Broken", "Unparseable price", "apartment", "not-a-number", "Pune", "2", "1", ""],
+        ])
+
+        valid, errors = validate_import_rows(list(iter_csv_rows(path)))
+
+        assert [(row_number, model.price) for row_number, model in valid] == [(2, 12500000.0)]
+        [(row_number, message)] = errors
+        assert row_number == 3
+        assert "price" in message
+
+
+class TestStaleImportJobs:
+    """Test cases for failing jobs orphaned by a dead worker"""
+
+    @pytest.mark.asyncio
+    async def test_unfinished_jobs_without_recent_progress_fail(self):
+        """Only queued or running jobs older than the timeout become failed"""
+        collection = MagicMock()
+        collection.update_many = AsyncMock(return_value=MagicMock(modified_count=2))
+        db = MagicMock()
+        db.__getitem__.return_value = collection
+
+        failed = await fail_stale_import_jobs(db, stale_after=timedelta(minutes=30))
+
+        assert failed == 2
+        db.__getitem__.assert_called_with(JOBS_COLLECTION)
+        [query, update], _ = collection.update_many.call_args
+        assert query["status"] == {"$in": ["queued", "running"]}
+        cutoff = query["updated_at"]["$lt"]
+        assert timedelta(minutes=29) < datetime.utcnow() - cutoff < timedelta(minutes=31)
+        assert update["$set"]["status"] == "failed"
+        assert update["$set"]["expires_at"] == update["$set"]["finished_at"] + JOB_RETENTION
+
+    @pytest.mark.asyncio
+    async def test_saved_jobs_record_their_last_progress(self):
+        """Every save stamps updated_at; only finished jobs get an expiry"""
+        collection = MagicMock()
+        collection.replace_one = AsyncMock()
+        db = MagicMock()
+        db.__getitem__.return_value = collection
+        job = PropertyImportJob(
+            job_id="job-1", agent_id="agent-1", filename="listings.csv",
+            status="running", created_at=datetime.utcnow()
+        )
+
+        await save_import_job(db, job)
+
+        [_, document], _ = collection.replace_one.call_args
+        assert isinstance(document["updated_at"], datetime)
+        assert "expires_at" not in document
@@ -0,0 +1,68 @@
+"""
+Test cases for the property read model fan-out
+==============================================
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services import property_read_models
+from app.services.property_read_models import record_property_changes
+
+
+class TestRecordPropertyChanges:
+    """Test cases for record_property_changes"""
+
+    @pytest.mark.asyncio
+    async def test_writers_run_concurrently(self, make_listing, monkeypatch):
+        """Every derived writer starts before any of them finishes"""
+        names = ("market", "rollups", "transitions", "snapshots")
+        started = []
+        all_started, release = asyncio.Event(), asyncio.Event()
+
+        def writer(name):
+            async def write(db, arg):
+                started.append(name)
+                if len(started) == len(names):
+                    all_started.set()
+                await release.wait()
+            return write
+
+        monkeypatch.setattr(
+            property_read_models.market_aggregates, "apply_property_changes", writer("market")
+        )
+        monkeypatch.setattr(
+            property_read_models.analytics_rollups, "apply_property_changes", writer("rollups")
+        )
+        monkeypatch.setattr(property_read_models, "record_transitions", writer("transitions"))
+        monkeypatch.setattr(property_read_models, "refresh_agent_snapshots", writer("snapshots"))
+        monkeypatch.setattr(property_read_models, "similarity_index", MagicMock())
+
+        task = asyncio.create_task(record_property_changes(MagicMock(), [(None, make_listing())]))
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+
+        assert sorted(started) == sorted(names)
+        release.set()
+        await task
+
+    @pytest.mark.asyncio
+    async def test_similarity_index_follows_inserts_and_deletes(self, make_listing, monkeypatch):
+        """New documents are upserted and deleted ones removed"""
+        for target in ("market_aggregates", "analytics_rollups"):
+            monkeypatch.setattr(
+                getattr(property_read_models, target), "apply_property_changes", AsyncMock()
+            )
+        monkeypatch.setattr(property_read_models, "record_transitions", AsyncMock())
+        snapshots = AsyncMock()
+        monkeypatch.setattr(property_read_models, "refresh_agent_snapshots", snapshots)
+        index = MagicMock()
+        monkeypatch.setattr(property_read_models, "similarity_index", index)
+        created, deleted = make_listing("p1"), make_listing("p2")
+
+        db = MagicMock()
+        await record_property_changes(db, [(None, created), (deleted, None)])
+
+        index.upsert.assert_called_once_with(created)
+        index.remove.assert_called_once_with("p2")
+        snapshots.assert_awaited_once_with(db, ["agent-1"])
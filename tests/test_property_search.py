@@ -0,0 +1,175 @@
+"""
+Test cases for property text search
+===================================
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services.unified_property_service import (
+    PRICE_FACET_BOUNDARIES,
+    UnifiedPropertyService,
+)
+from bson import ObjectId
+
+
+def _summary_doc(score, **overrides):
+    doc = {
+        "_id": ObjectId(),
+        "_score": score,
+        "title": "Sea-facing apartment",
+        "property_type": "apartment",
+        "price": 10000000.0,
+        "location": "Bandra West, Mumbai",
+        "bedrooms": 2,
+        "bathrooms": 2,
+        "created_at": datetime(2024, 5, 10),
+        "updated_at": datetime(2024, 5, 10),
+    }
+    doc.update(overrides)
+    return doc
+
+
+def _service(*pages):
+    """Service whose properties.aggregate yields one page of documents per call"""
+    collection = MagicMock()
+    collection.aggregate = MagicMock(
+        side_effect=[MagicMock(to_list=AsyncMock(return_value=page)) for page in pages]
+    )
+    db = MagicMock()
+    db.properties = collection
+    return UnifiedPropertyService(db), collection
+
+
+def _after(doc, keyset):
+    """Evaluate a descending keyset_filter predicate against a document"""
+    [(field, bound)] = keyset["$or"][0].items()
+    value = doc[field]
+    return value < bound["$lt"] or (
+        value == keyset["$or"][1][field] and doc["_id"] < keyset["$or"][1]["_id"]["$lt"]
+    )
+
+
+class TestPropertyTextSearch:
+    """Test cases for search_properties and _text_search_page"""
+
+    @pytest.mark.asyncio
+    async def test_query_runs_a_text_match_ranked_by_score(self):
+        """Free text becomes a $text match on top of the structured filters"""
+        service, collection = _service([_summary_doc(2.5)])
+
+        page = await service.search_properties("sea view", property_type="apartment", limit=20)
+
+        [pipeline], _ = collection.aggregate.call_args
+        assert pipeline[0] == {
+            "$match": {"property_type": "apartment", "$text": {"$search": "sea view"}}
+        }
+        assert pipeline[1] == {"$addFields": {"_score": {"$meta": "textScore"}}}
+        assert {"$sort": {"_score": -1, "_id": -1}} in pipeline
+        assert pipeline[-1]["$project"]["_score"] == 1
+        assert [item.title for item in page.items] == ["Sea-facing apartment"]
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_blank_query_lists_newest_first(self):
+        """Without free text the search falls back to the listing query"""
+        service, collection = _service()
+        collection.find.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(
+            return_value=[]
+        )
+
+        await service.search_properties("  ", limit=20)
+
+        collection.aggregate.assert_not_called()
+        assert "$text" not in collection.find.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_score_cursor_resumes_after_the_first_page(self):
+        """The next page filters past the last (score, _id) of the previous one"""
+        first = [_summary_doc(3.0), _summary_doc(2.0)]
+        page_one_docs = [dict(doc) for doc in first]
+        service, collection = _service(first, [_summary_doc(1.5)])
+
+        page_one = await service.search_properties("sea", limit=2)
+        page_two = await service.search_properties("sea", limit=2, cursor=page_one.next_cursor)
+
+        assert page_one.next_cursor is not None
+        assert page_two.next_cursor is None
+        [pipeline], _ = collection.aggregate.call_args
+        [keyset] = [
+            stage["$match"] for stage in pipeline
+            if "$match" in stage and "$text" not in stage["$match"]
+        ]
+        assert list(keyset["$or"][0]) == ["_score"]
+        assert not any(_after(doc, keyset) for doc in page_one_docs)
+        tied = _summary_doc(2.0, _id=ObjectId("0" * 24))
+        assert _after(tied, keyset)
+        assert _after(_summary_doc(1.5), keyset)
+
+
+class TestFacetedSearch:
+    """Test cases for faceted_search"""
+
+    @pytest.mark.asyncio
+    async def test_hits_total_and_facets_come_from_one_facet_stage(self):
+        """A single aggregate call with one $facet stage serves the whole result"""
+        service, collection = _service([{"hits": [], "total": []}])
+
+        await service.faceted_search(query="sea", bedrooms=2, skip=20, limit=10)
+
+        collection.aggregate.assert_called_once()
+        [pipeline], _ = collection.aggregate.call_args
+        assert pipeline[0] == {"$match": {"bedrooms": 2, "$text": {"$search": "sea"}}}
+        [facet] = [stage["$facet"] for stage in pipeline if "$facet" in stage]
+        assert set(facet) == {"hits", "total", "property_type", "bedrooms", "price", "locality"}
+        assert facet["hits"][:3] == [
+            {"$sort": {"_score": -1, "_id": -1}},
+            {"$skip": 20},
+            {"$limit": 10},
+        ]
+        [bucket] = facet["price"]
+        assert bucket["$bucket"]["boundaries"] == PRICE_FACET_BOUNDARIES
+        assert bucket["$bucket"]["boundaries"][-1] == float("inf")
+        assert bucket["$bucket"]["default"] == "other"
+
+    @pytest.mark.asyncio
+    async def test_facet_document_maps_into_the_result(self):
+        """Buckets become FacetBuckets; price buckets carry their upper bound"""
+        hit = _summary_doc(None)
+        hit.pop("_score")
+        service, _ = _service([{
+            "hits": [hit],
+            "total": [{"count": 42}],
+            "property_type": [{"_id": "apartment", "count": 30}, {"_id": "house", "count": 12}],
+            "bedrooms": [{"_id": 2, "count": 42}],
+            "price": [
+                {"_id": 5000000, "count": 40},
+                {"_id": 100000000, "count": 1},
+                {"_id": "other", "count": 1},
+            ],
+            "locality": [{"_id": "Bandra West", "count": 42}],
+        }])
+
+        result = await service.faceted_search()
+
+        assert result.total == 42
+        assert [item.title for item in result.items] == ["Sea-facing apartment"]
+        assert [(b.value, b.count) for b in result.facets["property_type"]] == [
+            ("apartment", 30), ("house", 12)
+        ]
+        assert [(b.value, b.count) for b in result.facets["locality"]] == [("Bandra West", 42)]
+        assert [(b.value, b.max_value) for b in result.facets["price"]] == [
+            (5000000, 10000000),
+            (100000000, None),
+            ("other", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_empty_result_has_zero_total(self):
+        """A facet document without hits reports zero"""
+        service, _ = _service([{"hits": [], "total": []}])
+
+        result = await service.faceted_search()
+
+        assert (result.items, result.total) == ([], 0)
@@ -0,0 +1,49 @@
+"""
+Test cases for property status transitions
+==========================================
+"""
+
+from datetime import datetime
+
+from app.services.analytics_rollups import property_contribution
+from app.services.property_transitions import transition_stamps, transitions
+
+
+class TestPropertyTransitions:
+    """Test cases for transition logging and days on market"""
+
+    def test_only_changed_fields_are_logged(self, make_listing):
+        """A status change logs one entry; creations log initial values"""
+        at = datetime(2024, 6, 1)
+        [entry] = transitions([(make_listing(), make_listing(status="sold"))], at=at)
+        assert (entry["field"], entry["from"], entry["to"], entry["at"]) == (
+            "status", "active", "sold", at
+        )
+
+        created = transitions([(None, make_listing())], at=at)
+        assert {(e["field"], e["from"], e["to"]) for e in created} == {
+            ("status", None, "active"),
+            ("publishing_status", None, "published"),
+        }
+
+    def test_sold_at_is_stamped_on_entering_and_cleared_on_leaving_sold(self, make_listing):
+        """sold_at follows moves in and out of sold"""
+        now = datetime(2024, 6, 1)
+        active, sold = make_listing(), make_listing(status="sold")
+        assert transition_stamps(active, sold, now=now) == {"sold_at": now}
+        assert transition_stamps(sold, sold, now=now) == {}
+        sold = make_listing(status="sold", sold_at=now)
+        assert transition_stamps(sold, {**sold, "status": "active"}) == {"sold_at": None}
+
+    def test_rollups_count_days_on_market_from_published_at(self, make_listing):
+        """Sold listings add their days on market to the rollups"""
+        listing = make_listing(
+            status="sold", published_at=datetime(2024, 5, 3), sold_at=datetime(2024, 5, 13)
+        )
+        _, _, increments = property_contribution(listing)
+        assert increments["properties.sold_count"] == 1
+        assert increments["properties.days_on_market_count"] == 1
+        assert increments["properties.days_on_market_sum"] == 10.0
+
+        _, _, increments = property_contribution(make_listing())
+        assert "properties.sold_count" not in increments
@@ -0,0 +1,170 @@
+"""
+Test cases for listing quality scoring
+======================================
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.core.http_cache import document_etag
+from app.services.quality_scoring import (
+    COMPONENTS,
+    DEFAULT_PRICING_SCORE,
+    quality_fields,
+    score_properties,
+    score_property,
+)
+from app.services.unified_property_service import UnifiedPropertyService
+from app.utils.quality_rescore import rescore_properties
+
+
+def _complete_listing(**overrides):
+    doc = {
+        "_id": "p1",
+        "title": "Sea view flat",
+        "description": "x" * 250,
+        "property_type": "apartment",
+        "price": 12500000.0,
+        "location": "Bandra West, Mumbai",
+        "bedrooms": 2,
+        "bathrooms": 2,
+        "area_sqft": 950,
+        "features": ["Parking"],
+        "images": [f"{i}.jpg" for i in range(5)],
+        "market_analysis": {"price_position_percentage": 10},
+    }
+    doc.update(overrides)
+    return doc
+
+
+class TestQualityScoring:
+    """Test cases for score_property and score_properties"""
+
+    def test_complete_listing_scores_every_component(self):
+        """A full listing priced 10% off the market loses only pricing points"""
+        breakdown = score_property(_complete_listing())
+
+        assert breakdown == {
+            "overall": 92,
+            "completeness": 100,
+            "description_quality": 90,
+            "image_quality": 90,
+            "pricing_accuracy": 90,
+        }
+
+    def test_sparse_listing_uses_the_default_pricing_score(self):
+        """Blank fields do not count and missing market data scores the default"""
+        breakdown = score_property({"title": "Flat", "description": "  ", "features": []})
+
+        assert breakdown["completeness"] == 10
+        assert breakdown["description_quality"] == 30
+        assert breakdown["image_quality"] == 0
+        assert breakdown["pricing_accuracy"] == DEFAULT_PRICING_SCORE
+        assert set(breakdown) == {"overall", *COMPONENTS}
+
+    def test_batch_scores_match_single_scores(self):
+        """The vectorized batch agrees with scoring one document at a time"""
+        docs = [
+            _complete_listing(),
+            _complete_listing(
+                images=["a.jpg"], market_analysis={"price_position_percentage": "n/a"}
+            ),
+            _complete_listing(
+                description="short", market_analysis={"price_position_percentage": -150}
+            ),
+        ]
+
+        assert score_properties(docs) == [score_property(doc) for doc in docs]
+        assert score_properties([]) == []
+
+    def test_quality_fields_persist_the_overall_score(self):
+        """The stored fields are the overall score plus the breakdown"""
+        breakdown = score_property(_complete_listing())
+
+        assert quality_fields(breakdown) == {
+            "quality_score": breakdown["overall"],
+            "quality_breakdown": breakdown,
+        }
+
+
+class TestQualityRescore:
+    """Test cases for the batch rescore job"""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_breakdowns_are_written(self):
+        """Documents whose stored breakdown is current are skipped"""
+        current = _complete_listing(_id="p1")
+        current["quality_breakdown"] = score_property(current)
+        stale = _complete_listing(_id="p2", quality_breakdown={"overall": 0})
+        unscored = _complete_listing(_id="p3", images=[])
+        db_cursor = MagicMock()
+        db_cursor.__aiter__.return_value = [current, stale, unscored]
+        db = MagicMock()
+        db.properties.find.return_value.batch_size.return_value = db_cursor
+        db.properties.bulk_write = AsyncMock(return_value=MagicMock(modified_count=1))
+
+        stats = await rescore_properties(db, batch_size=2)
+
+        assert stats == {"scanned": 3, "updated": 2}
+        written = [
+            op._filter["_id"]
+            for call in db.properties.bulk_write.await_args_list
+            for op in call.args[0]
+        ]
+        assert written == ["p2", "p3"]
+        [first_batch], _ = db.properties.bulk_write.await_args_list[0]
+        update = first_batch[0]._doc["$set"]
+        assert update["quality_score"] == score_property(stale)["overall"]
+        assert "quality_scored_at" in update
+
+    @pytest.mark.asyncio
+    async def test_rescore_is_not_an_edit(self):
+        """updated_at is kept and guards the write against a concurrent edit"""
+        edited_at = datetime(2024, 5, 10)
+        stale = _complete_listing(_id="p1", updated_at=edited_at, quality_breakdown={})
+        db_cursor = MagicMock()
+        db_cursor.__aiter__.return_value = [stale]
+        db = MagicMock()
+        db.properties.find.return_value.batch_size.return_value = db_cursor
+        db.properties.bulk_write = AsyncMock(return_value=MagicMock(modified_count=1))
+
+        await rescore_properties(db)
+
+        [projection] = db.properties.find.call_args.args[1:]
+        assert projection["updated_at"] == 1
+        [[operation]], _ = db.properties.bulk_write.await_args
+        assert operation._filter == {"_id": "p1", "updated_at": edited_at}
+        assert "updated_at" not in operation._doc["$set"]
+
+    def test_rescored_documents_get_a_new_etag(self):
+        """quality_scored_at versions the ETag in place of updated_at"""
+        doc = _complete_listing(updated_at=datetime(2024, 5, 10))
+
+        rescored = {**doc, "quality_scored_at": datetime(2024, 6, 1)}
+        assert document_etag(doc) != document_etag(rescored)
+
+
+class TestLowestQuality:
+    """Test cases for get_lowest_quality_properties"""
+
+    @pytest.mark.asyncio
+    async def test_worst_scored_listings_come_first(self):
+        """The query reads scored listings of the agent in ascending score order"""
+        doc = {
+            **_complete_listing(_id="p1", quality_score=40),
+            "created_at": datetime(2024, 5, 10),
+            "updated_at": datetime(2024, 5, 10),
+        }
+        db = MagicMock()
+        find_cursor = db.properties.find.return_value
+        find_cursor.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=[doc])
+        service = UnifiedPropertyService(db)
+
+        [item] = await service.get_lowest_quality_properties("agent-1", limit=5, max_score=60)
+
+        [query, _], _ = db.properties.find.call_args
+        assert query == {"agent_id": "agent-1", "quality_score": {"$ne": None, "$lte": 60}}
+        find_cursor.sort.assert_called_once_with([("quality_score", 1), ("_id", 1)])
+        find_cursor.sort.return_value.limit.assert_called_once_with(5)
+        assert item.quality_score == 40
@@ -0,0 +1,127 @@
+"""
+Test cases for serialization fast paths
+=======================================
+"""
+
+from datetime import datetime
+
+import pytest
+from app.schemas.agent_public import AgentPublicProfile, PropertyType
+from app.schemas.lead import LeadResponse, LeadStatus
+from app.schemas.unified_property import PropertyResponse
+from app.utils.serialization import construct_trusted, dump_json
+
+CREATED_AT = datetime(2024, 5, 10, 9, 30)
+
+
+def _lead(**overrides):
+    doc = {
+        "id": "l1",
+        "agent_id": "agent-1",
+        "name": "Asha Rao",
+        "email": "asha@example.com",
+        "source": "referral",
+        "urgency": "high",
+        "status": "qualified",
+        "budget": 12500000.0,
+        "scoring": {
+            "total_score": 82.5,
+            "quality": "good",
+            "score_breakdown": {"budget": 30.0},
+            "last_calculated": CREATED_AT,
+        },
+        "activities": [{
+            "id": "a1",
+            "lead_id": "l1",
+            "activity_type": "call",
+            "description": "Intro call",
+            "performed_by": "agent-1",
+            "timestamp": CREATED_AT,
+        }],
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+    }
+    doc.update(overrides)
+    return doc
+
+
+def _profile():
+    return {
+        "id": "profile-1",
+        "agent_id": "agent-1",
+        "agent_name": "Asha Rao",
+        "slug": "asha-rao",
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+        "properties": [{
+            "id": "p1",
+            "agent_id": "agent-1",
+            "title": "Sea-facing apartment",
+            "description": "Two bedroom apartment",
+            "price": 10000000.0,
+            "property_type": "Apartment",
+            "location": "Bandra West, Mumbai",
+            "created_at": CREATED_AT,
+            "updated_at": CREATED_AT,
+        }],
+    }
+
+
+def _property():
+    return {
+        "id": "p1",
+        "title": "Sea-facing apartment",
+        "description": "Two bedroom apartment",
+        "property_type": "apartment",
+        "price": 10000000.0,
+        "location": "Bandra West, Mumbai",
+        "bedrooms": 2,
+        "bathrooms": 2,
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+        "quality_breakdown": {"overall": 80},
+    }
+
+
+class TestConstructTrusted:
+    """Test cases for construct_trusted against full validation"""
+
+    @pytest.mark.parametrize("model_cls, doc", [
+        (LeadResponse, _lead()),
+        (LeadResponse, _lead(scoring=None, activities=[], email=None, status="new")),
+        (AgentPublicProfile, _profile()),
+        (PropertyResponse, _property()),
+    ])
+    def test_serializes_like_validated_models(self, model_cls, doc):
+        """Enums, nested models, defaults and missing optionals serialize identically"""
+        trusted = construct_trusted(model_cls, doc)
+
+        assert dump_json(trusted) == dump_json(model_cls.model_validate(doc))
+
+    def test_nested_values_are_coerced(self):
+        """Stored strings become enum members and dicts become models"""
+        lead = construct_trusted(LeadResponse, _lead())
+        profile = construct_trusted(AgentPublicProfile, _profile())
+
+        assert lead.status is LeadStatus.QUALIFIED
+        assert lead.activities[0].description == "Intro call"
+        assert profile.properties[0].property_type is PropertyType.APARTMENT
+
+    def test_missing_required_field_falls_back_to_validation(self):
+        """Legacy documents without required fields still fail loudly"""
+        doc = _lead()
+        doc.pop("created_at")
+
+        with pytest.raises(ValueError):
+            construct_trusted(LeadResponse, doc)
+
+
+class TestDumpJson:
+    """Test cases for dump_json"""
+
+    def test_non_finite_floats_become_null(self):
+        """NaN and infinities never reach the wire as bare tokens"""
+        lead = construct_trusted(LeadResponse, _lead(budget=float("nan")))
+
+        assert dump_json({"mean": float("nan"), "max": float("inf")}) == b'{"mean":null,"max":null}'
+        assert b'"budget":null' in dump_json([lead])
@@ -0,0 +1,81 @@
+"""
+Test cases for the in-memory similarity index
+=============================================
+"""
+
+from app.services.similarity_index import SimilarityIndex
+
+
+class TestSimilarityIndex:
+    """Test cases for SimilarityIndex writes and queries"""
+
+    def test_upsert_adds_and_refreshes_rows(self, make_listing):
+        """Upserting an indexed property replaces its row instead of adding one"""
+        index = SimilarityIndex(initial_capacity=1)
+        index.upsert(make_listing("p1"))
+        index.upsert(make_listing("p2"))
+        index.upsert(make_listing("p1", price=20000000.0))
+
+        assert len(index) == 2
+        [(property_id, _)] = index.query(make_listing("target", price=20000000.0), limit=1)
+        assert property_id == "p1"
+
+    def test_upsert_of_inactive_or_unpriced_property_removes_it(self, make_listing):
+        """Only active, priced listings stay in the index"""
+        index = SimilarityIndex()
+        index.upsert(make_listing("p1"))
+        index.upsert(make_listing("p2"))
+
+        index.upsert(make_listing("p1", status="sold"))
+        index.upsert(make_listing("p2", price=None))
+
+        assert len(index) == 0
+
+    def test_remove_keeps_the_remaining_rows_addressable(self, make_listing):
+        """Swap-remove moves the last row into the freed slot"""
+        index = SimilarityIndex()
+        for property_id in ("p1", "p2", "p3"):
+            index.upsert(make_listing(property_id, bedrooms=int(property_id[1])))
+
+        index.remove("p1")
+        index.remove("missing")
+
+        assert len(index) == 2
+        [(property_id, _)] = index.query(make_listing("target", bedrooms=3), limit=1)
+        assert property_id == "p3"
+
+    def test_query_ranks_closest_first_and_excludes_the_target(self, make_listing):
+        """Scores grow with dissimilarity; the target itself is never returned"""
+        index = SimilarityIndex()
+        index.upsert(make_listing("same"))
+        index.upsert(make_listing("pricier", price=12000000.0))
+        index.upsert(make_listing("house", property_type="house"))
+        pune = {"type": "Point", "coordinates": [73.85, 18.52]}
+        index.upsert(make_listing("far", geo_location=pune))
+
+        results = index.query(make_listing("same"), limit=10)
+
+        assert [property_id for property_id, _ in results] == ["pricier", "house", "far"]
+        scores = [score for _, score in results]
+        assert scores == sorted(scores)
+
+    def test_query_can_be_scoped_to_one_agent(self, make_listing):
+        """agent_id restricts candidates to that agent's listings"""
+        index = SimilarityIndex()
+        index.upsert(make_listing("p1", agent_id="agent-1"))
+        index.upsert(make_listing("p2", agent_id="agent-2", price=30000000.0))
+
+        results = index.query(make_listing("target"), limit=10, agent_id="agent-2")
+
+        assert [property_id for property_id, _ in results] == ["p2"]
+        assert index.query(make_listing("target"), limit=10, agent_id="agent-3") == []
+
+    def test_writes_during_a_rebuild_are_queued_once(self, make_listing):
+        """An upsert that removes a property queues only the remove"""
+        index = SimilarityIndex()
+        index._pending = []
+
+        index.upsert(make_listing("p1"))
+        index.upsert(make_listing("p1", status="sold"))
+
+        assert index._pending == [("upsert", make_listing("p1")), ("remove", "p1")]
@@ -0,0 +1,109 @@
+"""
+Test cases for streaming inventory export
+=========================================
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from app.core.exceptions import ValidationError
+from app.services.unified_property_service import DEFAULT_EXPORT_FIELDS, UnifiedPropertyService
+from app.utils import streaming
+from app.utils.streaming import csv_stream, gzip_stream, ndjson_stream
+from bson import ObjectId
+
+
+async def _records(records):
+    for record in records:
+        yield record
+
+
+async def _collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+def _service(docs):
+    """Service whose export cursor iterates over docs"""
+    db_cursor = MagicMock()
+    db_cursor.__aiter__.return_value = docs
+    collection = MagicMock()
+    collection.find.return_value.sort.return_value.batch_size.return_value = db_cursor
+    db = MagicMock()
+    db.properties = collection
+    return UnifiedPropertyService(db), collection
+
+
+class TestExportFields:
+    """Test cases for export column resolution"""
+
+    def test_defaults_and_requested_order(self):
+        """No request means the default columns; requested columns keep their order"""
+        service, _ = _service([])
+
+        assert service.resolve_export_fields() == list(DEFAULT_EXPORT_FIELDS)
+        assert service.resolve_export_fields(["price", "id", "price"]) == ["price", "id"]
+
+    def test_unknown_fields_are_rejected(self):
+        """Fields outside PropertyResponse raise ValidationError"""
+        service, _ = _service([])
+
+        with pytest.raises(ValidationError):
+            service.resolve_export_fields(["title", "owner_password"])
+
+
+class TestStreamingExport:
+    """Test cases for the NDJSON, CSV and gzip generators"""
+
+    @pytest.mark.asyncio
+    async def test_csv_columns_follow_the_resolved_fields_and_ids_are_strings(self):
+        """The header and every row use the resolved order; ObjectIds become strings"""
+        property_id = ObjectId()
+        service, collection = _service([
+            {"_id": property_id, "price": 10000000.0, "features": ["lift"], "title": "A"},
+        ])
+        fields = service.resolve_export_fields(["title", "id", "features", "price"])
+
+        records = service.iter_properties_for_export("agent-1", fields)
+        body = await _collect(csv_stream(records, fields))
+
+        [query, projection], _ = collection.find.call_args
+        assert query == {"agent_id": "agent-1"}
+        assert projection == {"title": 1, "features": 1, "price": 1}
+        rows = list(csv.reader(io.StringIO(body.decode("utf-8"))))
+        assert rows == [
+            ["title", "id", "features", "price"],
+            ["A", str(property_id), '["lift"]', "10000000.0"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_ndjson_writes_one_object_per_line(self):
+        """Dates are ISO formatted and every record ends with a newline"""
+        records = [
+            {"id": "p1", "created_at": datetime(2024, 5, 10)},
+            {"id": "p2", "created_at": None},
+        ]
+
+        body = await _collect(ndjson_stream(_records(records)))
+
+        lines = body.decode("utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"id": "p1", "created_at": "2024-05-10T00:00:00"},
+            {"id": "p2", "created_at": None},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_large_streams_are_chunked_and_gzip_round_trips(self, monkeypatch):
+        """Output is yielded in bounded chunks and gzip produces one valid member"""
+        monkeypatch.setattr(streaming, "STREAM_CHUNK_SIZE", 64)
+        records = [{"id": f"p{i}", "title": "x" * 40} for i in range(10)]
+
+        chunks = [chunk async for chunk in ndjson_stream(_records(records))]
+        compressed = await _collect(gzip_stream(ndjson_stream(_records(records))))
+
+        assert len(chunks) > 1
+        assert gzip.decompress(compressed) == b"".join(chunks)
@@ -0,0 +1,197 @@
+"""
+Test cases for UnifiedPropertyService
+=====================================
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.schemas.unified_property import PropertyCreate, PropertySummary, PropertyUpdate
+from app.services import unified_property_service
+from app.services.quality_scoring import score_expression, score_property
+from app.services.unified_property_service import (
+    LIST_SORT,
+    SUMMARY_PROJECTION,
+    UnifiedPropertyService,
+)
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+
+
+def _property_data(title, **overrides):
+    data = {
+        "title": title,
+        "description": "Two bedroom apartment",
+        "property_type": "apartment",
+        "price": 10000000.0,
+        "location": "Bandra West, Mumbai",
+        "bedrooms": 2,
+        "bathrooms": 2,
+    }
+    data.update(overrides)
+    return data
+
+
+def _service(collection):
+    db = MagicMock()
+    db.properties = collection
+    service = UnifiedPropertyService(db)
+    service._record_property_changes = AsyncMock()
+    return service
+
+
+class TestBatchCreate:
+    """Test cases for batch_create_properties and _insert_chunk"""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_in_a_chunk_fail_only_their_items(self, monkeypatch):
+        """Unordered insert_many errors map back to input indexes; the rest are created"""
+        monkeypatch.setattr(unified_property_service, "load_aggregates", AsyncMock(return_value={}))
+        duplicate = BulkWriteError({
+            "writeErrors": [{"index": 1, "code": 11000, "errmsg": "E11000 duplicate key"}],
+            "nInserted": 1,
+        })
+        collection = MagicMock()
+        collection.insert_many = AsyncMock(side_effect=[duplicate, None])
+        service = _service(collection)
+
+        report = await service.batch_create_properties(
+            [
+                _property_data("A"),
+                _property_data("B"),
+                {"title": "missing fields"},
+                _property_data("C"),
+                _property_data("D"),
+            ],
+            "agent-1",
+            chunk_size=2,
+        )
+
+        assert (report.created_count, report.failed_count) == (3, 2)
+        assert [r.index for r in report.results] == [0, 1, 2, 3, 4]
+        assert [bool(r.id) for r in report.results] == [True, False, False, True, True]
+        assert report.results[1].error == "E11000 duplicate key"
+        assert collection.insert_many.await_count == 2
+        for call in collection.insert_many.await_args_list:
+            assert call.kwargs == {"ordered": False}
+
+        recorded = [
+            doc["title"]
+            for call in service._record_property_changes.await_args_list
+            for old, doc in call.args[0]
+        ]
+        assert recorded == ["A", "C", "D"]
+
+
+class TestSummaryProjection:
+    """Test cases for projected list pages"""
+
+    def test_projection_reads_only_summary_fields_and_the_cover_image(self):
+        """Heavy payloads such as descriptions and AI content are never read"""
+        assert SUMMARY_PROJECTION["images"] == {"$slice": 1}
+        assert set(SUMMARY_PROJECTION) == set(PropertySummary.model_fields) - {"id"}
+        assert "description" not in SUMMARY_PROJECTION
+        assert "ai_content" not in SUMMARY_PROJECTION
+
+    @pytest.mark.asyncio
+    async def test_listing_builds_summaries_from_projected_documents(self):
+        """Agent listings query with the summary projection and return PropertySummary items"""
+        property_id = ObjectId()
+        doc = {
+            "_id": property_id,
+            "title": "A",
+            "property_type": "apartment",
+            "price": 10000000.0,
+            "location": "Bandra West, Mumbai",
+            "bedrooms": 2,
+            "bathrooms": 2,
+            "images": ["cover.jpg"],
+            "created_at": datetime(2024, 5, 10),
+            "updated_at": datetime(2024, 5, 10),
+        }
+        collection = MagicMock()
+        find_cursor = collection.find.return_value
+        find_cursor.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=[doc])
+        service = _service(collection)
+
+        page = await service.get_properties_by_user("agent-1", limit=10)
+
+        collection.find.assert_called_once_with({"agent_id": "agent-1"}, SUMMARY_PROJECTION)
+        find_cursor.sort.assert_called_once_with(LIST_SORT)
+        [item] = page.items
+        assert isinstance(item, PropertySummary)
+        assert item.id == str(property_id)
+        assert item.images == ["cover.jpg"]
+
+
+class TestSingleRoundTripWrites:
+    """Test cases for write paths that must not re-read what they wrote"""
+
+    @pytest.mark.asyncio
+    async def test_create_is_a_single_insert(self):
+        """create_property returns the inserted document without reading it back"""
+        inserted_id = ObjectId()
+        collection = MagicMock()
+        collection.insert_one = AsyncMock(return_value=MagicMock(inserted_id=inserted_id))
+        collection.find_one = AsyncMock()
+        service = _service(collection)
+
+        response = await service.create_property(PropertyCreate(**_property_data("A")), "agent-1")
+
+        collection.insert_one.assert_awaited_once()
+        collection.find_one.assert_not_awaited()
+        [document], _ = collection.insert_one.call_args
+        assert document["agent_id"] == "agent-1"
+        assert response.id == str(inserted_id)
+
+    @pytest.mark.asyncio
+    async def test_rescoring_update_is_a_single_pipeline_write(self):
+        """Quality score and sold_at are computed inside one find_one_and_update"""
+        property_id = ObjectId()
+        stored = {"_id": property_id, "agent_id": "agent-1", "status": "active",
+                  "created_at": datetime(2024, 5, 10), **_property_data("A")}
+        collection = MagicMock()
+        collection.find_one = AsyncMock()
+        collection.find_one_and_update = AsyncMock(return_value=stored)
+        service = _service(collection)
+
+        response = await service.update_property(
+            str(property_id),
+            PropertyUpdate(description="Renovated " * 30, status="sold"),
+            "agent-1",
+        )
+
+        collection.find_one.assert_not_awaited()
+        collection.find_one_and_update.assert_awaited_once()
+        [query, pipeline], kwargs = collection.find_one_and_update.call_args
+        assert query == {"_id": property_id, "agent_id": "agent-1"}
+        assert kwargs == {"return_document": ReturnDocument.BEFORE}
+        assert isinstance(pipeline, list)
+        assert pipeline[0]["$set"]["description"] == {"$literal": "Renovated " * 30}
+        assert "$cond" in pipeline[0]["$set"]["sold_at"]
+        assert pipeline[1] == {"$set": score_expression()}
+        [[(_, updated_doc)]], _ = service._record_property_changes.await_args
+        assert updated_doc["sold_at"] == updated_doc["updated_at"]
+        expected = score_property({**stored, "description": "Renovated " * 30})
+        assert response.quality_breakdown == expected
+
+    @pytest.mark.asyncio
+    async def test_plain_update_is_a_single_set(self):
+        """Edits that touch no derived field stay a plain $set"""
+        property_id = ObjectId()
+        stored = {"_id": property_id, "agent_id": "agent-1",
+                  "created_at": datetime(2024, 5, 10), **_property_data("A")}
+        collection = MagicMock()
+        collection.find_one = AsyncMock()
+        collection.find_one_and_update = AsyncMock(return_value=stored)
+        service = _service(collection)
+
+        await service.update_property(str(property_id), PropertyUpdate(amenities="Gym"), "agent-1")
+
+        collection.find_one.assert_not_awaited()
+        collection.find_one_and_update.assert_awaited_once()
+        [_, update], _ = collection.find_one_and_update.call_args
+        assert set(update) == {"$set"}
+        assert update["$set"]["amenities"] == "Gym"